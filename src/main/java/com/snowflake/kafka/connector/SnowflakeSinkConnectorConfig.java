@@ -60,6 +60,45 @@ public class SnowflakeSinkConnectorConfig {
   public static final long BUFFER_FLUSH_TIME_SEC_DEFAULT = 120;
   public static final String BUFFER_FLUSH_TIME_SEC = "buffer.flush.time";
 
+  // Number of threads per task uploading flushed buffers to the internal stage (Snowpipe only).
+  // 0 means the upload happens on the task thread.
+  public static final String SNOWPIPE_FILE_UPLOAD_THREADS =
+      "snowflake.snowpipe.file.upload.threads";
+  public static final int SNOWPIPE_FILE_UPLOAD_THREADS_DEFAULT = 4;
+
+  // Number of threads per task running the cleaner (ingestion status check and purge) of all
+  // partitions (Snowpipe only)
+  public static final String SNOWPIPE_CLEANER_THREADS = "snowflake.snowpipe.cleaner.threads";
+  public static final int SNOWPIPE_CLEANER_THREADS_DEFAULT = 4;
+
+  // Number of partitions of a put() batch processed at the same time per task, including the task
+  // thread. 1 processes all records on the task thread.
+  public static final String PARTITION_WORKER_THREADS = "snowflake.partition.worker.threads";
+  public static final int PARTITION_WORKER_THREADS_DEFAULT = 1;
+
+  // Number of partitions opened at the same time per task when partitions are assigned
+  public static final String PARTITION_OPEN_THREADS = "snowflake.partition.open.threads";
+  public static final int PARTITION_OPEN_THREADS_DEFAULT = 8;
+
+  // Maximum bytes buffered by all the partitions of a task, the largest buffers are flushed first
+  // above it and consumption is paused when flushing can't keep up. 0 means no limit.
+  public static final String BUFFER_MEMORY_LIMIT_BYTES = "buffer.memory.limit.bytes";
+  public static final long BUFFER_MEMORY_LIMIT_BYTES_DEFAULT = 0;
+
+  // Tune the flush thresholds of each partition from its arrival rate (Snowpipe only),
+  // buffer.flush.time is then the latency target and the size threshold grows from
+  // buffer.size.bytes up to buffer.adaptive.max.size.bytes
+  public static final String BUFFER_FLUSH_ADAPTIVE = "buffer.flush.adaptive";
+  public static final boolean BUFFER_FLUSH_ADAPTIVE_DEFAULT = false;
+  public static final String BUFFER_ADAPTIVE_MAX_SIZE_BYTES = "buffer.adaptive.max.size.bytes";
+  public static final long BUFFER_ADAPTIVE_MAX_SIZE_BYTES_DEFAULT = 100000000;
+
+  // Number of extra JDBC sessions per task running the stage file operations (table stage uploads,
+  // file moves, listing and purge), DDL and metadata queries keep the main session. 0 runs
+  // everything on the main session.
+  public static final String JDBC_SESSION_POOL_SIZE = "snowflake.jdbc.session.pool.size";
+  public static final int JDBC_SESSION_POOL_SIZE_DEFAULT = 2;
+
   // Snowflake connection and database config
   private static final String SNOWFLAKE_LOGIN_INFO = "Snowflake Login Info";
   static final String SNOWFLAKE_URL = Utils.SF_URL;
@@ -463,6 +502,104 @@ public class SnowflakeSinkConnectorConfig {
             5,
             ConfigDef.Width.NONE,
             INGESTION_METHOD_OPT)
+        .define(
+            SNOWPIPE_FILE_UPLOAD_THREADS,
+            Type.INT,
+            SNOWPIPE_FILE_UPLOAD_THREADS_DEFAULT,
+            ConfigDef.Range.atLeast(0),
+            Importance.LOW,
+            "Number of threads per task uploading flushed buffers to the internal stage in"
+                + " parallel. Only used with SNOWPIPE ingestion, 0 uploads on the task thread",
+            CONNECTOR_CONFIG,
+            6,
+            ConfigDef.Width.NONE,
+            SNOWPIPE_FILE_UPLOAD_THREADS)
+        .define(
+            SNOWPIPE_CLEANER_THREADS,
+            Type.INT,
+            SNOWPIPE_CLEANER_THREADS_DEFAULT,
+            ConfigDef.Range.atLeast(1),
+            Importance.LOW,
+            "Number of threads per task checking the ingestion status and purging the files of"
+                + " all partitions. Only used with SNOWPIPE ingestion",
+            CONNECTOR_CONFIG,
+            7,
+            ConfigDef.Width.NONE,
+            SNOWPIPE_CLEANER_THREADS)
+        .define(
+            PARTITION_WORKER_THREADS,
+            Type.INT,
+            PARTITION_WORKER_THREADS_DEFAULT,
+            ConfigDef.Range.atLeast(1),
+            Importance.LOW,
+            "Number of partitions of a batch processed in parallel per task, records of a"
+                + " partition are always processed in order. 1 processes the batch on the task"
+                + " thread",
+            CONNECTOR_CONFIG,
+            8,
+            ConfigDef.Width.NONE,
+            PARTITION_WORKER_THREADS)
+        .define(
+            PARTITION_OPEN_THREADS,
+            Type.INT,
+            PARTITION_OPEN_THREADS_DEFAULT,
+            ConfigDef.Range.atLeast(1),
+            Importance.LOW,
+            "Number of partitions opened in parallel per task after a rebalance, the tables of"
+                + " the partitions are checked once per table",
+            CONNECTOR_CONFIG,
+            9,
+            ConfigDef.Width.NONE,
+            PARTITION_OPEN_THREADS)
+        .define(
+            BUFFER_MEMORY_LIMIT_BYTES,
+            Type.LONG,
+            BUFFER_MEMORY_LIMIT_BYTES_DEFAULT,
+            ConfigDef.Range.atLeast(0),
+            Importance.LOW,
+            "Cumulative size of records buffered in memory by all the partitions of a task, the"
+                + " largest buffers are flushed first above it and consumption is paused when"
+                + " flushing can't keep up. 0 means no limit",
+            CONNECTOR_CONFIG,
+            10,
+            ConfigDef.Width.NONE,
+            BUFFER_MEMORY_LIMIT_BYTES)
+        .define(
+            BUFFER_FLUSH_ADAPTIVE,
+            Type.BOOLEAN,
+            BUFFER_FLUSH_ADAPTIVE_DEFAULT,
+            Importance.LOW,
+            "Tune the flush thresholds of each partition from its arrival rate, buffer.flush.time"
+                + " is then the latency target. Only for Snowpipe",
+            CONNECTOR_CONFIG,
+            11,
+            ConfigDef.Width.NONE,
+            BUFFER_FLUSH_ADAPTIVE)
+        .define(
+            BUFFER_ADAPTIVE_MAX_SIZE_BYTES,
+            Type.LONG,
+            BUFFER_ADAPTIVE_MAX_SIZE_BYTES_DEFAULT,
+            ConfigDef.Range.atLeast(1),
+            Importance.LOW,
+            "Largest size threshold of a partition buffer with buffer.flush.adaptive, busy"
+                + " partitions flush files up to this size",
+            CONNECTOR_CONFIG,
+            12,
+            ConfigDef.Width.NONE,
+            BUFFER_ADAPTIVE_MAX_SIZE_BYTES)
+        .define(
+            JDBC_SESSION_POOL_SIZE,
+            Type.INT,
+            JDBC_SESSION_POOL_SIZE_DEFAULT,
+            ConfigDef.Range.atLeast(0),
+            Importance.LOW,
+            "Number of extra JDBC sessions per task running the stage file operations, so that"
+                + " cleanup and broken record uploads don't wait for DDL and metadata queries. 0"
+                + " runs everything on one session",
+            CONNECTOR_CONFIG,
+            13,
+            ConfigDef.Width.NONE,
+            JDBC_SESSION_POOL_SIZE)
         .define(
             ERRORS_TOLERANCE_CONFIG,
             Type.STRING,
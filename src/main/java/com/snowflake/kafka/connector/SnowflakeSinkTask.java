@@ -19,6 +19,7 @@ package com.snowflake.kafka.connector;
 import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.DELIVERY_GUARANTEE;
 
 import com.google.common.annotations.VisibleForTesting;
+import com.snowflake.kafka.connector.dlq.AsyncKafkaRecordErrorReporter;
 import com.snowflake.kafka.connector.dlq.KafkaRecordErrorReporter;
 import com.snowflake.kafka.connector.internal.LoggerHandler;
 import com.snowflake.kafka.connector.internal.SnowflakeConnectionService;
@@ -30,14 +31,14 @@ import com.snowflake.kafka.connector.internal.streaming.IngestionMethodConfig;
 import com.snowflake.kafka.connector.records.SnowflakeMetadataConfig;
 import java.util.Collection;
 import java.util.HashMap;
+import java.util.LinkedHashMap;
 import java.util.Map;
 import java.util.Optional;
-import java.util.concurrent.ExecutionException;
 import java.util.concurrent.TimeoutException;
 import java.util.function.Supplier;
+import org.apache.kafka.clients.consumer.ConsumerConfig;
 import org.apache.kafka.clients.consumer.OffsetAndMetadata;
 import org.apache.kafka.common.TopicPartition;
-import org.apache.kafka.connect.errors.ConnectException;
 import org.apache.kafka.connect.errors.RetriableException;
 import org.apache.kafka.connect.sink.ErrantRecordReporter;
 import org.apache.kafka.connect.sink.SinkRecord;
@@ -78,7 +79,24 @@ public class SnowflakeSinkTask extends SinkTask {
   // check connect-distributed.properties file used to start kafka connect
   private final int rebalancingSleepTime = 370000;
 
+  // max.poll.interval.ms of the consumer when the connector doesn't override it
+  private static final long DEFAULT_MAX_POLL_INTERVAL_MS = 300000;
+
+  // Connector configs with this prefix override the consumer configs of the connector
+  private static final String CONSUMER_OVERRIDE_PREFIX = "consumer.override.";
+
+  // Time given to open() to start the assigned partitions, half of the consumer's
+  // max.poll.interval.ms so the rebalance completes in time. Partitions not started by then are
+  // started on their first record
+  private long partitionOpenTimeoutMillis = DEFAULT_MAX_POLL_INTERVAL_MS / 2;
+
+  // Number of records sent to the DLQ and not acknowledged yet, reporting more waits for the oldest
+  private static final int MAX_IN_FLIGHT_DLQ_RECORDS = 10000;
+
   private SnowflakeSinkService sink = null;
+
+  // sends the records which can't be ingested to the DLQ, waited for before committing offsets
+  private KafkaRecordErrorReporter kafkaRecordErrorReporter = noOpKafkaRecordErrorReporter();
   private Map<String, String> topic2table = null;
 
   // snowflake JDBC connection provides methods to interact with user's
@@ -98,6 +116,9 @@ public class SnowflakeSinkTask extends SinkTask {
 
   private long taskOpenCount;
 
+  // true while the assigned partitions are paused because the buffers hold too much memory
+  private boolean consumptionPaused = false;
+
   public static void setTotalTaskCreationCount(int newCreationCount) {
     STATIC_LOGGER.info("Setting task creation count to {} for logging", newCreationCount);
     totalTaskCreationCount = newCreationCount;
@@ -181,6 +202,52 @@ public class SnowflakeSinkTask extends SinkTask {
         Long.parseLong(parsedConfig.get(SnowflakeSinkConnectorConfig.BUFFER_SIZE_BYTES));
     final long bufferFlushTime =
         Long.parseLong(parsedConfig.get(SnowflakeSinkConnectorConfig.BUFFER_FLUSH_TIME_SEC));
+    // config snowflake.snowpipe.file.upload.threads -- parallelism of internal stage uploads
+    final int fileUploadThreads =
+        Integer.parseInt(
+            parsedConfig.getOrDefault(
+                SnowflakeSinkConnectorConfig.SNOWPIPE_FILE_UPLOAD_THREADS,
+                SnowflakeSinkConnectorConfig.SNOWPIPE_FILE_UPLOAD_THREADS_DEFAULT + ""));
+    // config snowflake.snowpipe.cleaner.threads -- threads shared by the cleaners of all partitions
+    final int cleanerThreads =
+        Integer.parseInt(
+            parsedConfig.getOrDefault(
+                SnowflakeSinkConnectorConfig.SNOWPIPE_CLEANER_THREADS,
+                SnowflakeSinkConnectorConfig.SNOWPIPE_CLEANER_THREADS_DEFAULT + ""));
+    // config snowflake.partition.worker.threads -- partitions of a batch processed in parallel
+    final int partitionWorkerThreads =
+        Integer.parseInt(
+            parsedConfig.getOrDefault(
+                SnowflakeSinkConnectorConfig.PARTITION_WORKER_THREADS,
+                SnowflakeSinkConnectorConfig.PARTITION_WORKER_THREADS_DEFAULT + ""));
+
+    // config snowflake.partition.open.threads -- partitions opened in parallel after a rebalance
+    final int partitionOpenThreads =
+        Integer.parseInt(
+            parsedConfig.getOrDefault(
+                SnowflakeSinkConnectorConfig.PARTITION_OPEN_THREADS,
+                SnowflakeSinkConnectorConfig.PARTITION_OPEN_THREADS_DEFAULT + ""));
+
+    // config buffer.memory.limit.bytes -- bytes buffered by all the partitions of the task
+    final long bufferMemoryLimit =
+        Long.parseLong(
+            parsedConfig.getOrDefault(
+                SnowflakeSinkConnectorConfig.BUFFER_MEMORY_LIMIT_BYTES,
+                SnowflakeSinkConnectorConfig.BUFFER_MEMORY_LIMIT_BYTES_DEFAULT + ""));
+
+    // config buffer.flush.adaptive -- tune the flush thresholds of each partition
+    final long adaptiveFlushMaxSize =
+        Boolean.parseBoolean(
+                parsedConfig.getOrDefault(
+                    SnowflakeSinkConnectorConfig.BUFFER_FLUSH_ADAPTIVE,
+                    SnowflakeSinkConnectorConfig.BUFFER_FLUSH_ADAPTIVE_DEFAULT + ""))
+            ? Long.parseLong(
+                parsedConfig.getOrDefault(
+                    SnowflakeSinkConnectorConfig.BUFFER_ADAPTIVE_MAX_SIZE_BYTES,
+                    SnowflakeSinkConnectorConfig.BUFFER_ADAPTIVE_MAX_SIZE_BYTES_DEFAULT + ""))
+            : 0;
+    this.consumptionPaused = false;
+    this.partitionOpenTimeoutMillis = getPartitionOpenTimeoutMillis(parsedConfig);
 
     // Falling back to default behavior which is to ingest an empty json string if we get null
     // value. (Tombstone record)
@@ -211,7 +278,8 @@ public class SnowflakeSinkTask extends SinkTask {
     enableRebalancing =
         Boolean.parseBoolean(parsedConfig.get(SnowflakeSinkConnectorConfig.REBALANCING));
 
-    KafkaRecordErrorReporter kafkaRecordErrorReporter = noOpKafkaRecordErrorReporter();
+    closeKafkaRecordErrorReporter();
+    kafkaRecordErrorReporter = noOpKafkaRecordErrorReporter();
 
     // default to snowpipe
     // If it is snowpipe_streaming, set delivery guarantee to exactly once.
@@ -223,7 +291,9 @@ public class SnowflakeSinkTask extends SinkTask {
       if (ingestionType.equals(IngestionMethodConfig.SNOWPIPE_STREAMING)) {
         ingestionDeliveryGuarantee =
             SnowflakeSinkConnectorConfig.IngestionDeliveryGuarantee.EXACTLY_ONCE;
-        kafkaRecordErrorReporter = createKafkaRecordErrorReporter();
+        kafkaRecordErrorReporter =
+            createKafkaRecordErrorReporter(
+                enableCustomJMXMonitoring, parsedConfig.get(Utils.NAME));
       }
     }
 
@@ -241,6 +311,12 @@ public class SnowflakeSinkTask extends SinkTask {
             .setFileSize(bufferSizeBytes)
             .setRecordNumber(bufferCountRecords)
             .setFlushTime(bufferFlushTime)
+            .setFileUploadThreads(fileUploadThreads)
+            .setCleanerThreads(cleanerThreads)
+            .setPartitionWorkerThreads(partitionWorkerThreads)
+            .setPartitionOpenThreads(partitionOpenThreads)
+            .setBufferMemoryLimit(bufferMemoryLimit)
+            .setAdaptiveFlushMaxSize(adaptiveFlushMaxSize)
             .setTopic2TableMap(topic2table)
             .setMetadataConfig(metadataConfig)
             .setBehaviorOnNullValuesConfig(behavior)
@@ -256,6 +332,28 @@ public class SnowflakeSinkTask extends SinkTask {
         getExecutionTimeSec(this.taskStartTime, System.currentTimeMillis()));
   }
 
+  /**
+   * @param parsedConfig connector configuration
+   * @return time given to open() to start the partitions, half of the consumer's
+   *     max.poll.interval.ms
+   */
+  static long getPartitionOpenTimeoutMillis(final Map<String, String> parsedConfig) {
+    String maxPollInterval =
+        parsedConfig.get(CONSUMER_OVERRIDE_PREFIX + ConsumerConfig.MAX_POLL_INTERVAL_MS_CONFIG);
+    long maxPollIntervalMs = DEFAULT_MAX_POLL_INTERVAL_MS;
+    if (maxPollInterval != null) {
+      try {
+        maxPollIntervalMs = Long.parseLong(maxPollInterval.trim());
+      } catch (NumberFormatException e) {
+        STATIC_LOGGER.warn(
+            "Invalid consumer max.poll.interval.ms override {}, using {}",
+            maxPollInterval,
+            DEFAULT_MAX_POLL_INTERVAL_MS);
+      }
+    }
+    return maxPollIntervalMs / 2;
+  }
+
   /**
    * stop method is invoked only once outstanding calls to other methods have completed. e.g. after
    * current put, and a final preCommit has completed.
@@ -265,6 +363,7 @@ public class SnowflakeSinkTask extends SinkTask {
     if (this.sink != null) {
       this.sink.setIsStoppedToTrue(); // close cleaner thread
     }
+    closeKafkaRecordErrorReporter();
 
     this.DYNAMIC_LOGGER.info(
         "task stopped, total task runtime: {} seconds",
@@ -284,8 +383,14 @@ public class SnowflakeSinkTask extends SinkTask {
 
     long startTime = System.currentTimeMillis();
     this.DYNAMIC_LOGGER.info("opening task with TopicPartition number: {}", partitions.size());
+    Map<TopicPartition, String> partitionTables = new LinkedHashMap<>();
     partitions.forEach(
-        tp -> this.sink.startTask(Utils.tableName(tp.topic(), this.topic2table), tp));
+        tp -> partitionTables.put(tp, Utils.tableName(tp.topic(), this.topic2table)));
+    this.sink.startPartitions(partitionTables, this.partitionOpenTimeoutMillis);
+    if (this.consumptionPaused) {
+      // the newly assigned partitions wait for the buffers to be flushed too
+      this.context.pause(partitions.toArray(new TopicPartition[0]));
+    }
     this.DYNAMIC_LOGGER.info(
         "task opened, execution time: {} seconds",
         getExecutionTimeSec(startTime, System.currentTimeMillis()));
@@ -328,10 +433,34 @@ public class SnowflakeSinkTask extends SinkTask {
     this.DYNAMIC_LOGGER.info("calling put with {} records", records.size());
 
     getSink().insert(records);
+    updateConsumptionPause();
 
     logWarningForPutAndPrecommit(startTime, records.size(), "put");
   }
 
+  /**
+   * Pause the assigned partitions when flushing can't keep the buffers under the memory limit,
+   * resume them once enough memory is released. put() is still called while the partitions are
+   * paused, so the usage is checked again on every call.
+   */
+  private void updateConsumptionPause() {
+    boolean overMemoryBudget = getSink().isOverMemoryBudget();
+    if (overMemoryBudget == this.consumptionPaused) {
+      return;
+    }
+    TopicPartition[] partitions = this.context.assignment().toArray(new TopicPartition[0]);
+    if (overMemoryBudget) {
+      this.DYNAMIC_LOGGER.warn(
+          "buffers are over the memory limit, pausing {} partitions", partitions.length);
+      this.context.pause(partitions);
+    } else {
+      this.DYNAMIC_LOGGER.info(
+          "buffers are back under the memory limit, resuming {} partitions", partitions.length);
+      this.context.resume(partitions);
+    }
+    this.consumptionPaused = overMemoryBudget;
+  }
+
   /**
    * Sync committed offsets
    *
@@ -359,6 +488,14 @@ public class SnowflakeSinkTask extends SinkTask {
       return new HashMap<>();
     }
 
+    // the records sent to the DLQ must be delivered before their offsets are committed
+    try {
+      kafkaRecordErrorReporter.flush();
+    } catch (Exception e) {
+      this.DYNAMIC_LOGGER.error("PreCommit error while waiting for DLQ: {} ", e.getMessage());
+      return new HashMap<>();
+    }
+
     Map<TopicPartition, OffsetAndMetadata> committedOffsets = new HashMap<>();
     // it's ok to just log the error since commit can retry
     try {
@@ -459,23 +596,20 @@ public class SnowflakeSinkTask extends SinkTask {
   }
 
   /* Used to report a record back to DLQ if error tolerance is specified */
-  private KafkaRecordErrorReporter createKafkaRecordErrorReporter() {
+  private KafkaRecordErrorReporter createKafkaRecordErrorReporter(
+      final boolean enableCustomJMXMonitoring, final String connectorName) {
     KafkaRecordErrorReporter result = noOpKafkaRecordErrorReporter();
     if (context != null) {
       try {
         ErrantRecordReporter errantRecordReporter = context.errantRecordReporter();
         if (errantRecordReporter != null) {
-          result =
-              (record, error) -> {
-                try {
-                  // Blocking this until record is delivered to DLQ
-                  errantRecordReporter.report(record, error).get();
-                } catch (InterruptedException | ExecutionException e) {
-                  final String errMsg = "ERROR reporting records to ErrantRecordReporter";
-                  this.DYNAMIC_LOGGER.error(errMsg, e);
-                  throw new ConnectException(errMsg, e);
-                }
-              };
+          // records are delivered to DLQ in the background, preCommit waits for them
+          AsyncKafkaRecordErrorReporter asyncReporter =
+              new AsyncKafkaRecordErrorReporter(errantRecordReporter, MAX_IN_FLIGHT_DLQ_RECORDS);
+          if (enableCustomJMXMonitoring) {
+            asyncReporter.registerJmxMetrics(connectorName, this.taskConfigId);
+          }
+          result = asyncReporter;
         } else {
           this.DYNAMIC_LOGGER.info("Errant record reporter is not configured.");
         }
@@ -501,6 +635,13 @@ public class SnowflakeSinkTask extends SinkTask {
         TASK_INSTANCE_TAG_FORMAT, this.taskConfigId, this.taskOpenCount, totalTaskCreationCount);
   }
 
+  /** Unregister the JMX metrics of the asynchronous error reporter, if it is used */
+  private void closeKafkaRecordErrorReporter() {
+    if (kafkaRecordErrorReporter instanceof AsyncKafkaRecordErrorReporter) {
+      ((AsyncKafkaRecordErrorReporter) kafkaRecordErrorReporter).unregisterJmxMetrics();
+    }
+  }
+
   /**
    * For versions older than 2.6
    *
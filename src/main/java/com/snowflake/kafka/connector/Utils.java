@@ -17,10 +17,18 @@
 package com.snowflake.kafka.connector;
 
 import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.BEHAVIOR_ON_NULL_VALUES_CONFIG;
+import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.BUFFER_ADAPTIVE_MAX_SIZE_BYTES;
+import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.BUFFER_FLUSH_ADAPTIVE;
+import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.BUFFER_MEMORY_LIMIT_BYTES;
 import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.BehaviorOnNullValues.VALIDATOR;
 import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.DELIVERY_GUARANTEE;
 import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.INGESTION_METHOD_OPT;
+import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.JDBC_SESSION_POOL_SIZE;
 import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.JMX_OPT;
+import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.PARTITION_OPEN_THREADS;
+import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.PARTITION_WORKER_THREADS;
+import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.SNOWPIPE_CLEANER_THREADS;
+import static com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig.SNOWPIPE_FILE_UPLOAD_THREADS;
 
 import com.snowflake.kafka.connector.internal.BufferThreshold;
 import com.snowflake.kafka.connector.internal.LoggerHandler;
@@ -441,6 +449,42 @@ public class Utils {
       }
     }
 
+    if (!isValidIntConfig(config, SNOWPIPE_FILE_UPLOAD_THREADS, 0)) {
+      configIsValid = false;
+    }
+
+    if (!isValidIntConfig(config, SNOWPIPE_CLEANER_THREADS, 1)) {
+      configIsValid = false;
+    }
+
+    if (!isValidIntConfig(config, PARTITION_WORKER_THREADS, 1)) {
+      configIsValid = false;
+    }
+
+    if (!isValidIntConfig(config, PARTITION_OPEN_THREADS, 1)) {
+      configIsValid = false;
+    }
+
+    if (!isValidLongConfig(config, BUFFER_MEMORY_LIMIT_BYTES, 0)) {
+      configIsValid = false;
+    }
+
+    if (config.containsKey(BUFFER_FLUSH_ADAPTIVE)) {
+      if (!(config.get(BUFFER_FLUSH_ADAPTIVE).equalsIgnoreCase("true")
+          || config.get(BUFFER_FLUSH_ADAPTIVE).equalsIgnoreCase("false"))) {
+        LOGGER.error("Kafka config:{} should either be true or false", BUFFER_FLUSH_ADAPTIVE);
+        configIsValid = false;
+      }
+    }
+
+    if (!isValidLongConfig(config, BUFFER_ADAPTIVE_MAX_SIZE_BYTES, 1)) {
+      configIsValid = false;
+    }
+
+    if (!isValidIntConfig(config, JDBC_SESSION_POOL_SIZE, 0)) {
+      configIsValid = false;
+    }
+
     try {
       SnowflakeSinkConnectorConfig.IngestionDeliveryGuarantee.of(
           config.getOrDefault(
@@ -462,6 +506,52 @@ public class Utils {
     return connectorName;
   }
 
+  /**
+   * Check an optional integer config, it is valid if absent or an integer no less than min
+   *
+   * @param config input config object
+   * @param key name of the config
+   * @param min minimum allowed value
+   * @return true if the config is absent or valid
+   */
+  static boolean isValidIntConfig(Map<String, String> config, String key, int min) {
+    if (!config.containsKey(key)) {
+      return true;
+    }
+    try {
+      if (Integer.parseInt(config.get(key)) >= min) {
+        return true;
+      }
+      LOGGER.error("Kafka config:{} should be an integer no less than {}", key, min);
+    } catch (NumberFormatException e) {
+      LOGGER.error("Kafka config:{} should be an integer, got:{}", key, config.get(key));
+    }
+    return false;
+  }
+
+  /**
+   * Check an optional long config, it is valid if absent or a long no less than min
+   *
+   * @param config input config object
+   * @param key name of the config
+   * @param min minimum allowed value
+   * @return true if the config is absent or valid
+   */
+  static boolean isValidLongConfig(Map<String, String> config, String key, long min) {
+    if (!config.containsKey(key)) {
+      return true;
+    }
+    try {
+      if (Long.parseLong(config.get(key)) >= min) {
+        return true;
+      }
+      LOGGER.error("Kafka config:{} should be a long no less than {}", key, min);
+    } catch (NumberFormatException e) {
+      LOGGER.error("Kafka config:{} should be a long, got:{}", key, config.get(key));
+    }
+    return false;
+  }
+
   /**
    * modify invalid application name in config and return the generated application name
    *
@@ -637,4 +727,36 @@ public class Utils {
     }
     return format;
   }
+
+  /**
+   * Size of a string encoded in UTF-8, computed from its characters without encoding it. An
+   * unpaired surrogate counts as one byte, like the replacement character written by {@link
+   * String#getBytes(java.nio.charset.Charset)}.
+   *
+   * @param sequence string to measure
+   * @return number of bytes of the string in UTF-8
+   */
+  public static long utf8Length(final CharSequence sequence) {
+    long length = 0;
+    int size = sequence.length();
+    for (int i = 0; i < size; i++) {
+      char c = sequence.charAt(i);
+      if (c < 0x80) {
+        length += 1;
+      } else if (c < 0x800) {
+        length += 2;
+      } else if (Character.isHighSurrogate(c)
+          && i + 1 < size
+          && Character.isLowSurrogate(sequence.charAt(i + 1))) {
+        // supplementary character
+        length += 4;
+        i++;
+      } else if (Character.isSurrogate(c)) {
+        length += 1;
+      } else {
+        length += 3;
+      }
+    }
+    return length;
+  }
 }
@@ -0,0 +1,199 @@
+package com.snowflake.kafka.connector.dlq;
+
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.DLQ_BACKPRESSURE_WAIT_COUNT;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.DLQ_FAILED_COUNT;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.DLQ_IN_FLIGHT_COUNT;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.DLQ_REPORTED_COUNT;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.DLQ_SUB_DOMAIN;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.JMX_METRIC_PREFIX;
+
+import com.codahale.metrics.Gauge;
+import com.codahale.metrics.MetricRegistry;
+import com.codahale.metrics.jmx.JmxReporter;
+import com.google.common.annotations.VisibleForTesting;
+import com.snowflake.kafka.connector.internal.LoggerHandler;
+import com.snowflake.kafka.connector.internal.SnowflakeErrors;
+import java.util.ArrayDeque;
+import java.util.Queue;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.Future;
+import java.util.concurrent.atomic.AtomicLong;
+import javax.management.MalformedObjectNameException;
+import javax.management.ObjectName;
+import org.apache.kafka.connect.errors.ConnectException;
+import org.apache.kafka.connect.sink.ErrantRecordReporter;
+import org.apache.kafka.connect.sink.SinkRecord;
+
+/**
+ * Sends records to the dead letter queue through an {@link ErrantRecordReporter} without waiting
+ * for each of them to be acknowledged.
+ *
+ * <p>The futures of the reports are kept until {@link #flush()}, which the task calls before
+ * committing offsets, and a streaming channel before inserting rows with an offset token covering
+ * reported records, so an offset is only committed once its bad records are in the DLQ. At most
+ * maxInFlightReports records are in flight, a report beyond that waits for the oldest one.
+ *
+ * <p>The first failed delivery fails every later report and flush, like the blocking reporter
+ * failed put().
+ */
+public class AsyncKafkaRecordErrorReporter implements KafkaRecordErrorReporter {
+  private static final LoggerHandler LOGGER =
+      new LoggerHandler(AsyncKafkaRecordErrorReporter.class.getName());
+
+  private static final String ERROR_MESSAGE = "ERROR reporting records to ErrantRecordReporter";
+
+  private final ErrantRecordReporter errantRecordReporter;
+  private final int maxInFlightReports;
+
+  // reports not acknowledged yet, oldest first
+  private final Queue<Future<Void>> inFlightReports;
+
+  private final AtomicLong reportedCount = new AtomicLong();
+  private final AtomicLong failedCount = new AtomicLong();
+  private final AtomicLong inFlightCount = new AtomicLong();
+  private final AtomicLong backpressureWaitCount = new AtomicLong();
+
+  // first delivery failure
+  private ConnectException failure;
+
+  private JmxReporter jmxReporter;
+
+  /**
+   * @param errantRecordReporter reporter of the Kafka Connect runtime
+   * @param maxInFlightReports maximum number of records reported and not acknowledged yet
+   */
+  public AsyncKafkaRecordErrorReporter(
+      final ErrantRecordReporter errantRecordReporter, final int maxInFlightReports) {
+    this.errantRecordReporter = errantRecordReporter;
+    this.maxInFlightReports = Math.max(1, maxInFlightReports);
+    this.inFlightReports = new ArrayDeque<>();
+  }
+
+  @Override
+  public synchronized void reportError(final SinkRecord record, final Exception e) {
+    throwIfFailed();
+    while (inFlightReports.size() >= maxInFlightReports) {
+      backpressureWaitCount.incrementAndGet();
+      await(inFlightReports.poll());
+      throwIfFailed();
+    }
+    inFlightReports.add(errantRecordReporter.report(record, e));
+    inFlightCount.incrementAndGet();
+    reportedCount.incrementAndGet();
+  }
+
+  /**
+   * Wait until every reported record is acknowledged
+   *
+   * @throws ConnectException if a record could not be delivered
+   */
+  @Override
+  public synchronized void flush() {
+    while (!inFlightReports.isEmpty()) {
+      await(inFlightReports.poll());
+    }
+    throwIfFailed();
+  }
+
+  private void await(final Future<Void> report) {
+    try {
+      report.get();
+    } catch (InterruptedException e) {
+      Thread.currentThread().interrupt();
+      recordFailure(e);
+    } catch (ExecutionException e) {
+      recordFailure(e.getCause());
+    } finally {
+      inFlightCount.decrementAndGet();
+    }
+  }
+
+  private void recordFailure(final Throwable cause) {
+    failedCount.incrementAndGet();
+    if (failure == null) {
+      LOGGER.error("{}: {}", ERROR_MESSAGE, cause);
+      failure = new ConnectException(ERROR_MESSAGE, cause);
+    }
+  }
+
+  private void throwIfFailed() {
+    if (failure != null) {
+      throw failure;
+    }
+  }
+
+  @VisibleForTesting
+  long getReportedCount() {
+    return reportedCount.get();
+  }
+
+  @VisibleForTesting
+  long getFailedCount() {
+    return failedCount.get();
+  }
+
+  @VisibleForTesting
+  long getInFlightCount() {
+    return inFlightCount.get();
+  }
+
+  @VisibleForTesting
+  long getBackpressureWaitCount() {
+    return backpressureWaitCount.get();
+  }
+
+  /**
+   * Expose the reporter metrics as MBeans, does nothing if they are already exposed
+   *
+   * @param connectorName name of the connector
+   * @param taskId id of the task owning the reporter
+   */
+  public synchronized void registerJmxMetrics(final String connectorName, final String taskId) {
+    if (jmxReporter != null) {
+      return;
+    }
+    MetricRegistry metricRegistry = new MetricRegistry();
+    metricRegistry.register(DLQ_REPORTED_COUNT, (Gauge<Long>) reportedCount::get);
+    metricRegistry.register(DLQ_FAILED_COUNT, (Gauge<Long>) failedCount::get);
+    metricRegistry.register(DLQ_IN_FLIGHT_COUNT, (Gauge<Long>) inFlightCount::get);
+    metricRegistry.register(DLQ_BACKPRESSURE_WAIT_COUNT, (Gauge<Long>) backpressureWaitCount::get);
+    jmxReporter =
+        JmxReporter.forRegistry(metricRegistry)
+            .inDomain(JMX_METRIC_PREFIX)
+            .createsObjectNamesWith(
+                (ignoreMeterType, jmxDomain, metricName) ->
+                    getObjectName(jmxDomain, connectorName, taskId, metricName))
+            .build();
+    jmxReporter.start();
+  }
+
+  /** Remove the MBeans registered by {@link #registerJmxMetrics(String, String)} */
+  public synchronized void unregisterJmxMetrics() {
+    if (jmxReporter != null) {
+      jmxReporter.stop();
+      jmxReporter = null;
+    }
+  }
+
+  private static ObjectName getObjectName(
+      final String jmxDomain,
+      final String connectorName,
+      final String taskId,
+      final String metricName) {
+    try {
+      return new ObjectName(
+          jmxDomain
+              + ":connector="
+              + connectorName
+              + ",task="
+              + taskId
+              + ",category="
+              + DLQ_SUB_DOMAIN
+              + ",name="
+              + metricName);
+    } catch (MalformedObjectNameException e) {
+      LOGGER.warn("Could not create Object name for MetricName:{}", metricName);
+      throw SnowflakeErrors.ERROR_5020.getException();
+    }
+  }
+}
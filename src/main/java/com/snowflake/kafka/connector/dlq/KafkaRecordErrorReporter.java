@@ -14,4 +14,10 @@ import org.apache.kafka.connect.sink.SinkRecord;
  */
 public interface KafkaRecordErrorReporter {
   void reportError(SinkRecord record, Exception e);
+
+  /**
+   * Wait until the reported records are delivered, called before offsets are committed. Does
+   * nothing for reporters which deliver the records synchronously.
+   */
+  default void flush() {}
 }
@@ -0,0 +1,111 @@
+package com.snowflake.kafka.connector.internal;
+
+/**
+ * Flush thresholds of one partition, tuned from the rate at which its records arrive.
+ *
+ * <p>A fixed buffer.flush.time and buffer.size.bytes give small files for busy partitions and late
+ * flushes for idle ones. Here buffer.flush.time is the latency target, the longest time a record
+ * stays in the buffer, and the rates observed at each flush decide the thresholds:
+ *
+ * <ul>
+ *   <li>the size threshold is the size the partition buffers within the latency target, between
+ *       buffer.size.bytes and the maximum file size, so busy partitions produce fewer, larger files
+ *   <li>the time threshold is the latency target, or the minimum flush time when fewer than two
+ *       records are expected within the latency target, since waiting longer doesn't batch anything
+ * </ul>
+ *
+ * <p>Until the first flush, the configured thresholds are used.
+ */
+public class AdaptiveFlushController {
+  // weight of the latest flush in the moving averages of the rates
+  private static final double RATE_SMOOTHING = 0.3;
+
+  // waiting for the latency target is worth it only when it batches at least this many records
+  private static final double MIN_BATCHED_RECORDS = 2;
+
+  private final long minFlushTimeMillis;
+  private final long maxFlushTimeMillis;
+  private final long minSizeBytes;
+  private final long maxSizeBytes;
+
+  // moving averages, negative until the first flush
+  private double bytesPerMilli = -1;
+  private double recordsPerMilli = -1;
+
+  // read by JMX
+  private volatile long flushTimeThresholdMillis;
+  private volatile long flushSizeThresholdBytes;
+
+  /**
+   * @param minFlushTimeMillis shortest time between two flushes
+   * @param maxFlushTimeMillis latency target, longest time between two flushes
+   * @param minSizeBytes smallest size threshold
+   * @param maxSizeBytes largest size threshold, the maximum file size
+   */
+  public AdaptiveFlushController(
+      final long minFlushTimeMillis,
+      final long maxFlushTimeMillis,
+      final long minSizeBytes,
+      final long maxSizeBytes) {
+    this.minFlushTimeMillis = Math.min(minFlushTimeMillis, maxFlushTimeMillis);
+    this.maxFlushTimeMillis = maxFlushTimeMillis;
+    this.minSizeBytes = minSizeBytes;
+    this.maxSizeBytes = Math.max(minSizeBytes, maxSizeBytes);
+    this.flushTimeThresholdMillis = maxFlushTimeMillis;
+    this.flushSizeThresholdBytes = minSizeBytes;
+  }
+
+  /**
+   * Update the rates and the thresholds with a flushed buffer
+   *
+   * @param sizeBytes size of the flushed buffer
+   * @param numOfRecords number of records in the flushed buffer
+   * @param elapsedMillis time since the previous flush
+   */
+  public synchronized void onFlush(
+      final long sizeBytes, final long numOfRecords, final long elapsedMillis) {
+    if (elapsedMillis <= 0) {
+      return;
+    }
+    bytesPerMilli = smooth(bytesPerMilli, (double) sizeBytes / elapsedMillis);
+    recordsPerMilli = smooth(recordsPerMilli, (double) numOfRecords / elapsedMillis);
+
+    long sizeWithinLatencyTarget = (long) (bytesPerMilli * maxFlushTimeMillis);
+    flushSizeThresholdBytes =
+        Math.max(minSizeBytes, Math.min(maxSizeBytes, sizeWithinLatencyTarget));
+    flushTimeThresholdMillis =
+        recordsPerMilli * maxFlushTimeMillis < MIN_BATCHED_RECORDS
+            ? minFlushTimeMillis
+            : maxFlushTimeMillis;
+  }
+
+  private static double smooth(final double average, final double value) {
+    return average < 0 ? value : RATE_SMOOTHING * value + (1 - RATE_SMOOTHING) * average;
+  }
+
+  /**
+   * @param previousFlushTimeStampMs time of the previous flush
+   * @return true if the time threshold has been reached
+   */
+  public boolean isFlushTimeBased(final long previousFlushTimeStampMs) {
+    return System.currentTimeMillis() - previousFlushTimeStampMs >= flushTimeThresholdMillis;
+  }
+
+  /**
+   * @param bufferSizeBytes current size of the buffer
+   * @return true if the size threshold has been reached
+   */
+  public boolean isFlushBufferedBytesBased(final long bufferSizeBytes) {
+    return bufferSizeBytes >= flushSizeThresholdBytes;
+  }
+
+  /** @return current time threshold in milliseconds */
+  public long getFlushTimeThresholdMillis() {
+    return flushTimeThresholdMillis;
+  }
+
+  /** @return current size threshold in bytes */
+  public long getFlushSizeThresholdBytes() {
+    return flushSizeThresholdBytes;
+  }
+}
@@ -0,0 +1,92 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.io.ByteArrayOutputStream;
+import java.nio.charset.StandardCharsets;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.ObjectMapper;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.node.ArrayNode;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.node.ObjectNode;
+
+/**
+ * Broken keys and values of one partition, written to the table stage together as one file holding
+ * their bytes back to back, and a manifest locating each of them in that file:
+ *
+ * <pre>
+ * [{"offset":123,"type":"value","start":0,"length":7}, ...]
+ * </pre>
+ *
+ * <p>Not thread safe, the caller guards the batch.
+ */
+class BrokenRecordBatch {
+  private static final ObjectMapper MAPPER = new ObjectMapper();
+
+  private final ByteArrayOutputStream data;
+  private final ArrayNode manifest;
+  private long firstOffset;
+  private long lastOffset;
+  // time at which the first broken content was added
+  private long creationTime;
+
+  BrokenRecordBatch() {
+    this.data = new ByteArrayOutputStream();
+    this.manifest = MAPPER.createArrayNode();
+    this.firstOffset = -1;
+    this.lastOffset = -1;
+    this.creationTime = -1;
+  }
+
+  /**
+   * Add the broken key or value of a record
+   *
+   * @param offset record offset
+   * @param isKey is the broken content a key or a value
+   * @param content broken content
+   */
+  void add(final long offset, final boolean isKey, final byte[] content) {
+    if (isEmpty()) {
+      firstOffset = offset;
+      creationTime = System.currentTimeMillis();
+    }
+    lastOffset = offset;
+    ObjectNode entry = manifest.addObject();
+    entry.put("offset", offset);
+    entry.put("type", isKey ? "key" : "value");
+    entry.put("start", data.size());
+    entry.put("length", content.length);
+    data.write(content, 0, content.length);
+  }
+
+  boolean isEmpty() {
+    return manifest.size() == 0;
+  }
+
+  /** @return number of broken keys and values */
+  int getNumOfContents() {
+    return manifest.size();
+  }
+
+  long getSizeBytes() {
+    return data.size();
+  }
+
+  long getFirstOffset() {
+    return firstOffset;
+  }
+
+  long getLastOffset() {
+    return lastOffset;
+  }
+
+  long getCreationTime() {
+    return creationTime;
+  }
+
+  /** @return the broken contents, back to back */
+  byte[] getData() {
+    return data.toByteArray();
+  }
+
+  /** @return the manifest in JSON */
+  byte[] getManifest() {
+    return manifest.toString().getBytes(StandardCharsets.UTF_8);
+  }
+}
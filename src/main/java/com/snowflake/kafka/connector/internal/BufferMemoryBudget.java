@@ -0,0 +1,97 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+import java.util.function.Consumer;
+
+/**
+ * Task wide limit on the memory held by the partition buffers.
+ *
+ * <p>Buffer thresholds are per partition, so a task with many partitions can hold many times the
+ * buffer size in heap. Once the buffered bytes of all the partitions go over the limit, the largest
+ * buffers are flushed first until the usage is back under the low water mark, three quarters of
+ * the limit. Bytes which are flushed but not released yet, e.g. files still being uploaded, can't
+ * be flushed again; when they alone keep the usage over the limit, flushing doesn't keep up and
+ * consumption should be paused until the usage is back under the low water mark.
+ *
+ * <p>A limit of 0 disables the budget.
+ */
+public class BufferMemoryBudget extends EnableLogging {
+  private final long limitBytes;
+  private final long lowWaterMarkBytes;
+
+  // true from the time flushing couldn't bring the usage under the limit, until it is back under
+  // the low water mark
+  private boolean overBudget;
+
+  /** @param limitBytes maximum bytes buffered by all partitions of the task, 0 to disable */
+  public BufferMemoryBudget(final long limitBytes) {
+    this.limitBytes = Math.max(0, limitBytes);
+    this.lowWaterMarkBytes = this.limitBytes / 4 * 3;
+  }
+
+  /** @return whether the budget is enforced */
+  public boolean isEnabled() {
+    return limitBytes > 0;
+  }
+
+  /**
+   * Flush the largest buffers when the usage is over the limit
+   *
+   * @param bufferedBytes bytes buffered by each partition
+   * @param inFlightBytes bytes flushed but not released yet
+   * @param flush flushes the buffer of the given partition
+   * @param <K> partition key
+   * @return whether consumption should be paused
+   */
+  public <K> boolean enforce(
+      final Map<K, Long> bufferedBytes, final long inFlightBytes, final Consumer<K> flush) {
+    if (!isEnabled()) {
+      return false;
+    }
+    long usedBytes = inFlightBytes;
+    for (long bytes : bufferedBytes.values()) {
+      usedBytes += bytes;
+    }
+    if (usedBytes > limitBytes) {
+      List<Map.Entry<K, Long>> largestFirst = new ArrayList<>(bufferedBytes.entrySet());
+      largestFirst.sort(Map.Entry.<K, Long>comparingByValue().reversed());
+      int flushed = 0;
+      long usedBeforeFlush = usedBytes;
+      for (Map.Entry<K, Long> buffer : largestFirst) {
+        if (usedBytes <= lowWaterMarkBytes || buffer.getValue() == 0) {
+          break;
+        }
+        flush.accept(buffer.getKey());
+        usedBytes -= buffer.getValue();
+        flushed++;
+      }
+      LOG_INFO_MSG(
+          "buffer memory usage {} bytes over the limit {} bytes, flushed {} buffers, {} bytes left",
+          usedBeforeFlush,
+          limitBytes,
+          flushed,
+          usedBytes);
+    }
+
+    if (!overBudget && usedBytes > limitBytes) {
+      overBudget = true;
+      LOG_WARN_MSG(
+          "buffer memory usage {} bytes still over the limit {} bytes after flushing, {} bytes in"
+              + " flight",
+          usedBytes,
+          limitBytes,
+          inFlightBytes);
+    } else if (overBudget && usedBytes <= lowWaterMarkBytes) {
+      overBudget = false;
+      LOG_INFO_MSG("buffer memory usage {} bytes back under the low water mark", usedBytes);
+    }
+    return overBudget;
+  }
+
+  /** @return whether consumption should be paused, as of the last {@link #enforce} */
+  public boolean isOverBudget() {
+    return overBudget;
+  }
+}
@@ -1,5 +1,6 @@
 package com.snowflake.kafka.connector.internal;
 
+import java.util.List;
 import java.util.regex.Matcher;
 import java.util.regex.Pattern;
 
@@ -43,36 +44,48 @@ public class FileNameUtils {
   }
 
   /**
-   * generate file name for broken data
+   * generate file name for a batch of broken data
    *
    * @param appName app name
    * @param table table name
    * @param partition partition id
-   * @param offset record offset
-   * @param isKey is the broken record a key or a value
+   * @param start offset of the first broken record
+   * @param end offset of the last broken record
    * @return file name
    */
   static String brokenRecordFileName(
-      String appName, String table, int partition, long offset, boolean isKey) {
-    return brokenRecordFileName(filePrefix(appName, table, partition), offset, isKey);
+      String appName, String table, int partition, long start, long end) {
+    return brokenRecordFileName(filePrefix(appName, table, partition), start, end);
   }
 
   /**
-   * generate file name for broken data
+   * generate file name for a batch of broken data File Name Format:
+   * app/table/partition/start_end_timeStamp_broken.gz
    *
    * @param prefix prefix
-   * @param offset record offset
-   * @param isKey is the broken record a key or a value
+   * @param start offset of the first broken record
+   * @param end offset of the last broken record
    * @return file name
    */
-  static String brokenRecordFileName(String prefix, long offset, boolean isKey) {
+  static String brokenRecordFileName(String prefix, long start, long end) {
     long time = System.currentTimeMillis();
-    String isKeyString = isKey ? "key" : "value";
-    String fileName = prefix + offset + "_" + isKeyString + "_" + time + ".gz";
+    String fileName = prefix + start + "_" + end + "_" + time + "_broken.gz";
     LOGGER.debug("generated broken data file name: {}", fileName);
     return fileName;
   }
 
+  /**
+   * generate the name of the manifest of a batch of broken data File Name Format:
+   * app/table/partition/start_end_timeStamp_broken_manifest.json.gz
+   *
+   * @param brokenRecordFileName name of the batch file
+   * @return manifest file name
+   */
+  static String brokenRecordManifestFileName(String brokenRecordFileName) {
+    return brokenRecordFileName.substring(0, brokenRecordFileName.length() - ".gz".length())
+        + "_manifest.json.gz";
+  }
+
   /**
    * generate file prefix
    *
@@ -89,6 +102,9 @@ public class FileNameUtils {
   // /startOffset_endOffset_time_format.json.gz
   private static Pattern FILE_NAME_PATTERN =
       Pattern.compile("^[^/]+/[^/]+/(\\d+)/(\\d+)_(\\d+)_(\\d+)\\.json\\.gz$");
+
+  // file names that can be matched by a REMOVE pattern without escaping anything but the dots
+  private static final Pattern REMOVE_PATTERN_SAFE_NAME = Pattern.compile("^[A-Za-z0-9_.-]+$");
   /**
    * verify file name
    *
@@ -191,6 +207,29 @@ public class FileNameUtils {
     return null;
   }
 
+  /**
+   * Build the PATTERN of a REMOVE statement matching exactly the given files of one prefix: any
+   * path ending with a slash followed by one of the names. Dots are put in brackets so the pattern
+   * needs no backslash escaping inside the SQL string literal.
+   *
+   * @param names file names without prefix
+   * @return the pattern, or null if a name contains characters that can't be safely matched
+   */
+  static String removePattern(List<String> names) {
+    StringBuilder pattern = new StringBuilder(".*/(");
+    for (int i = 0; i < names.size(); i++) {
+      String name = names.get(i);
+      if (name == null || !REMOVE_PATTERN_SAFE_NAME.matcher(name).matches()) {
+        return null;
+      }
+      if (i > 0) {
+        pattern.append('|');
+      }
+      pattern.append(name.replace(".", "[.]"));
+    }
+    return pattern.append(')').toString();
+  }
+
   /**
    * read a value from file name
    *
@@ -0,0 +1,157 @@
+package com.snowflake.kafka.connector.internal;
+
+import com.google.common.annotations.VisibleForTesting;
+import java.io.ByteArrayInputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.io.SequenceInputStream;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.List;
+import java.util.Queue;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.zip.GZIPOutputStream;
+
+/**
+ * Gzip compressed content of one file going to an internal stage.
+ *
+ * <p>Records are encoded to UTF-8 and compressed as soon as they are appended, into fixed size
+ * chunks borrowed from a JVM wide pool. Only the compressed bytes are kept in heap, instead of a
+ * StringBuilder, the file String and its UTF-8 copy. The content can be read any number of times
+ * once the buffer is finished, so uploads can be retried. Chunks go back to the pool on {@link
+ * #release()}.
+ */
+public class GzipFileBuffer {
+  @VisibleForTesting static final int CHUNK_SIZE = 64 * 1024;
+
+  private static final int GZIP_BUFFER_SIZE = 8 * 1024;
+
+  // at most 16 MB of free chunks are kept around
+  private static final int MAX_POOLED_CHUNKS = 256;
+
+  private static final Queue<byte[]> CHUNK_POOL = new ArrayBlockingQueue<>(MAX_POOLED_CHUNKS);
+
+  private final List<byte[]> chunks;
+  // created on the first append, idle partitions don't hold a deflater
+  private GZIPOutputStream gzip;
+  // bytes used in the last chunk
+  private int lastChunkSize;
+  private long uncompressedSizeBytes;
+  private long compressedSizeBytes;
+  private boolean finished;
+
+  public GzipFileBuffer() {
+    this.chunks = new ArrayList<>();
+    this.lastChunkSize = CHUNK_SIZE;
+  }
+
+  /**
+   * Compress one more record into the buffer
+   *
+   * @param data record
+   * @return size of the record encoded in UTF-8
+   */
+  public long append(String data) {
+    if (finished) {
+      throw new IllegalStateException("Can't append to a finished buffer");
+    }
+    byte[] bytes = data.getBytes(StandardCharsets.UTF_8);
+    try {
+      getGzip().write(bytes);
+    } catch (IOException e) {
+      throw SnowflakeErrors.ERROR_5023.getException(e);
+    }
+    uncompressedSizeBytes += bytes.length;
+    return bytes.length;
+  }
+
+  /** Write the gzip trailer and free the deflater, nothing can be appended afterwards */
+  public void finish() {
+    if (!finished) {
+      try {
+        getGzip().close();
+      } catch (IOException e) {
+        throw SnowflakeErrors.ERROR_5023.getException(e);
+      }
+      finished = true;
+    }
+  }
+
+  /** @return a new stream over the compressed content, the buffer is finished first */
+  public InputStream getInputStream() {
+    finish();
+    List<InputStream> streams = new ArrayList<>(chunks.size());
+    for (int i = 0; i < chunks.size(); i++) {
+      int length = i == chunks.size() - 1 ? lastChunkSize : CHUNK_SIZE;
+      streams.add(new ByteArrayInputStream(chunks.get(i), 0, length));
+    }
+    return new SequenceInputStream(Collections.enumeration(streams));
+  }
+
+  /** @return size of the appended records encoded in UTF-8 */
+  public long getUncompressedSizeBytes() {
+    return uncompressedSizeBytes;
+  }
+
+  /** @return size of the compressed content written so far */
+  public long getCompressedSizeBytes() {
+    return compressedSizeBytes;
+  }
+
+  /** Return the chunks to the pool, the buffer must not be used anymore */
+  public void release() {
+    for (byte[] chunk : chunks) {
+      CHUNK_POOL.offer(chunk);
+    }
+    chunks.clear();
+  }
+
+  /** @return number of free chunks in the pool */
+  @VisibleForTesting
+  static int getPooledChunkCount() {
+    return CHUNK_POOL.size();
+  }
+
+  private GZIPOutputStream getGzip() throws IOException {
+    if (gzip == null) {
+      gzip = new GZIPOutputStream(new ChunkOutputStream(), GZIP_BUFFER_SIZE);
+    }
+    return gzip;
+  }
+
+  private static byte[] borrowChunk() {
+    byte[] chunk = CHUNK_POOL.poll();
+    return chunk == null ? new byte[CHUNK_SIZE] : chunk;
+  }
+
+  /** Collect the compressed bytes into the chunks */
+  private class ChunkOutputStream extends OutputStream {
+    @Override
+    public void write(int b) {
+      if (lastChunkSize == CHUNK_SIZE) {
+        chunks.add(borrowChunk());
+        lastChunkSize = 0;
+      }
+      chunks.get(chunks.size() - 1)[lastChunkSize++] = (byte) b;
+      compressedSizeBytes++;
+    }
+
+    @Override
+    public void write(byte[] b, int off, int len) {
+      while (len > 0) {
+        if (lastChunkSize == CHUNK_SIZE) {
+          chunks.add(borrowChunk());
+          lastChunkSize = 0;
+        }
+        int length = Math.min(len, CHUNK_SIZE - lastChunkSize);
+        System.arraycopy(b, off, chunks.get(chunks.size() - 1), lastChunkSize, length);
+        lastChunkSize += length;
+        compressedSizeBytes += length;
+        off += length;
+        len -= length;
+      }
+    }
+  }
+}
@@ -0,0 +1,116 @@
+package com.snowflake.kafka.connector.internal;
+
+import com.google.common.annotations.VisibleForTesting;
+import java.util.HashMap;
+import java.util.Iterator;
+import java.util.Map;
+import java.util.concurrent.TimeUnit;
+import java.util.function.Function;
+import net.snowflake.ingest.SimpleIngestManager;
+
+/**
+ * Task wide registry of the Snowpipe ingest managers, one per pipe.
+ *
+ * <p>The ingest SDK binds a pipe to its SimpleIngestManager, and every manager holds its own JWT
+ * and the thread renewing it, so requests of a pipe still go through a manager of that pipe. What
+ * the registry avoids is managers nobody uses: a manager is only created on the first request of
+ * its pipe, so idle partitions hold none, it is reused when its pipe is opened again after a
+ * rebalance, and it is closed once no pipe has used it for a while.
+ */
+class IngestManagerRegistry extends EnableLogging {
+  // time after which a manager no pipe uses is closed
+  static final long DEFAULT_IDLE_TIMEOUT_MILLIS = TimeUnit.MINUTES.toMillis(10);
+
+  private final Function<String, SimpleIngestManager> managerFactory;
+  private final long idleTimeoutMillis;
+  private final Map<String, Registration> managers;
+
+  /**
+   * @param managerFactory creates the manager of a fully qualified pipe name
+   * @param idleTimeoutMillis time after which a manager no pipe uses is closed
+   */
+  IngestManagerRegistry(
+      final Function<String, SimpleIngestManager> managerFactory, final long idleTimeoutMillis) {
+    this.managerFactory = managerFactory;
+    this.idleTimeoutMillis = idleTimeoutMillis;
+    this.managers = new HashMap<>();
+  }
+
+  /**
+   * Get the manager of a pipe, create it if missing. Every acquire must be followed by a {@link
+   * #release(String)}.
+   *
+   * @param pipeName fully qualified pipe name
+   * @return manager of the pipe
+   */
+  synchronized SimpleIngestManager acquire(final String pipeName) {
+    closeIdleManagers();
+    Registration registration = managers.get(pipeName);
+    if (registration == null) {
+      registration = new Registration(managerFactory.apply(pipeName));
+      managers.put(pipeName, registration);
+      LOG_INFO_MSG("created ingest manager for pipe {}, {} managers", pipeName, managers.size());
+    }
+    registration.users++;
+    return registration.manager;
+  }
+
+  /**
+   * Give back a manager returned by {@link #acquire(String)}, it is kept for a while in case the
+   * pipe is used again
+   *
+   * @param pipeName fully qualified pipe name
+   */
+  synchronized void release(final String pipeName) {
+    Registration registration = managers.get(pipeName);
+    if (registration != null && registration.users > 0 && --registration.users == 0) {
+      registration.idleSince = System.currentTimeMillis();
+    }
+    closeIdleManagers();
+  }
+
+  /** Close all the managers, called when the task stops */
+  synchronized void close() {
+    managers.forEach((pipeName, registration) -> closeManager(pipeName, registration.manager));
+    managers.clear();
+  }
+
+  @VisibleForTesting
+  synchronized int size() {
+    return managers.size();
+  }
+
+  private void closeIdleManagers() {
+    long currentTime = System.currentTimeMillis();
+    Iterator<Map.Entry<String, Registration>> iterator = managers.entrySet().iterator();
+    while (iterator.hasNext()) {
+      Map.Entry<String, Registration> entry = iterator.next();
+      Registration registration = entry.getValue();
+      if (registration.users == 0 && currentTime - registration.idleSince >= idleTimeoutMillis) {
+        iterator.remove();
+        closeManager(entry.getKey(), registration.manager);
+      }
+    }
+  }
+
+  private void closeManager(final String pipeName, final SimpleIngestManager manager) {
+    try {
+      manager.close();
+      LOG_INFO_MSG("closed ingest manager for pipe {}", pipeName);
+    } catch (Exception e) {
+      LOG_ERROR_MSG("Failed to close ingest manager for pipe {}: {}", pipeName, e.getMessage());
+    }
+  }
+
+  private static class Registration {
+    private final SimpleIngestManager manager;
+    // number of ingestion services using the manager
+    private int users;
+    // time at which the last user released the manager
+    private long idleSince;
+
+    private Registration(final SimpleIngestManager manager) {
+      this.manager = manager;
+    }
+  }
+}
@@ -0,0 +1,151 @@
+package com.snowflake.kafka.connector.internal;
+
+import com.google.common.annotations.VisibleForTesting;
+import java.sql.Connection;
+import java.sql.SQLException;
+import java.util.ArrayDeque;
+import java.util.Deque;
+import java.util.function.Supplier;
+
+/**
+ * JDBC sessions of a task running the stage file operations, apart from the main session.
+ *
+ * <p>A JDBC connection runs one statement at a time, so with a single session the cleaner threads
+ * purging stages, the broken record uploads and the DDL and metadata queries of the partitions
+ * being opened all wait for each other. The stage file operations borrow a session of this pool
+ * instead, at most poolSize of them run at once and the main session stays free for the DDL and
+ * metadata queries.
+ *
+ * <p>Sessions are created on their first use, so tasks which never touch a stage open none. With a
+ * pool size of 0 every borrow returns the main session.
+ */
+class JdbcSessionPool extends EnableLogging {
+  private final Connection mainSession;
+  private final Supplier<Connection> sessionFactory;
+  private final int poolSize;
+
+  // sessions not borrowed, the most recently used first
+  private final Deque<Connection> idleSessions;
+  private int openSessions;
+  private boolean closed;
+
+  /**
+   * @param mainSession session used when the pool size is 0
+   * @param sessionFactory opens a new session
+   * @param poolSize maximum number of sessions opened by the pool
+   */
+  JdbcSessionPool(
+      final Connection mainSession, final Supplier<Connection> sessionFactory, final int poolSize) {
+    this.mainSession = mainSession;
+    this.sessionFactory = sessionFactory;
+    this.poolSize = Math.max(0, poolSize);
+    this.idleSessions = new ArrayDeque<>();
+    this.openSessions = 0;
+    this.closed = false;
+  }
+
+  /**
+   * Borrow a session, wait until one is given back if all of them are in use. Every borrow must be
+   * followed by a {@link #release(Connection)}, and a caller must not borrow a second session
+   * before releasing the first one.
+   *
+   * @return a session for the exclusive use of the caller
+   */
+  Connection borrow() {
+    if (poolSize == 0) {
+      return mainSession;
+    }
+    int sessionNumber;
+    synchronized (this) {
+      while (true) {
+        if (closed) {
+          throw SnowflakeErrors.ERROR_1003.getException();
+        }
+        Connection session = idleSessions.pollFirst();
+        if (session != null) {
+          if (isOpen(session)) {
+            return session;
+          }
+          // expired or broken, a new session replaces it
+          openSessions--;
+        } else if (openSessions < poolSize) {
+          sessionNumber = ++openSessions;
+          break;
+        } else {
+          try {
+            wait();
+          } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw SnowflakeErrors.ERROR_1003.getException(e);
+          }
+        }
+      }
+    }
+    // connect outside of the lock, other callers may still reuse idle sessions meanwhile
+    try {
+      Connection session = sessionFactory.get();
+      LOG_INFO_MSG("opened JDBC session {} of {} for stage operations", sessionNumber, poolSize);
+      return session;
+    } catch (RuntimeException e) {
+      synchronized (this) {
+        openSessions--;
+        notifyAll();
+      }
+      throw e;
+    }
+  }
+
+  /**
+   * Give back a session returned by {@link #borrow()}
+   *
+   * @param session borrowed session
+   */
+  void release(final Connection session) {
+    if (session == mainSession) {
+      return;
+    }
+    synchronized (this) {
+      if (!closed) {
+        idleSessions.addFirst(session);
+        notifyAll();
+        return;
+      }
+      openSessions--;
+    }
+    closeSession(session);
+  }
+
+  /** Close the idle sessions, borrowed ones are closed when given back */
+  void close() {
+    Deque<Connection> sessions;
+    synchronized (this) {
+      closed = true;
+      sessions = new ArrayDeque<>(idleSessions);
+      openSessions -= idleSessions.size();
+      idleSessions.clear();
+      notifyAll();
+    }
+    sessions.forEach(this::closeSession);
+  }
+
+  @VisibleForTesting
+  synchronized int getOpenSessions() {
+    return openSessions;
+  }
+
+  private static boolean isOpen(final Connection session) {
+    try {
+      return !session.isClosed();
+    } catch (SQLException e) {
+      return false;
+    }
+  }
+
+  private void closeSession(final Connection session) {
+    try {
+      session.close();
+    } catch (SQLException e) {
+      LOG_ERROR_MSG("Failed to close JDBC session: {}", e.getMessage());
+    }
+  }
+}
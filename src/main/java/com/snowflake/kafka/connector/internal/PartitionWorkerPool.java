@@ -0,0 +1,157 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.atomic.AtomicInteger;
+import org.apache.kafka.common.TopicPartition;
+import org.apache.kafka.connect.sink.SinkRecord;
+
+/**
+ * Task wide pool processing the records of different partitions concurrently.
+ *
+ * <p>Records of one partition are independent of the records of other partitions, so a batch from
+ * put() is split by partition and each partition is processed as one unit of work. The records of
+ * a partition are processed in order on a single thread. The task thread processes one of the
+ * units itself and waits for the others, so put() returns once the whole batch is processed.
+ *
+ * <p>With a single thread, everything runs on the task thread as before.
+ */
+public class PartitionWorkerPool extends EnableLogging {
+  // number of partitions processed at the same time, including the task thread
+  private final int threads;
+
+  // created on the first batch with more than one partition
+  private ExecutorService workerExecutor;
+
+  /** @param threads number of partitions processed at the same time, including the task thread */
+  public PartitionWorkerPool(final int threads) {
+    this.threads = Math.max(1, threads);
+  }
+
+  /**
+   * Split the records by partition, keeping their order within each partition
+   *
+   * @param records records from put()
+   * @return records of each partition, partitions in order of their first record
+   */
+  public static Map<TopicPartition, List<SinkRecord>> groupByPartition(
+      final Collection<SinkRecord> records) {
+    Map<TopicPartition, List<SinkRecord>> partitionRecords = new LinkedHashMap<>();
+    for (SinkRecord record : records) {
+      partitionRecords
+          .computeIfAbsent(
+              new TopicPartition(record.topic(), record.kafkaPartition()),
+              ignored -> new ArrayList<>())
+          .add(record);
+    }
+    return partitionRecords;
+  }
+
+  /**
+   * Run the units of work concurrently and wait for all of them. Each unit must only touch the
+   * state of its own partition.
+   *
+   * @param units one unit of work per partition
+   * @throws SnowflakeKafkaConnectorException the first failure, once all units are done
+   */
+  public void runAll(final Collection<Runnable> units) {
+    if (threads == 1 || units.size() <= 1) {
+      units.forEach(Runnable::run);
+      return;
+    }
+    Iterator<Runnable> iterator = units.iterator();
+    Runnable callerUnit = iterator.next();
+    List<Future<?>> futures = new ArrayList<>(units.size() - 1);
+    ExecutorService executor = getWorkerExecutor();
+    while (iterator.hasNext()) {
+      futures.add(executor.submit(iterator.next()));
+    }
+
+    Throwable failure = null;
+    try {
+      callerUnit.run();
+    } catch (RuntimeException | Error e) {
+      failure = e;
+    }
+    // wait for every unit even after a failure, no partition is touched once put() returns
+    boolean interrupted = false;
+    for (Future<?> future : futures) {
+      while (true) {
+        try {
+          future.get();
+          break;
+        } catch (InterruptedException e) {
+          interrupted = true;
+        } catch (ExecutionException e) {
+          if (failure == null) {
+            failure = e.getCause();
+          }
+          break;
+        }
+      }
+    }
+    if (interrupted) {
+      Thread.currentThread().interrupt();
+    }
+    if (failure instanceof RuntimeException) {
+      throw (RuntimeException) failure;
+    }
+    if (failure instanceof Error) {
+      throw (Error) failure;
+    }
+    if (failure != null) {
+      throw SnowflakeErrors.ERROR_5024.getException(failure.toString());
+    }
+  }
+
+  /**
+   * Run the units like {@link #runAll(Collection)}, but skip the units not started before the
+   * deadline. Units already running when the deadline passes are waited for.
+   *
+   * @param units one unit of work per partition or table
+   * @param deadlineMillis wall clock time after which no unit is started
+   * @return number of skipped units
+   */
+  public int runAllUntil(final Collection<Runnable> units, final long deadlineMillis) {
+    AtomicInteger skipped = new AtomicInteger();
+    List<Runnable> boundedUnits = new ArrayList<>(units.size());
+    for (Runnable unit : units) {
+      boundedUnits.add(
+          () -> {
+            if (System.currentTimeMillis() >= deadlineMillis) {
+              skipped.incrementAndGet();
+            } else {
+              unit.run();
+            }
+          });
+    }
+    runAll(boundedUnits);
+    return skipped.get();
+  }
+
+  /** Stop the worker threads, units still running are interrupted */
+  public synchronized void stop() {
+    if (workerExecutor != null) {
+      workerExecutor.shutdownNow();
+      workerExecutor = null;
+      LOG_INFO_MSG("partition worker executor terminated");
+    }
+  }
+
+  private synchronized ExecutorService getWorkerExecutor() {
+    if (workerExecutor == null) {
+      // the task thread is the last worker
+      workerExecutor = Executors.newFixedThreadPool(threads - 1);
+      LOG_INFO_MSG("partition worker executor started with {} threads", threads - 1);
+    }
+    return workerExecutor;
+  }
+}
@@ -0,0 +1,125 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Files of a pipe waiting for their ingestion status, indexed by name.
+ *
+ * <p>File names are parsed once when they are added, so the cleaner reconciles thousands of
+ * pending files with the ingest report and the load history in linear time, without matching a
+ * file name again. Files are kept in insertion order.
+ *
+ * <p>Not thread safe, the caller guards the index.
+ */
+class PendingFileIndex {
+  private final Map<String, PendingFile> files;
+
+  PendingFileIndex() {
+    this.files = new LinkedHashMap<>();
+  }
+
+  /**
+   * Add a file, a file already in the index is kept as is
+   *
+   * @param fileName file name
+   */
+  void add(final String fileName) {
+    if (!files.containsKey(fileName)) {
+      files.put(fileName, new PendingFile(fileName));
+    }
+  }
+
+  /** @param fileNames file names, duplicates are ignored */
+  void addAll(final Collection<String> fileNames) {
+    fileNames.forEach(this::add);
+  }
+
+  /** @param other index whose files are added without parsing them again */
+  void addAll(final PendingFileIndex other) {
+    other.files.forEach(files::putIfAbsent);
+  }
+
+  /**
+   * @param fileName file name
+   * @return the removed file, or null if it wasn't in the index
+   */
+  PendingFile remove(final String fileName) {
+    return files.remove(fileName);
+  }
+
+  /**
+   * Remove the files ingested before the given time
+   *
+   * @param time ingestion time, exclusive
+   * @return removed files
+   */
+  List<PendingFile> removeIngestedBefore(final long time) {
+    List<PendingFile> removed = new ArrayList<>();
+    Iterator<PendingFile> iterator = files.values().iterator();
+    while (iterator.hasNext()) {
+      PendingFile file = iterator.next();
+      if (file.timeIngested < time) {
+        removed.add(file);
+        iterator.remove();
+      }
+    }
+    return removed;
+  }
+
+  /**
+   * @param time ingestion time, exclusive
+   * @return true if a file was ingested before the given time
+   */
+  boolean hasIngestedBefore(final long time) {
+    for (PendingFile file : files.values()) {
+      if (file.timeIngested < time) {
+        return true;
+      }
+    }
+    return false;
+  }
+
+  /** @return a copy of the file names */
+  List<String> getFileNames() {
+    return new ArrayList<>(files.keySet());
+  }
+
+  int size() {
+    return files.size();
+  }
+
+  boolean isEmpty() {
+    return files.isEmpty();
+  }
+
+  /** A file name with the offsets and ingestion time it holds */
+  static class PendingFile {
+    private final String name;
+    private final long endOffset;
+    private final long timeIngested;
+
+    /** @param name file name, parsed right away */
+    PendingFile(final String name) {
+      this.name = name;
+      this.endOffset = FileNameUtils.fileNameToEndOffset(name);
+      this.timeIngested = FileNameUtils.fileNameToTimeIngested(name);
+    }
+
+    String getName() {
+      return name;
+    }
+
+    long getEndOffset() {
+      return endOffset;
+    }
+
+    long getTimeIngested() {
+      return timeIngested;
+    }
+  }
+}
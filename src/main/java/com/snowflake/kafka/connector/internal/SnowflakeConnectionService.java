@@ -2,8 +2,10 @@ package com.snowflake.kafka.connector.internal;
 
 import com.snowflake.kafka.connector.internal.telemetry.SnowflakeTelemetryService;
 import java.sql.Connection;
+import java.util.Collection;
 import java.util.List;
 import java.util.Map;
+import java.util.function.LongConsumer;
 
 public interface SnowflakeConnectionService {
   /**
@@ -101,6 +103,15 @@ public interface SnowflakeConnectionService {
    */
   boolean hasSchemaEvolutionPermission(String tableName, String role);
 
+  /**
+   * Columns of the table and whether they are nullable, from desc table. The result is cached for
+   * all partitions of the table and dropped after DDL on the table.
+   *
+   * @param tableName the name of the table
+   * @return map from the column names to their nullability, empty if the table doesn't exist
+   */
+  Map<String, Boolean> getColumnNullability(String tableName);
+
   /**
    * Alter table to add columns according to a map from columnNames to their types
    *
@@ -135,6 +146,26 @@ public interface SnowflakeConnectionService {
    */
   boolean isPipeCompatible(String tableName, String stageName, String pipeName);
 
+  /**
+   * check the definition of several snowpipes of a table with a single show pipes query
+   *
+   * @param tableName table name
+   * @param stageName stage name
+   * @param pipeNames pipe names
+   * @return for each of the pipes which exist, true if its definition is correct
+   */
+  Map<String, Boolean> arePipesCompatible(
+      String tableName, String stageName, Collection<String> pipeNames);
+
+  /**
+   * create several snowpipes of a table if they don't exist, in a single multi statement query
+   *
+   * @param tableName table name
+   * @param stageName stage name
+   * @param pipeNames pipe names
+   */
+  void createPipes(String tableName, String stageName, Collection<String> pipeNames);
+
   /**
    * check if a given database exists
    *
@@ -172,15 +203,28 @@ public interface SnowflakeConnectionService {
   void dropStage(String stageName);
 
   /**
-   * purge files from given stage
+   * purge files from given stage, files sharing a prefix are removed in batches by one statement
    *
    * @param stageName stage name
    * @param files list of file names
+   * @return number of statements executed
    */
-  void purgeStage(String stageName, List<String> files);
+  int purgeStage(String stageName, List<String> files);
 
   void moveToTableStage(String tableName, String stageName, List<String> files);
 
+  /**
+   * move files from given stage to the table stage, several files are moved at the same time and
+   * each file is removed from the stage once copied
+   *
+   * @param tableName table name
+   * @param stageName stage name
+   * @param files list of file names
+   * @param onFilesMoved called with the number of files copied to the table stage, as they are
+   */
+  void moveToTableStage(
+      String tableName, String stageName, List<String> files, LongConsumer onFilesMoved);
+
   /**
    * move all files on stage related to given pipe to table stage
    *
@@ -230,6 +274,15 @@ public interface SnowflakeConnectionService {
    */
   void putWithCache(final String stageName, final String fileName, final String content);
 
+  /**
+   * put a gzip compressed file to stage as is. Cache credential for AWS, Azure and GCS storage.
+   *
+   * @param fileName file name, see {@link #putWithCache(String, String, String)}
+   * @param content compressed file content
+   * @param stageName stage name
+   */
+  void putWithCache(final String stageName, final String fileName, final GzipFileBuffer content);
+
   /**
    * put a file to table stage
    *
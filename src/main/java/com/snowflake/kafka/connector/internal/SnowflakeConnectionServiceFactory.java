@@ -24,6 +24,11 @@ public class SnowflakeConnectionServiceFactory {
     // This property will be appeneded to user agent while calling snowpipe API in http request
     private String kafkaProvider = null;
 
+    private long tableMetadataCacheTtlMillis =
+        SnowflakeConnectionServiceV1.DEFAULT_TABLE_METADATA_CACHE_TTL_MILLIS;
+
+    private int jdbcSessionPoolSize = SnowflakeSinkConnectorConfig.JDBC_SESSION_POOL_SIZE_DEFAULT;
+
     // For testing only
     public SnowflakeConnectionServiceBuilder setProperties(Properties prop) {
       this.prop = prop;
@@ -35,6 +40,12 @@ public class SnowflakeConnectionServiceFactory {
       return this.prop;
     }
 
+    // For testing only, 0 disables the cache so that tables changed by the test are seen at once
+    public SnowflakeConnectionServiceBuilder setTableMetadataCacheTtlMillis(long ttlMillis) {
+      this.tableMetadataCacheTtlMillis = ttlMillis;
+      return this;
+    }
+
     public SnowflakeConnectionServiceBuilder setURL(SnowflakeURL url) {
       this.url = url;
       return this;
@@ -65,6 +76,11 @@ public class SnowflakeConnectionServiceFactory {
       // be decoupled
       this.proxyProperties = InternalUtils.generateProxyParametersIfRequired(conf);
       this.connectorName = conf.get(Utils.NAME);
+      this.jdbcSessionPoolSize =
+          Integer.parseInt(
+              conf.getOrDefault(
+                  SnowflakeSinkConnectorConfig.JDBC_SESSION_POOL_SIZE,
+                  SnowflakeSinkConnectorConfig.JDBC_SESSION_POOL_SIZE_DEFAULT + ""));
       return this;
     }
 
@@ -73,7 +89,14 @@ public class SnowflakeConnectionServiceFactory {
       InternalUtils.assertNotEmpty("url", url);
       InternalUtils.assertNotEmpty("connectorName", connectorName);
       return new SnowflakeConnectionServiceV1(
-          prop, url, connectorName, taskID, proxyProperties, kafkaProvider);
+          prop,
+          url,
+          connectorName,
+          taskID,
+          proxyProperties,
+          kafkaProvider,
+          tableMetadataCacheTtlMillis,
+          jdbcSessionPoolSize);
     }
   }
 }
@@ -8,6 +8,7 @@ import com.snowflake.kafka.connector.internal.streaming.SchematizationUtils;
 import com.snowflake.kafka.connector.internal.telemetry.SnowflakeTelemetryService;
 import com.snowflake.kafka.connector.internal.telemetry.SnowflakeTelemetryServiceFactory;
 import java.io.ByteArrayInputStream;
+import java.io.IOException;
 import java.io.InputStream;
 import java.nio.charset.StandardCharsets;
 import java.security.PrivateKey;
@@ -15,15 +16,31 @@ import java.sql.Connection;
 import java.sql.PreparedStatement;
 import java.sql.ResultSet;
 import java.sql.SQLException;
+import java.sql.Statement;
+import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.Collection;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
 import java.util.LinkedList;
 import java.util.List;
 import java.util.Map;
+import java.util.Optional;
 import java.util.Properties;
+import java.util.Queue;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.CompletionException;
+import java.util.concurrent.ConcurrentLinkedQueue;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
 import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicBoolean;
+import java.util.function.LongConsumer;
 import net.snowflake.client.jdbc.SnowflakeConnectionV1;
 import net.snowflake.client.jdbc.SnowflakeDriver;
+import net.snowflake.client.jdbc.SnowflakeStatement;
 import net.snowflake.client.jdbc.cloud.storage.StageInfo;
+import net.snowflake.ingest.SimpleIngestManager;
 
 /**
  * Implementation of Snowflake Connection Service interface which includes all handshake between KC
@@ -50,6 +67,33 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
 
   private static final long CREDENTIAL_EXPIRY_TIMEOUT_MILLIS = TimeUnit.MINUTES.toMillis(30);
 
+  // maximum number of files removed by one REMOVE statement when purging a stage
+  private static final int PURGE_BATCH_SIZE = 100;
+
+  // table metadata is queried again after this time, to see changes made outside of the connector
+  // session parameter giving the number of statements of a multi statement query
+  private static final String MULTI_STATEMENT_COUNT = "MULTI_STATEMENT_COUNT";
+
+  // error code of "Object does not exist or not authorized"
+  private static final int OBJECT_DOES_NOT_EXIST_ERROR_CODE = 2003;
+
+  static final long DEFAULT_TABLE_METADATA_CACHE_TTL_MILLIS = TimeUnit.MINUTES.toMillis(1);
+
+  // columns and schema evolution permission of the tables, shared by all partitions
+  private final TableMetadataCache tableMetadataCache;
+
+  // ingest managers of the pipes of the task, created on their first request
+  private final IngestManagerRegistry ingestManagers;
+
+  // sessions running the stage file operations, the main session runs the DDL and metadata queries
+  private final JdbcSessionPool stageSessions;
+
+  // number of files moved to a table stage at the same time, one per session of the pool
+  private final int tableStageMoveParallelism;
+
+  // runs the movers other than the calling thread, created on the first move of several files
+  private ExecutorService tableStageMoveExecutor;
+
   // User agent suffix we want to pass in to ingest service
   public static final String USER_AGENT_SUFFIX_FORMAT = "SFKafkaConnector/%s provider/%s";
 
@@ -59,7 +103,9 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
       String connectorName,
       String taskID,
       Properties proxyProperties,
-      String kafkaProvider) {
+      String kafkaProvider,
+      long tableMetadataCacheTtlMillis,
+      int jdbcSessionPoolSize) {
     this.connectorName = connectorName;
     this.taskID = taskID;
     this.url = url;
@@ -67,29 +113,44 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
     this.stageType = null;
     this.proxyProperties = proxyProperties;
     this.kafkaProvider = kafkaProvider;
+    this.tableMetadataCache = new TableMetadataCache(tableMetadataCacheTtlMillis);
+    this.ingestManagers =
+        new IngestManagerRegistry(
+            this::createIngestManager, IngestManagerRegistry.DEFAULT_IDLE_TIMEOUT_MILLIS);
+    this.conn = connect();
+    this.stageSessions = new JdbcSessionPool(this.conn, this::connect, jdbcSessionPoolSize);
+    this.tableStageMoveParallelism = Math.max(1, jdbcSessionPoolSize);
+    long credentialExpireTimeMillis = CREDENTIAL_EXPIRY_TIMEOUT_MILLIS;
+    this.internalStage =
+        new SnowflakeInternalStage(
+            (SnowflakeConnectionV1) this.conn, credentialExpireTimeMillis, proxyProperties);
+    this.telemetry =
+        SnowflakeTelemetryServiceFactory.builder(conn)
+            .setAppName(this.connectorName)
+            .setTaskID(this.taskID)
+            .build();
+    LOG_INFO_MSG("initialized the snowflake connection");
+  }
+
+  /**
+   * Open a JDBC session, the sessions of a task share the properties holding the parsed private key
+   *
+   * @return new session
+   */
+  private Connection connect() {
     try {
       if (proxyProperties != null && !proxyProperties.isEmpty()) {
         Properties combinedProperties =
             mergeProxyAndConnectionProperties(this.prop, this.proxyProperties);
         LOG_DEBUG_MSG("Proxy properties are set, passing in JDBC while creating the connection");
-        this.conn = new SnowflakeDriver().connect(url.getJdbcUrl(), combinedProperties);
+        return new SnowflakeDriver().connect(url.getJdbcUrl(), combinedProperties);
       } else {
         LOG_INFO_MSG("Establishing a JDBC connection with url:{}", url.getJdbcUrl());
-        this.conn = new SnowflakeDriver().connect(url.getJdbcUrl(), prop);
+        return new SnowflakeDriver().connect(url.getJdbcUrl(), prop);
       }
     } catch (SQLException e) {
       throw SnowflakeErrors.ERROR_1001.getException(e);
     }
-    long credentialExpireTimeMillis = CREDENTIAL_EXPIRY_TIMEOUT_MILLIS;
-    this.internalStage =
-        new SnowflakeInternalStage(
-            (SnowflakeConnectionV1) this.conn, credentialExpireTimeMillis, proxyProperties);
-    this.telemetry =
-        SnowflakeTelemetryServiceFactory.builder(conn)
-            .setAppName(this.connectorName)
-            .setTaskID(this.taskID)
-            .build();
-    LOG_INFO_MSG("initialized the snowflake connection");
   }
 
   /* Merges the two properties. */
@@ -124,6 +185,8 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
       stmt.close();
     } catch (SQLException e) {
       throw SnowflakeErrors.ERROR_2007.getException(e);
+    } finally {
+      tableMetadataCache.invalidate(tableName);
     }
 
     LOG_INFO_MSG("create table {}", tableName);
@@ -162,6 +225,8 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
       // Skip the error given that schema evolution is still under PrPr
       LOG_WARN_MSG(
           "Enable schema evolution failed on table: {}, message: {}", tableName, e.getMessage());
+    } finally {
+      tableMetadataCache.invalidate(tableName);
     }
 
     LOG_INFO_MSG("Created table {} with only RECORD_METADATA column", tableName);
@@ -232,27 +297,7 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
   public boolean tableExist(final String tableName) {
     checkConnection();
     InternalUtils.assertNotEmpty("tableName", tableName);
-    String query = "desc table identifier(?)";
-    PreparedStatement stmt = null;
-    boolean exist;
-    try {
-      stmt = conn.prepareStatement(query);
-      stmt.setString(1, tableName);
-      stmt.execute();
-      exist = true;
-    } catch (Exception e) {
-      LOG_DEBUG_MSG("table {} doesn't exist", tableName);
-      exist = false;
-    } finally {
-      if (stmt != null) {
-        try {
-          stmt.close();
-        } catch (SQLException e) {
-          e.printStackTrace();
-        }
-      }
-    }
-    return exist;
+    return describeTable(tableName).isPresent();
   }
 
   @Override
@@ -313,101 +358,127 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
   public boolean isTableCompatible(final String tableName) {
     checkConnection();
     InternalUtils.assertNotEmpty("tableName", tableName);
-    String query = "desc table identifier(?)";
-    PreparedStatement stmt = null;
-    ResultSet result = null;
-    boolean compatible;
-    try {
-      stmt = conn.prepareStatement(query);
-      stmt.setString(1, tableName);
-      result = stmt.executeQuery();
-      boolean hasMeta = false;
-      boolean hasContent = false;
-      boolean allNullable = true;
-      while (result.next()) {
-        switch (result.getString(1)) {
-          case TABLE_COLUMN_METADATA:
-            if (result.getString(2).equals("VARIANT")) {
-              hasMeta = true;
-            }
-            break;
-          case TABLE_COLUMN_CONTENT:
-            if (result.getString(2).equals("VARIANT")) {
-              hasContent = true;
-            }
-            break;
-          default:
-            if (result.getString(4).equals("N")) {
-              allNullable = false;
-            }
-        }
-      }
-      compatible = hasMeta && hasContent && allNullable;
-    } catch (SQLException e) {
+    Optional<List<TableMetadataCache.TableColumn>> columns = describeTable(tableName);
+    if (!columns.isPresent()) {
       LOG_DEBUG_MSG("table {} doesn't exist", tableName);
-      compatible = false;
-    } finally {
-      try {
-        if (result != null) {
-          result.close();
-        }
-      } catch (Exception e) {
-        e.printStackTrace();
-      }
-
-      try {
-        if (stmt != null) {
-          stmt.close();
-        }
-      } catch (Exception e) {
-        e.printStackTrace();
+      return false;
+    }
+    boolean hasMeta = false;
+    boolean hasContent = false;
+    boolean allNullable = true;
+    for (TableMetadataCache.TableColumn column : columns.get()) {
+      switch (column.getName()) {
+        case TABLE_COLUMN_METADATA:
+          if (column.getType().equals("VARIANT")) {
+            hasMeta = true;
+          }
+          break;
+        case TABLE_COLUMN_CONTENT:
+          if (column.getType().equals("VARIANT")) {
+            hasContent = true;
+          }
+          break;
+        default:
+          if (!column.isNullable()) {
+            allNullable = false;
+          }
       }
     }
-    return compatible;
+    return hasMeta && hasContent && allNullable;
   }
 
   @Override
   public void appendMetaColIfNotExist(final String tableName) {
     checkConnection();
     InternalUtils.assertNotEmpty("tableName", tableName);
-    String query = "desc table identifier(?)";
-    PreparedStatement stmt = null;
-    ResultSet result = null;
+    Optional<List<TableMetadataCache.TableColumn>> columns = describeTable(tableName);
+    if (!columns.isPresent()) {
+      throw SnowflakeErrors.ERROR_2014.getException("table name: " + tableName);
+    }
     boolean hasMeta = false;
     boolean isVariant = false;
-    try {
-      stmt = conn.prepareStatement(query);
-      stmt.setString(1, tableName);
-      result = stmt.executeQuery();
-      while (result.next()) {
-        // The result schema is row idx | column name | data type | kind | null? | ...
-        if (result.getString(1).equals(TABLE_COLUMN_METADATA)) {
-          hasMeta = true;
-          if (result.getString(2).equals("VARIANT")) {
-            isVariant = true;
-          }
-          break;
+    for (TableMetadataCache.TableColumn column : columns.get()) {
+      if (column.getName().equals(TABLE_COLUMN_METADATA)) {
+        hasMeta = true;
+        if (column.getType().equals("VARIANT")) {
+          isVariant = true;
         }
+        break;
       }
-    } catch (SQLException e) {
-      throw SnowflakeErrors.ERROR_2014.getException("table name: " + tableName);
     }
     try {
       if (!hasMeta) {
         String metaQuery = "alter table identifier(?) add RECORD_METADATA VARIANT";
-        stmt = conn.prepareStatement(metaQuery);
+        PreparedStatement stmt = conn.prepareStatement(metaQuery);
         stmt.setString(1, tableName);
         stmt.executeQuery();
+        tableMetadataCache.invalidate(tableName);
       } else {
         if (!isVariant) {
           throw SnowflakeErrors.ERROR_2012.getException("table name: " + tableName);
         }
       }
     } catch (SQLException e) {
+      tableMetadataCache.invalidate(tableName);
       throw SnowflakeErrors.ERROR_2013.getException("table name: " + tableName);
     }
   }
 
+  /**
+   * Columns of the table from desc table, cached for all partitions of the table
+   *
+   * @param tableName the name of the table
+   * @return the columns, empty if the table doesn't exist
+   */
+  private Optional<List<TableMetadataCache.TableColumn>> describeTable(final String tableName) {
+    try {
+      return tableMetadataCache.getColumns(tableName, () -> queryTableColumns(tableName));
+    } catch (DescribeTableException e) {
+      // not cached, the next lookup runs desc table again
+      LOG_WARN_MSG("desc table {} failed: {}", tableName, e.getCause().getMessage());
+      return Optional.empty();
+    }
+  }
+
+  /**
+   * Run desc table
+   *
+   * @param tableName the name of the table
+   * @return the columns, empty if the table doesn't exist
+   * @throws DescribeTableException if the query failed for any other reason
+   */
+  private Optional<List<TableMetadataCache.TableColumn>> queryTableColumns(final String tableName) {
+    String query = "desc table identifier(?)";
+    try (PreparedStatement stmt = conn.prepareStatement(query)) {
+      stmt.setString(1, tableName);
+      List<TableMetadataCache.TableColumn> columns = new ArrayList<>();
+      try (ResultSet result = stmt.executeQuery()) {
+        while (result.next()) {
+          // The result schema is column name | data type | kind | null? | ...
+          columns.add(
+              new TableMetadataCache.TableColumn(
+                  result.getString(1),
+                  result.getString(2),
+                  !"N".equals(result.getString(4))));
+        }
+      }
+      return Optional.of(columns);
+    } catch (SQLException e) {
+      if (e.getErrorCode() != OBJECT_DOES_NOT_EXIST_ERROR_CODE) {
+        throw new DescribeTableException(e);
+      }
+      LOG_DEBUG_MSG("table {} doesn't exist", tableName);
+      return Optional.empty();
+    }
+  }
+
+  /** A desc table which failed for another reason than a missing table, it is not cached */
+  private static class DescribeTableException extends RuntimeException {
+    private DescribeTableException(final SQLException cause) {
+      super(cause);
+    }
+  }
+
   /**
    * Check whether the user has the role privilege to do schema evolution and whether the schema
    * evolution option is enabled on the table
@@ -420,6 +491,11 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
   public boolean hasSchemaEvolutionPermission(String tableName, String role) {
     checkConnection();
     InternalUtils.assertNotEmpty("tableName", tableName);
+    return tableMetadataCache.hasSchemaEvolutionPermission(
+        tableName, role, () -> querySchemaEvolutionPermission(tableName, role));
+  }
+
+  private boolean querySchemaEvolutionPermission(String tableName, String role) {
     String query = "show grants on table identifier(?)";
     List<String> schemaEvolutionAllowedPrivilegeList =
         Arrays.asList("EVOLVE SCHEMA", "ALL", "OWNERSHIP");
@@ -474,6 +550,19 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
     return hasPermission;
   }
 
+  @Override
+  public Map<String, Boolean> getColumnNullability(final String tableName) {
+    checkConnection();
+    InternalUtils.assertNotEmpty("tableName", tableName);
+    Map<String, Boolean> columnNullability = new HashMap<>();
+    describeTable(tableName)
+        .ifPresent(
+            columns ->
+                columns.forEach(
+                    column -> columnNullability.put(column.getName(), column.isNullable())));
+    return columnNullability;
+  }
+
   /**
    * Alter table to add columns according to a map from columnNames to their types
    *
@@ -509,6 +598,8 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
       stmt.close();
     } catch (SQLException e) {
       throw SnowflakeErrors.ERROR_2015.getException(e);
+    } finally {
+      tableMetadataCache.invalidate(tableName);
     }
 
     logColumn.insert(0, "Following columns created for table {}:\n").append("]");
@@ -552,6 +643,8 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
       stmt.close();
     } catch (SQLException e) {
       throw SnowflakeErrors.ERROR_2016.getException(e);
+    } finally {
+      tableMetadataCache.invalidate(tableName);
     }
 
     logColumn
@@ -624,6 +717,83 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
     return compatible;
   }
 
+  @Override
+  public Map<String, Boolean> arePipesCompatible(
+      final String tableName, final String stageName, final Collection<String> pipeNames) {
+    checkConnection();
+    InternalUtils.assertNotEmpty("tableName", tableName);
+    InternalUtils.assertNotEmpty("stageName", stageName);
+    if (pipeNames.isEmpty()) {
+      return new HashMap<>();
+    }
+    // all pipes of a table share the name of their first pipe up to the partition number
+    String prefix = pipeNames.iterator().next();
+    for (String pipeName : pipeNames) {
+      int length = 0;
+      while (length < Math.min(prefix.length(), pipeName.length())
+          && Character.toUpperCase(prefix.charAt(length))
+              == Character.toUpperCase(pipeName.charAt(length))) {
+        length++;
+      }
+      prefix = prefix.substring(0, length);
+    }
+    // unquoted pipe names are stored in upper case, the LIKE pattern is case insensitive
+    Map<String, String> definitions = new HashMap<>();
+    String query = "show pipes like '" + prefix.replace("'", "''") + "%'";
+    try (PreparedStatement stmt = conn.prepareStatement(query);
+        ResultSet result = stmt.executeQuery()) {
+      while (result.next()) {
+        definitions.put(
+            result.getString("name").toUpperCase(), result.getString("definition"));
+      }
+    } catch (SQLException e) {
+      throw SnowflakeErrors.ERROR_2001.getException(e);
+    }
+
+    String expectedDefinition = pipeDefinition(tableName, stageName);
+    Map<String, Boolean> compatible = new HashMap<>();
+    for (String pipeName : pipeNames) {
+      String definition = definitions.get(pipeName.toUpperCase());
+      if (definition != null) {
+        LOG_DEBUG_MSG("pipe {} definition: {}", pipeName, definition);
+        compatible.put(pipeName, definition.equalsIgnoreCase(expectedDefinition));
+      }
+    }
+    LOG_INFO_MSG(
+        "show pipes like {} found {} of {} pipes", prefix, compatible.size(), pipeNames.size());
+    return compatible;
+  }
+
+  @Override
+  public void createPipes(
+      final String tableName, final String stageName, final Collection<String> pipeNames) {
+    checkConnection();
+    InternalUtils.assertNotEmpty("tableName", tableName);
+    InternalUtils.assertNotEmpty("stageName", stageName);
+    if (pipeNames.isEmpty()) {
+      return;
+    }
+    String definition = pipeDefinition(tableName, stageName);
+    StringBuilder query = new StringBuilder();
+    for (String pipeName : pipeNames) {
+      InternalUtils.assertNotEmpty("pipeName", pipeName);
+      query.append("create pipe if not exists ").append(pipeName);
+      query.append(" as ").append(definition).append(";\n");
+    }
+    try (Statement stmt = conn.createStatement()) {
+      stmt.unwrap(SnowflakeStatement.class)
+          .setParameter(MULTI_STATEMENT_COUNT, pipeNames.size());
+      stmt.execute(query.toString());
+      // the failure of a statement is only thrown when its result is reached
+      while (stmt.getMoreResults() || stmt.getUpdateCount() != -1) {
+        // next statement
+      }
+    } catch (SQLException e) {
+      throw SnowflakeErrors.ERROR_2009.getException(e);
+    }
+    LOG_INFO_MSG("create {} pipes of table {}", pipeNames.size(), tableName);
+  }
+
   @Override
   public void databaseExists(String databaseName) {
     checkConnection();
@@ -718,44 +888,192 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
   }
 
   @Override
-  public void purgeStage(final String stageName, final List<String> files) {
+  public int purgeStage(final String stageName, final List<String> files) {
     InternalUtils.assertNotEmpty("stageName", stageName);
+    Connection session = stageSessions.borrow();
+    try {
+      return purgeStage(session, stageName, files);
+    } finally {
+      stageSessions.release(session);
+    }
+  }
+
+  private int purgeStage(
+      final Connection session, final String stageName, final List<String> files) {
+    Map<String, List<String>> filesByPrefix = new LinkedHashMap<>();
+    int statementCount = 0;
     for (String fileName : files) {
-      removeFile(stageName, fileName);
+      String prefix = FileNameUtils.getPrefixFromFileName(fileName);
+      if (prefix == null) {
+        removeFile(session, stageName, fileName);
+        statementCount++;
+      } else {
+        filesByPrefix
+            .computeIfAbsent(prefix, k -> new ArrayList<>())
+            .add(fileName.substring(prefix.length() + 1));
+      }
     }
-    LOG_INFO_MSG("purge {} files from stage: {}", files.size(), stageName);
+
+    for (Map.Entry<String, List<String>> entry : filesByPrefix.entrySet()) {
+      List<String> names = entry.getValue();
+      for (int start = 0; start < names.size(); start += PURGE_BATCH_SIZE) {
+        List<String> batch = names.subList(start, Math.min(start + PURGE_BATCH_SIZE, names.size()));
+        String pattern = FileNameUtils.removePattern(batch);
+        if (pattern == null) {
+          for (String name : batch) {
+            removeFile(session, stageName, entry.getKey() + "/" + name);
+            statementCount++;
+          }
+        } else {
+          removeFiles(session, stageName, entry.getKey(), pattern, batch.size());
+          statementCount++;
+        }
+      }
+    }
+    LOG_INFO_MSG(
+        "purge {} files from stage: {} with {} statements",
+        files.size(),
+        stageName,
+        statementCount);
+    return statementCount;
   }
 
   @Override
   public void moveToTableStage(
       final String tableName, final String stageName, final List<String> files) {
+    moveToTableStage(tableName, stageName, files, movedFiles -> {});
+  }
+
+  @Override
+  public void moveToTableStage(
+      final String tableName,
+      final String stageName,
+      final List<String> files,
+      final LongConsumer onFilesMoved) {
     InternalUtils.assertNotEmpty("tableName", tableName);
     InternalUtils.assertNotEmpty("stageName", stageName);
-    SnowflakeConnectionV1 sfconn = (SnowflakeConnectionV1) conn;
+    if (files.isEmpty()) {
+      return;
+    }
+    long startTime = System.currentTimeMillis();
+    Queue<String> remainingFiles = new ConcurrentLinkedQueue<>(files);
+    AtomicBoolean failed = new AtomicBoolean(false);
+    Runnable mover =
+        () -> moveFilesToTableStage(tableName, stageName, remainingFiles, failed, onFilesMoved);
+
+    // the calling thread is one of the movers, the others run on the move executor
+    int moverCount = Math.min(tableStageMoveParallelism, files.size());
+    List<CompletableFuture<Void>> otherMovers = new ArrayList<>();
+    for (int i = 1; i < moverCount; i++) {
+      otherMovers.add(CompletableFuture.runAsync(mover, getTableStageMoveExecutor()));
+    }
+    RuntimeException failure = null;
+    try {
+      mover.run();
+    } catch (RuntimeException e) {
+      failure = e;
+    }
+    for (CompletableFuture<Void> otherMover : otherMovers) {
+      try {
+        otherMover.join();
+      } catch (CompletionException e) {
+        if (failure == null) {
+          failure =
+              e.getCause() instanceof RuntimeException ? (RuntimeException) e.getCause() : e;
+        }
+      }
+    }
+    if (failure != null) {
+      throw failure;
+    }
+    LOG_INFO_MSG(
+        "moved {} files from stage: {} to table stage: {} with {} movers in {} ms",
+        files.size(),
+        stageName,
+        tableName,
+        moverCount,
+        System.currentTimeMillis() - startTime);
+  }
 
-    for (String name : files) {
-      // get
-      InputStream file;
+  /**
+   * Copy files to the table stage on one session until none is left, the copied files are removed
+   * from the stage in batches. Stops at the first failure of any mover, files already copied are
+   * still removed.
+   */
+  private void moveFilesToTableStage(
+      final String tableName,
+      final String stageName,
+      final Queue<String> remainingFiles,
+      final AtomicBoolean failed,
+      final LongConsumer onFilesMoved) {
+    Connection session = stageSessions.borrow();
+    List<String> copiedFiles = new ArrayList<>();
+    try {
+      String name;
+      while (!failed.get() && (name = remainingFiles.poll()) != null) {
+        copyToTableStage(session, tableName, stageName, name);
+        onFilesMoved.accept(1);
+        copiedFiles.add(name);
+        if (copiedFiles.size() >= PURGE_BATCH_SIZE) {
+          purgeStage(session, stageName, copiedFiles);
+          copiedFiles.clear();
+        }
+      }
+    } catch (RuntimeException e) {
+      failed.set(true);
+      throw e;
+    } finally {
       try {
-        file = sfconn.downloadStream(stageName, name, true);
-      } catch (Exception e) {
-        throw SnowflakeErrors.ERROR_2002.getException(e);
+        if (!copiedFiles.isEmpty()) {
+          purgeStage(session, stageName, copiedFiles);
+        }
+      } finally {
+        stageSessions.release(session);
       }
-      // put
+    }
+  }
+
+  /**
+   * Copy one file to the table stage. The file is streamed as stored, still compressed, so it is
+   * neither decompressed nor compressed again.
+   */
+  private void copyToTableStage(
+      final Connection session, final String tableName, final String stageName, final String name) {
+    SnowflakeConnectionV1 sfconn = (SnowflakeConnectionV1) session;
+    // get
+    InputStream file;
+    try {
+      file = sfconn.downloadStream(stageName, name, false);
+    } catch (Exception e) {
+      throw SnowflakeErrors.ERROR_2002.getException(e);
+    }
+    // put
+    try {
+      sfconn.uploadStream(
+          "%" + tableName,
+          FileNameUtils.getPrefixFromFileName(name),
+          file,
+          name.substring(name.lastIndexOf('/') + 1),
+          false);
+    } catch (SQLException e) {
+      throw SnowflakeErrors.ERROR_2003.getException(e);
+    } finally {
       try {
-        sfconn.uploadStream(
-            "%" + tableName,
-            FileNameUtils.getPrefixFromFileName(name),
-            file,
-            FileNameUtils.removePrefixAndGZFromFileName(name),
-            true);
-      } catch (SQLException e) {
-        throw SnowflakeErrors.ERROR_2003.getException(e);
+        file.close();
+      } catch (IOException e) {
+        LOG_DEBUG_MSG("failed to close the download stream of {}: {}", name, e.getMessage());
       }
-      LOG_INFO_MSG("moved file: {} from stage: {} to table stage: {}", name, stageName, tableName);
-      // remove
-      removeFile(stageName, name);
     }
+    LOG_DEBUG_MSG("copied file: {} from stage: {} to table stage: {}", name, stageName, tableName);
+  }
+
+  private synchronized ExecutorService getTableStageMoveExecutor() {
+    if (tableStageMoveExecutor == null) {
+      tableStageMoveExecutor = Executors.newFixedThreadPool(tableStageMoveParallelism - 1);
+      LOG_INFO_MSG(
+          "table stage move executor started with {} threads", tableStageMoveParallelism - 1);
+    }
+    return tableStageMoveExecutor;
   }
 
   @Override
@@ -781,8 +1099,9 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
       query = "ls @" + stageName + "/" + prefix;
     }
     List<String> result;
+    Connection session = stageSessions.borrow();
     try {
-      PreparedStatement stmt = conn.prepareStatement(query);
+      PreparedStatement stmt = session.prepareStatement(query);
       ResultSet resultSet = stmt.executeQuery();
 
       result = new LinkedList<>();
@@ -793,6 +1112,8 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
       resultSet.close();
     } catch (SQLException e) {
       throw SnowflakeErrors.ERROR_2001.getException(e);
+    } finally {
+      stageSessions.release(session);
     }
     LOG_INFO_MSG("list stage {} retrieved {} file names", stageName, result.size());
     return result;
@@ -831,6 +1152,23 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
 
   @Override
   public void putWithCache(final String stageName, final String fileName, final String content) {
+    putWithCacheAndRetry(
+        stageName,
+        fileName,
+        () -> internalStage.putWithCache(stageName, fileName, content, stageType));
+  }
+
+  @Override
+  public void putWithCache(
+      final String stageName, final String fileName, final GzipFileBuffer content) {
+    putWithCacheAndRetry(
+        stageName,
+        fileName,
+        () -> internalStage.putWithCache(stageName, fileName, content, stageType));
+  }
+
+  private void putWithCacheAndRetry(
+      final String stageName, final String fileName, final Runnable put) {
     // If we don't know the stage type yet, query that first.
     if (stageType == null) {
       stageType = internalStage.getStageType(stageName);
@@ -840,7 +1178,7 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
           telemetry,
           SnowflakeInternalOperations.UPLOAD_FILE_TO_INTERNAL_STAGE_NO_CONNECTION,
           () -> {
-            internalStage.putWithCache(stageName, fileName, content, stageType);
+            put.run();
             return true;
           });
     } catch (Exception e) {
@@ -857,7 +1195,8 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
   @Override
   public void putToTableStage(final String tableName, final String fileName, final byte[] content) {
     InternalUtils.assertNotEmpty("tableName", tableName);
-    SnowflakeConnectionV1 sfconn = (SnowflakeConnectionV1) conn;
+    Connection session = stageSessions.borrow();
+    SnowflakeConnectionV1 sfconn = (SnowflakeConnectionV1) session;
     InputStream input = new ByteArrayInputStream(content);
 
     try {
@@ -875,6 +1214,8 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
           });
     } catch (Exception e) {
       throw SnowflakeErrors.ERROR_2003.getException(e);
+    } finally {
+      stageSessions.release(session);
     }
     LOG_INFO_MSG("put file: {} to table stage: {}", fileName, tableName);
   }
@@ -886,6 +1227,14 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
 
   @Override
   public void close() {
+    ingestManagers.close();
+    synchronized (this) {
+      if (tableStageMoveExecutor != null) {
+        tableStageMoveExecutor.shutdownNow();
+        tableStageMoveExecutor = null;
+      }
+    }
+    stageSessions.close();
     try {
       conn.close();
     } catch (SQLException e) {
@@ -912,34 +1261,48 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
   @Override
   public SnowflakeIngestionService buildIngestService(
       final String stageName, final String pipeName) {
-    String account = url.getAccount();
-    String user = prop.getProperty(InternalUtils.JDBC_USER);
-    String userAgentSuffixInHttpRequest =
-        String.format(USER_AGENT_SUFFIX_FORMAT, Utils.VERSION, kafkaProvider);
-    String host = url.getUrlWithoutPort();
-    int port = url.getPort();
-    String connectionScheme = url.getScheme();
     String fullPipeName =
         prop.getProperty(InternalUtils.JDBC_DATABASE)
             + "."
             + prop.getProperty(InternalUtils.JDBC_SCHEMA)
             + "."
             + pipeName;
-    PrivateKey privateKey = (PrivateKey) prop.get(InternalUtils.JDBC_PRIVATE_KEY);
-    return SnowflakeIngestionServiceFactory.builder(
-            account,
-            user,
-            host,
-            port,
-            connectionScheme,
-            stageName,
-            fullPipeName,
-            privateKey,
-            userAgentSuffixInHttpRequest)
+    return SnowflakeIngestionServiceFactory.builder(stageName, fullPipeName, ingestManagers)
         .setTelemetry(this.telemetry)
         .build();
   }
 
+  /**
+   * Create the Snowpipe ingest manager of a pipe, called by the registry on the first request of
+   * the pipe
+   *
+   * @param fullPipeName fully qualified pipe name
+   * @return ingest manager of the pipe
+   */
+  private SimpleIngestManager createIngestManager(final String fullPipeName) {
+    String account = url.getAccount();
+    String user = prop.getProperty(InternalUtils.JDBC_USER);
+    String userAgentSuffixInHttpRequest =
+        String.format(USER_AGENT_SUFFIX_FORMAT, Utils.VERSION, kafkaProvider);
+    String host = url.getUrlWithoutPort();
+    int port = url.getPort();
+    String connectionScheme = url.getScheme();
+    PrivateKey privateKey = (PrivateKey) prop.get(InternalUtils.JDBC_PRIVATE_KEY);
+    try {
+      return new SimpleIngestManager(
+          account,
+          user,
+          fullPipeName,
+          privateKey,
+          connectionScheme,
+          host,
+          port,
+          userAgentSuffixInHttpRequest);
+    } catch (Exception e) {
+      throw SnowflakeErrors.ERROR_0002.getException(e);
+    }
+  }
+
   /** make sure connection is not closed */
   private void checkConnection() {
     try {
@@ -970,10 +1333,11 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
   /**
    * Remove one file from given stage
    *
+   * @param session session running the statement
    * @param stageName stage name
    * @param fileName file name
    */
-  private void removeFile(String stageName, String fileName) {
+  private void removeFile(Connection session, String stageName, String fileName) {
     InternalUtils.assertNotEmpty("stageName", stageName);
     String query = "rm @" + stageName + "/" + fileName;
 
@@ -982,7 +1346,7 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
           telemetry,
           SnowflakeInternalOperations.REMOVE_FILE_FROM_INTERNAL_STAGE,
           () -> {
-            PreparedStatement stmt = conn.prepareStatement(query);
+            PreparedStatement stmt = session.prepareStatement(query);
             stmt.execute();
             stmt.close();
             return true;
@@ -993,6 +1357,41 @@ public class SnowflakeConnectionServiceV1 extends EnableLogging
     LOG_DEBUG_MSG("deleted {} from stage {}", fileName, stageName);
   }
 
+  /**
+   * Remove a batch of files sharing the same prefix from given stage with one statement
+   *
+   * @param session session running the statement
+   * @param stageName stage name
+   * @param prefix common prefix of the files
+   * @param pattern pattern matching exactly the files to remove
+   * @param fileCount number of files matched by the pattern
+   */
+  private void removeFiles(
+      Connection session, String stageName, String prefix, String pattern, int fileCount) {
+    String query = "remove @" + stageName + "/" + prefix + "/ pattern = '" + pattern + "'";
+    long startTime = System.currentTimeMillis();
+
+    try {
+      InternalUtils.backoffAndRetry(
+          telemetry,
+          SnowflakeInternalOperations.REMOVE_FILE_FROM_INTERNAL_STAGE,
+          () -> {
+            PreparedStatement stmt = session.prepareStatement(query);
+            stmt.execute();
+            stmt.close();
+            return true;
+          });
+    } catch (Exception e) {
+      throw SnowflakeErrors.ERROR_2001.getException(e);
+    }
+    LOG_DEBUG_MSG(
+        "deleted {} files under {} from stage {} in {} ms",
+        fileCount,
+        prefix,
+        stageName,
+        System.currentTimeMillis() - startTime);
+  }
+
   @Override
   public Connection getConnection() {
     return this.conn;
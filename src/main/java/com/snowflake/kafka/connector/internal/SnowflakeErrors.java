@@ -192,6 +192,7 @@ public enum SnowflakeErrors {
   ERROR_3006("3006", "Failed to configure client status", "Exception reported by Ingest SDK"),
   ERROR_3007("3007", "Failed to get client status", "Exception reported by Ingest SDK"),
   ERROR_3008("3008", "Failed to ingest file with client info", "Exception reported by Ingest SDK"),
+  ERROR_3009("3009", "Ingest service is closed", "The pipe of a closed partition is not used"),
   // Wrong result issues 4---
   ERROR_4001("4001", "Unexpected Result", "Get wrong results from Snowflake service"),
   // Connector internal errors 5---
@@ -266,7 +267,12 @@ public enum SnowflakeErrors {
       "5021",
       "Failed to get data schema",
       "Failed to get data schema. Unrecognizable data type in JSON object"),
-  ERROR_5022("5022", "Invalid column name", "Failed to find column in the schema");
+  ERROR_5022("5022", "Invalid column name", "Failed to find column in the schema"),
+  ERROR_5023("5023", "Failed to compress buffer", "Error in compressing records into a file"),
+  ERROR_5024(
+      "5024",
+      "Failed to process partition records",
+      "Error in processing the records of a partition on a partition worker");
 
   // properties
 
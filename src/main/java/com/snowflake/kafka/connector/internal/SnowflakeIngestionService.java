@@ -71,6 +71,9 @@ public interface SnowflakeIngestionService {
    */
   void ingestFilesWithClientInfo(List<String> fileNames, long clientSequencer);
 
-  /** close ingest service */
+  /** @return true if the ingest service is closed */
+  boolean isClosed();
+
+  /** close ingest service, later Snowpipe requests fail */
   void close();
 }
@@ -1,31 +1,13 @@
 package com.snowflake.kafka.connector.internal;
 
 import com.snowflake.kafka.connector.internal.telemetry.SnowflakeTelemetryService;
-import java.security.PrivateKey;
 
 /** A factory to create {@link SnowflakeIngestionService} */
 public class SnowflakeIngestionServiceFactory {
 
-  public static SnowflakeIngestionServiceBuilder builder(
-      String accountName,
-      String userName,
-      String host,
-      int port,
-      String connectionScheme,
-      String stageName,
-      String pipeName,
-      PrivateKey privateKey,
-      String userAgentSuffix) {
-    return new SnowflakeIngestionServiceBuilder(
-        accountName,
-        userName,
-        host,
-        port,
-        connectionScheme,
-        stageName,
-        pipeName,
-        privateKey,
-        userAgentSuffix);
+  static SnowflakeIngestionServiceBuilder builder(
+      String stageName, String pipeName, IngestManagerRegistry ingestManagers) {
+    return new SnowflakeIngestionServiceBuilder(stageName, pipeName, ingestManagers);
   }
 
   /** Builder class to create instance of {@link SnowflakeIngestionService} */
@@ -33,26 +15,8 @@ public class SnowflakeIngestionServiceFactory {
     private final SnowflakeIngestionService service;
 
     private SnowflakeIngestionServiceBuilder(
-        String accountName,
-        String userName,
-        String host,
-        int port,
-        String connectionScheme,
-        String stageName,
-        String pipeName,
-        PrivateKey privateKey,
-        String userAgentSuffix) {
-      this.service =
-          new SnowflakeIngestionServiceV1(
-              accountName,
-              userName,
-              host,
-              port,
-              connectionScheme,
-              stageName,
-              pipeName,
-              privateKey,
-              userAgentSuffix);
+        String stageName, String pipeName, IngestManagerRegistry ingestManagers) {
+      this.service = new SnowflakeIngestionServiceV1(stageName, pipeName, ingestManagers);
     }
 
     SnowflakeIngestionServiceBuilder setTelemetry(SnowflakeTelemetryService telemetry) {
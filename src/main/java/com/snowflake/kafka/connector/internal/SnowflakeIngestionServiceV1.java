@@ -4,7 +4,6 @@ import static com.snowflake.kafka.connector.internal.InternalUtils.convertIngest
 import static com.snowflake.kafka.connector.internal.InternalUtils.timestampToDate;
 
 import com.snowflake.kafka.connector.internal.telemetry.SnowflakeTelemetryService;
-import java.security.PrivateKey;
 import java.util.*;
 import net.snowflake.ingest.SimpleIngestManager;
 import net.snowflake.ingest.connection.ClientStatusResponse;
@@ -31,36 +30,26 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
   private static final long ONE_HOUR = 60 * 60 * 1000;
 
   private final String stageName;
-  private final SimpleIngestManager ingestManager;
+  private final String pipeName;
+  private final IngestManagerRegistry ingestManagers;
+  // acquired from the registry on the first request, null until then and after close
+  private SimpleIngestManager ingestManager;
+  // a closed service doesn't acquire the ingest manager again
+  private boolean closed = false;
   private SnowflakeTelemetryService telemetry = null;
 
   private String beginMark = null;
 
+  /**
+   * @param stageName stage name
+   * @param pipeName fully qualified pipe name
+   * @param ingestManagers task wide registry providing the ingest manager of the pipe
+   */
   SnowflakeIngestionServiceV1(
-      String accountName,
-      String userName,
-      String host,
-      int port,
-      String connectionScheme,
-      String stageName,
-      String pipeName,
-      PrivateKey privateKey,
-      String userAgentSuffix) {
+      String stageName, String pipeName, IngestManagerRegistry ingestManagers) {
     this.stageName = stageName;
-    try {
-      this.ingestManager =
-          new SimpleIngestManager(
-              accountName,
-              userName,
-              pipeName,
-              privateKey,
-              connectionScheme,
-              host,
-              port,
-              userAgentSuffix);
-    } catch (Exception e) {
-      throw SnowflakeErrors.ERROR_0002.getException(e);
-    }
+    this.pipeName = pipeName;
+    this.ingestManagers = ingestManagers;
     LOG_INFO_MSG("initialized the pipe connector for pipe {}", pipeName);
   }
 
@@ -75,7 +64,7 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
       InternalUtils.backoffAndRetry(
           telemetry,
           SnowflakeInternalOperations.INSERT_FILES_SNOWPIPE_API,
-          () -> ingestManager.ingestFile(new StagedFileWrapper(fileName), null));
+          () -> getIngestManager().ingestFile(new StagedFileWrapper(fileName), null));
     } catch (Exception e) {
       throw SnowflakeErrors.ERROR_3001.getException(e);
     }
@@ -99,7 +88,8 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
               int toIndex = Math.min(4000, fileNames.size());
               List<String> fileNamesBatch = fileNames.subList(0, toIndex);
               Set<String> fileNamesSet = new HashSet<>(fileNamesBatch);
-              ingestManager.ingestFiles(SimpleIngestManager.wrapFilepaths(fileNamesSet), null);
+              getIngestManager()
+                  .ingestFiles(SimpleIngestManager.wrapFilepaths(fileNamesSet), null);
               fileNamesBatch.clear();
             }
             return true;
@@ -129,7 +119,7 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
               InternalUtils.backoffAndRetry(
                   telemetry,
                   SnowflakeInternalOperations.INSERT_REPORT_SNOWPIPE_API,
-                  () -> ingestManager.getHistory(null, null, beginMark));
+                  () -> getIngestManager().getHistory(null, null, beginMark));
     } catch (Exception e) {
       throw SnowflakeErrors.ERROR_3002.getException(e);
     }
@@ -206,8 +196,9 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
                     telemetry,
                     SnowflakeInternalOperations.LOAD_HISTORY_SCAN_SNOWPIPE_API,
                     () ->
-                        ingestManager.getHistoryRange(
-                            null, (String) startTimeInclusiveFinal, endTimeExclusive));
+                        getIngestManager()
+                            .getHistoryRange(
+                                null, (String) startTimeInclusiveFinal, endTimeExclusive));
       } catch (Exception e) {
         throw SnowflakeErrors.ERROR_1002.getException(e);
       }
@@ -230,11 +221,17 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
   }
 
   @Override
-  public void close() {
-    try {
-      ingestManager.close();
-    } catch (Exception e) {
-      LOG_ERROR_MSG("Failed to close ingestManager: " + e.getMessage());
+  public synchronized boolean isClosed() {
+    return closed;
+  }
+
+  @Override
+  public synchronized void close() {
+    closed = true;
+    if (ingestManager != null) {
+      // the registry closes the manager once no pipe uses it anymore
+      ingestManagers.release(pipeName);
+      ingestManager = null;
     }
     LOG_INFO_MSG("IngestService Closed");
   }
@@ -255,9 +252,18 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
     return result;
   }
 
-  /* Only used for testing */
-  public SimpleIngestManager getIngestManager() {
-    return this.ingestManager;
+  /*
+   * Ingest manager of the pipe, acquired on the first call. Throws once the service is closed, so
+   * that a late request doesn't acquire a manager which is never released. Public for testing
+   */
+  public synchronized SimpleIngestManager getIngestManager() {
+    if (closed) {
+      throw SnowflakeErrors.ERROR_3009.getException("pipe name: " + pipeName);
+    }
+    if (ingestManager == null) {
+      ingestManager = ingestManagers.acquire(pipeName);
+    }
+    return ingestManager;
   }
 
   @Override
@@ -269,7 +275,7 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
               InternalUtils.backoffAndRetry(
                   telemetry,
                   SnowflakeInternalOperations.CONFIGURE_CLIENT_SNOWPIPE_API,
-                  () -> ingestManager.configureClient(null));
+                  () -> getIngestManager().configureClient(null));
     } catch (Exception e) {
       throw SnowflakeErrors.ERROR_3006.getException(e);
     }
@@ -289,7 +295,7 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
               InternalUtils.backoffAndRetry(
                   telemetry,
                   SnowflakeInternalOperations.GET_CLIENT_STATUS_SNOWPIPE_API,
-                  () -> ingestManager.getClientStatus(null));
+                  () -> getIngestManager().getClientStatus(null));
     } catch (Exception e) {
       throw SnowflakeErrors.ERROR_3007.getException(e);
     }
@@ -325,11 +331,12 @@ public class SnowflakeIngestionServiceV1 extends EnableLogging
               InsertFilesClientInfo clientInfo =
                   new InsertFilesClientInfo(clientSequencer, offsetToken);
               Set<String> fileNamesSet = new HashSet<>(fileNamesBatch);
-              ingestManager.ingestFiles(
-                  SimpleIngestManager.wrapFilepaths(fileNamesSet),
-                  null /* requestId*/,
-                  false /*showSkippedFiles*/,
-                  clientInfo);
+              getIngestManager()
+                  .ingestFiles(
+                      SimpleIngestManager.wrapFilepaths(fileNamesSet),
+                      null /* requestId*/,
+                      false /*showSkippedFiles*/,
+                      clientInfo);
               fileNamesBatch.clear();
             }
             return true;
@@ -142,8 +142,37 @@ public class SnowflakeInternalStage extends EnableLogging {
    */
   public void putWithCache(
       String stageName, String fullFilePath, String data, final StageInfo.StageType stageType) {
+    byte[] dataBytes = data.getBytes(StandardCharsets.UTF_8);
+    putWithCache(stageName, fullFilePath, new ByteArrayInputStream(dataBytes), true, stageType);
+  }
+
+  /**
+   * Upload an already compressed file to internal stage with previously cached credentials, see
+   * {@link #putWithCache(String, String, String, StageInfo.StageType)}
+   *
+   * @param stageName Stage name
+   * @param fullFilePath Full file name to be uploaded
+   * @param data Gzip compressed content to be uploaded as is
+   * @param stageType GCS, Azure or AWS
+   */
+  public void putWithCache(
+      String stageName,
+      String fullFilePath,
+      GzipFileBuffer data,
+      final StageInfo.StageType stageType) {
+    putWithCache(stageName, fullFilePath, data.getInputStream(), false, stageType);
+  }
+
+  private void putWithCache(
+      String stageName,
+      String fullFilePath,
+      InputStream inStream,
+      boolean requireCompress,
+      final StageInfo.StageType stageType) {
+    // The cached entry is read once, another upload may refresh or invalidate it meanwhile
+    SnowflakeMetadataWithExpiration credential;
     try {
-      SnowflakeMetadataWithExpiration credential = storageInfoCache.getOrDefault(stageName, null);
+      credential = storageInfoCache.getOrDefault(stageName, null);
 
       if (!isCredentialValid(credential, stageType)) {
         // This should always be executed in GCS
@@ -151,7 +180,7 @@ public class SnowflakeInternalStage extends EnableLogging {
             "Query credential(Refreshing Credentials) for stageName:{}, filePath:{}",
             stageName,
             fullFilePath);
-        refreshCredentials(stageName, stageType, fullFilePath);
+        credential = refreshCredentials(stageName, stageType, fullFilePath);
       }
     } catch (Exception e) {
       LOG_WARN_MSG(
@@ -159,44 +188,43 @@ public class SnowflakeInternalStage extends EnableLogging {
       throw SnowflakeErrors.ERROR_5018.getException(e.getMessage());
     }
 
-    // Lets fetch the file transfer metadata from cache again. (Because we might have refreshed
-    // them)
-    SnowflakeFileTransferMetadataV1 fileTransferMetadata =
-        storageInfoCache.get(stageName).fileTransferMetadata;
-    // Set filename to be uploaded
-    // This set is not useful in GCS since there is a bug in JDBC which doesnt use destFileName.
-    // TODO: https://snowflakecomputing.atlassian.net/browse/SNOW-350676
-    fileTransferMetadata.setPresignedUrlFileName(fullFilePath);
-
-    byte[] dataBytes = data.getBytes(StandardCharsets.UTF_8);
-    InputStream inStream = new ByteArrayInputStream(dataBytes);
+    SnowflakeFileTransferMetadataV1 fileTransferMetadata = credential.fileTransferMetadata;
+    // The metadata is shared by the uploads to the stage and the file name is set on it, so it is
+    // locked until the upload is done, otherwise a file could be uploaded under another file name
+    synchronized (fileTransferMetadata) {
+      // Set filename to be uploaded
+      // This set is not useful in GCS since there is a bug in JDBC which doesnt use destFileName.
+      // TODO: https://snowflakecomputing.atlassian.net/browse/SNOW-350676
+      fileTransferMetadata.setPresignedUrlFileName(fullFilePath);
 
-    // This uploadWithoutConnection api cannot handle expired credentials very well.
-    // Need to prevent passing expired credential to it.
-    try {
-      SnowflakeFileTransferAgent.uploadWithoutConnection(
-          SnowflakeFileTransferConfig.Builder.newInstance()
-              .setSnowflakeFileTransferMetadata(fileTransferMetadata)
-              .setUploadStream(inStream)
-              .setRequireCompress(true)
-              .setOcspMode(OCSPMode.FAIL_OPEN)
-              .setProxyProperties(proxyProperties)
-              .build());
-      LOG_INFO_MSG(
-          "uploadWithoutConnection successful for stageName:{}, filePath:{}",
-          stageName,
-          fullFilePath,
-          fullFilePath);
-    } catch (Exception e) {
-      // If this api encounters error, invalidate the cached credentials
-      // Caller will retry this function
-      LOG_WARN_MSG(
-          "uploadWithoutConnection encountered an exception:{} for filePath:{} in Storage:{}",
-          e.getMessage(),
-          fullFilePath,
-          stageType);
-      storageInfoCache.remove(stageName);
-      throw SnowflakeErrors.ERROR_5018.getException(e.getMessage());
+      // This uploadWithoutConnection api cannot handle expired credentials very well.
+      // Need to prevent passing expired credential to it.
+      try {
+        SnowflakeFileTransferAgent.uploadWithoutConnection(
+            SnowflakeFileTransferConfig.Builder.newInstance()
+                .setSnowflakeFileTransferMetadata(fileTransferMetadata)
+                .setUploadStream(inStream)
+                .setRequireCompress(requireCompress)
+                .setOcspMode(OCSPMode.FAIL_OPEN)
+                .setProxyProperties(proxyProperties)
+                .build());
+        LOG_INFO_MSG(
+            "uploadWithoutConnection successful for stageName:{}, filePath:{}",
+            stageName,
+            fullFilePath,
+            fullFilePath);
+      } catch (Exception e) {
+        // If this api encounters error, invalidate the cached credentials, unless another upload
+        // already refreshed them
+        // Caller will retry this function
+        LOG_WARN_MSG(
+            "uploadWithoutConnection encountered an exception:{} for filePath:{} in Storage:{}",
+            e.getMessage(),
+            fullFilePath,
+            stageType);
+        storageInfoCache.remove(stageName, credential);
+        throw SnowflakeErrors.ERROR_5018.getException(e.getMessage());
+      }
     }
   }
 
@@ -221,8 +249,17 @@ public class SnowflakeInternalStage extends EnableLogging {
             < expirationTimeMillis;
   }
 
+  /**
+   * Fetch the file transfer metadata of the stage and cache it
+   *
+   * @param stageName name of the stage
+   * @param stageType GCS, Azure or AWS
+   * @param fullFilePath full file name to be uploaded, required by GCS
+   * @return the cached metadata
+   * @throws SnowflakeSQLException if the metadata can't be fetched
+   */
   @VisibleForTesting
-  protected void refreshCredentials(
+  protected SnowflakeMetadataWithExpiration refreshCredentials(
       final String stageName, final StageInfo.StageType stageType, final String fullFilePath)
       throws SnowflakeSQLException {
     String putCommandToFetchMetadata =
@@ -249,6 +286,7 @@ public class SnowflakeInternalStage extends EnableLogging {
       // again.
       storageInfoCache.put(stageName, credential);
       LOG_DEBUG_MSG("Caching credential successful for stage:{}", stageName);
+      return credential;
     }
   }
 
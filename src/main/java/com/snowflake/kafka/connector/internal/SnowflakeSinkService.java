@@ -22,6 +22,17 @@ public interface SnowflakeSinkService {
    */
   void startTask(String tableName, TopicPartition topicPartition);
 
+  /**
+   * Start the tasks of all partitions assigned by a rebalance. Partitions which are not started
+   * before the timeout are started on their first record instead.
+   *
+   * @param partitionTables destination table name of each partition
+   * @param timeoutMillis time after which no more partitions are started
+   */
+  default void startPartitions(Map<TopicPartition, String> partitionTables, long timeoutMillis) {
+    partitionTables.forEach((topicPartition, tableName) -> startTask(tableName, topicPartition));
+  }
+
   /**
    * call pipe to insert a collections of JSON records will trigger time based flush
    *
@@ -145,6 +156,29 @@ public interface SnowflakeSinkService {
   /* Set Error reporter which can be used to send records to DLQ (Dead Letter Queue) */
   default void setErrorReporter(KafkaRecordErrorReporter kafkaRecordErrorReporter) {}
 
+  /* Set the number of threads uploading flushed buffers to the internal stage (Snowpipe only) */
+  default void setFileUploadThreads(int threads) {}
+
+  /* Set the number of threads shared by the cleaners of all partitions (Snowpipe only) */
+  default void setCleanerThreads(int threads) {}
+
+  /* Set the number of partitions of a batch processed in parallel, including the task thread */
+  default void setPartitionWorkerThreads(int threads) {}
+
+  /* Set the number of partitions opened in parallel by startPartitions */
+  default void setPartitionOpenThreads(int threads) {}
+
+  /* Set the maximum bytes buffered by all the partitions of the task, 0 means no limit */
+  default void setBufferMemoryLimit(long bytes) {}
+
+  /* Set the largest size threshold of buffers tuned from their arrival rate, 0 disables it */
+  default void setAdaptiveFlushMaxSize(long bytes) {}
+
+  /* Whether the buffers hold too much memory and consumption should be paused */
+  default boolean isOverMemoryBudget() {
+    return false;
+  }
+
   /* Set the SinkTaskContext object available from SinkTask. It contains utility methods to from Kafka Connect Runtime. */
   default void setSinkTaskContext(SinkTaskContext sinkTaskContext) {}
 
@@ -129,6 +129,42 @@ public class SnowflakeSinkServiceFactory {
       return this;
     }
 
+    public SnowflakeSinkServiceBuilder setFileUploadThreads(int threads) {
+      this.service.setFileUploadThreads(threads);
+      LOG_INFO_MSG("file upload threads is set to {}", threads);
+      return this;
+    }
+
+    public SnowflakeSinkServiceBuilder setCleanerThreads(int threads) {
+      this.service.setCleanerThreads(threads);
+      LOG_INFO_MSG("cleaner threads is set to {}", threads);
+      return this;
+    }
+
+    public SnowflakeSinkServiceBuilder setPartitionWorkerThreads(int threads) {
+      this.service.setPartitionWorkerThreads(threads);
+      LOG_INFO_MSG("partition worker threads is set to {}", threads);
+      return this;
+    }
+
+    public SnowflakeSinkServiceBuilder setPartitionOpenThreads(int threads) {
+      this.service.setPartitionOpenThreads(threads);
+      LOG_INFO_MSG("partition open threads is set to {}", threads);
+      return this;
+    }
+
+    public SnowflakeSinkServiceBuilder setBufferMemoryLimit(long bytes) {
+      this.service.setBufferMemoryLimit(bytes);
+      LOG_INFO_MSG("buffer memory limit is set to {} bytes", bytes);
+      return this;
+    }
+
+    public SnowflakeSinkServiceBuilder setAdaptiveFlushMaxSize(long bytes) {
+      this.service.setAdaptiveFlushMaxSize(bytes);
+      LOG_INFO_MSG("adaptive flush max size is set to {} bytes", bytes);
+      return this;
+    }
+
     public SnowflakeSinkServiceBuilder setErrorReporter(
         KafkaRecordErrorReporter kafkaRecordErrorReporter) {
       this.service.setErrorReporter(kafkaRecordErrorReporter);
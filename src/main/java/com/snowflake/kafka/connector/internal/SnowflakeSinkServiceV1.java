@@ -3,11 +3,13 @@ package com.snowflake.kafka.connector.internal;
 import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.*;
 import static org.apache.kafka.common.record.TimestampType.NO_TIMESTAMP_TYPE;
 
+import com.codahale.metrics.Gauge;
 import com.codahale.metrics.Histogram;
 import com.codahale.metrics.MetricRegistry;
 import com.google.common.annotations.VisibleForTesting;
 import com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig;
 import com.snowflake.kafka.connector.Utils;
+import com.snowflake.kafka.connector.internal.PendingFileIndex.PendingFile;
 import com.snowflake.kafka.connector.internal.metrics.MetricsJmxReporter;
 import com.snowflake.kafka.connector.internal.metrics.MetricsUtil;
 import com.snowflake.kafka.connector.internal.telemetry.SnowflakeTelemetryPipeCreation;
@@ -23,12 +25,28 @@ import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.Collection;
 import java.util.HashMap;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
 import java.util.LinkedList;
 import java.util.List;
 import java.util.Map;
 import java.util.Optional;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.CancellationException;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.CompletionException;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.ExecutionException;
 import java.util.concurrent.ExecutorService;
 import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.FutureTask;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ThreadLocalRandom;
+import java.util.concurrent.ThreadPoolExecutor;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicBoolean;
 import java.util.concurrent.atomic.AtomicLong;
 import java.util.concurrent.locks.Lock;
 import java.util.concurrent.locks.ReentrantLock;
@@ -57,6 +75,10 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
   private static final long TEN_MINUTES = 10 * 60 * 1000L;
   protected static final long CLEAN_TIME = 60 * 1000L; // one minutes
 
+  // Number of flushed buffers waiting for an upload thread, per thread. Once the queue is full the
+  // task thread uploads the buffer itself, which throttles put()
+  private static final int FILE_UPLOAD_QUEUE_SIZE_PER_THREAD = 2;
+
   // Set in config (Time based flush) in seconds
   private long flushTime;
   // Set in config (buffer size based flush) in bytes
@@ -65,6 +87,40 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
   // Set in config (Threshold before we send the buffer to internal stage) corresponds to # of
   // records in kafka
   private long recordNum;
+
+  // Set in config (number of threads uploading flushed buffers to internal stage), 0 means the
+  // upload happens on the task thread
+  private int fileUploadThreads = SnowflakeSinkConnectorConfig.SNOWPIPE_FILE_UPLOAD_THREADS_DEFAULT;
+
+  // shared by all pipes of this task, created on the first flush
+  private ExecutorService fileUploadExecutor;
+
+  // Set in config (number of threads running the cleaners of all pipes of this task)
+  private int cleanerThreads = SnowflakeSinkConnectorConfig.SNOWPIPE_CLEANER_THREADS_DEFAULT;
+
+  // shared by all pipes of this task, created when the first cleaner starts
+  private ScheduledExecutorService cleanerExecutor;
+
+  // reads the ingest report of all pipes of this task, created when the first cleaner starts
+  private SnowpipeIngestReportPoller ingestReportPoller;
+
+  // Set in config (number of partitions of a batch processed in parallel)
+  private PartitionWorkerPool partitionWorkers =
+      new PartitionWorkerPool(SnowflakeSinkConnectorConfig.PARTITION_WORKER_THREADS_DEFAULT);
+
+  // Set in config (number of partitions started in parallel after a rebalance)
+  private int partitionOpenThreads = SnowflakeSinkConnectorConfig.PARTITION_OPEN_THREADS_DEFAULT;
+
+  // Set in config (maximum bytes buffered by all the pipes of the task)
+  private BufferMemoryBudget memoryBudget =
+      new BufferMemoryBudget(SnowflakeSinkConnectorConfig.BUFFER_MEMORY_LIMIT_BYTES_DEFAULT);
+
+  // Set in config (largest size threshold of the tuned buffers), 0 when the tuning is disabled
+  private long adaptiveFlushMaxSize = 0;
+
+  // provisions the tables, stages and pipes of the started partitions, created on the first open
+  private ExecutorService prewarmExecutor;
+
   private final SnowflakeConnectionService conn;
   private final Map<String, ServiceContext> pipes;
   private final RecordService recordService;
@@ -127,40 +183,206 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     }
   }
 
+  /**
+   * Build the pipe contexts of the assigned partitions in parallel, each of them builds its own
+   * ingest service. Tables, stages and pipes are still checked on the first record of a partition.
+   *
+   * @param partitionTables destination table name of each partition
+   * @param timeoutMillis time after which no more partitions are started
+   */
   @Override
-  public void insert(final Collection<SinkRecord> records) {
-    // note that records can be empty
-    for (SinkRecord record : records) {
-      // check if need to handle null value records
-      if (recordService.shouldSkipNullValue(record, behaviorOnNullValues)) {
-        continue;
+  public void startPartitions(
+      final Map<TopicPartition, String> partitionTables, final long timeoutMillis) {
+    long startTime = System.currentTimeMillis();
+    Map<String, ServiceContext> startedPipes = new ConcurrentHashMap<>();
+    List<Runnable> units = new ArrayList<>(partitionTables.size());
+    partitionTables.forEach(
+        (topicPartition, tableName) -> {
+          String nameIndex = getNameIndex(topicPartition.topic(), topicPartition.partition());
+          if (pipes.containsKey(nameIndex)) {
+            LOG_ERROR_MSG("task is already registered, name: {}", nameIndex);
+            return;
+          }
+          String stageName = Utils.stageName(conn.getConnectorName(), tableName);
+          String pipeName =
+              Utils.pipeName(conn.getConnectorName(), tableName, topicPartition.partition());
+          units.add(
+              () ->
+                  startedPipes.put(
+                      nameIndex,
+                      new ServiceContext(
+                          tableName, stageName, pipeName, conn, topicPartition.partition())));
+        });
+
+    PartitionWorkerPool openWorkers = new PartitionWorkerPool(partitionOpenThreads);
+    int skipped;
+    try {
+      skipped = openWorkers.runAllUntil(units, startTime + timeoutMillis);
+    } finally {
+      openWorkers.stop();
+      // pipes are only registered on the task thread
+      pipes.putAll(startedPipes);
+    }
+    LOG_INFO_MSG(
+        "started {} pipes in {} ms", startedPipes.size(), System.currentTimeMillis() - startTime);
+    prewarm(startedPipes.values());
+    if (skipped > 0) {
+      LOG_WARN_MSG(
+          "{} partitions were not started within {} ms, they are started on their first record",
+          skipped,
+          timeoutMillis);
+    }
+  }
+
+  /**
+   * Provision the tables, stages and pipes of the started pipes in the background, with one unit of
+   * work per table. The table and the stage are checked once, the pipes of the table are checked
+   * with a single show pipes query and the missing ones are created in one batch. The first record
+   * of a partition waits for its provisioning instead of running these queries on the task thread.
+   *
+   * @param contexts started pipes
+   */
+  private void prewarm(final Collection<ServiceContext> contexts) {
+    Map<String, List<ServiceContext>> tableContexts = new LinkedHashMap<>();
+    for (ServiceContext context : contexts) {
+      context.provisioning = new CompletableFuture<>();
+      tableContexts.computeIfAbsent(context.tableName, ignored -> new ArrayList<>()).add(context);
+    }
+    if (tableContexts.isEmpty()) {
+      return;
+    }
+    ExecutorService executor = getPrewarmExecutor();
+    tableContexts.forEach(
+        (tableName, sameTableContexts) ->
+            executor.execute(() -> provisionTable(tableName, sameTableContexts)));
+  }
+
+  private void provisionTable(final String tableName, final List<ServiceContext> contexts) {
+    long startTime = System.currentTimeMillis();
+    try {
+      ServiceContext firstContext = contexts.get(0);
+      firstContext.createTableAndStage(firstContext.pipeCreation);
+      // the other pipes reuse what the first one created, as if they were started one by one
+      for (ServiceContext context : contexts.subList(1, contexts.size())) {
+        context.pipeCreation.setReuseTable(true);
+        context.pipeCreation.setReuseStage(true);
+      }
+
+      List<String> pipeNames =
+          contexts.stream().map(context -> context.pipeName).collect(Collectors.toList());
+      Map<String, Boolean> existingPipes =
+          conn.arePipesCompatible(tableName, firstContext.stageName, pipeNames);
+      conn.createPipes(
+          tableName,
+          firstContext.stageName,
+          pipeNames.stream()
+              .filter(pipeName -> !existingPipes.containsKey(pipeName))
+              .collect(Collectors.toList()));
+
+      for (ServiceContext context : contexts) {
+        Boolean compatible = existingPipes.get(context.pipeName);
+        if (Boolean.FALSE.equals(compatible)) {
+          // the first record checks the pipe again and reports the error
+          context.provisioning.complete(false);
+          continue;
+        }
+        context.pipeCreation.setReusePipe(compatible != null);
+        try {
+          // when exactly_once is enabled,fetch clientSequencer and offsetPersistedInSnowflake
+          if (ingestionDeliveryGuarantee
+              == SnowflakeSinkConnectorConfig.IngestionDeliveryGuarantee.EXACTLY_ONCE) {
+            context.initClientInfoForExactlyOnceDelivery();
+          }
+          context.provisioning.complete(true);
+        } catch (Exception e) {
+          context.provisioning.completeExceptionally(e);
+        }
       }
-      // Might happen a count of record based flushing
-      insert(record);
+      LOG_INFO_MSG(
+          "provisioned {} pipes of table {} in {} ms",
+          contexts.size(),
+          tableName,
+          System.currentTimeMillis() - startTime);
+    } catch (Exception e) {
+      // pipes already completed are not affected
+      contexts.forEach(context -> context.provisioning.completeExceptionally(e));
     }
+  }
+
+  @Override
+  public void insert(final Collection<SinkRecord> records) {
+    // note that records can be empty
+    Map<TopicPartition, List<SinkRecord>> partitionRecords =
+        PartitionWorkerPool.groupByPartition(records);
+    // pipes are looked up on the task thread, the workers only touch their own pipe
+    List<Runnable> units = new ArrayList<>(partitionRecords.size());
+    partitionRecords.forEach(
+        (topicPartition, partitionBatch) -> {
+          ServiceContext pipe = getOrStartPipe(topicPartition.topic(), topicPartition.partition());
+          units.add(
+              () -> {
+                for (SinkRecord record : partitionBatch) {
+                  // check if need to handle null value records
+                  if (recordService.shouldSkipNullValue(record, behaviorOnNullValues)) {
+                    continue;
+                  }
+                  // Might happen a count of record based flushing
+                  pipe.insert(record);
+                }
+              });
+        });
+    partitionWorkers.runAll(units);
     // check all sink context to see if they need to be flushed
     for (ServiceContext pipe : pipes.values()) {
       // Time based flushing
       if (pipe.shouldFlush()) {
         pipe.flushBuffer();
       }
+      pipe.flushBrokenRecords(false);
     }
+    enforceMemoryBudget();
+  }
+
+  /**
+   * Flush the largest buffers when the pipes of the task buffer more than the memory limit. Files
+   * still being uploaded count towards the limit, consumption is paused when they keep the usage
+   * over it.
+   */
+  private void enforceMemoryBudget() {
+    if (!memoryBudget.isEnabled()) {
+      return;
+    }
+    Map<String, Long> bufferedBytes = new HashMap<>(pipes.size());
+    long inFlightBytes = 0;
+    for (Map.Entry<String, ServiceContext> pipe : pipes.entrySet()) {
+      bufferedBytes.put(pipe.getKey(), pipe.getValue().getBufferSizeBytes());
+      inFlightBytes += pipe.getValue().getPendingUploadSizeBytes();
+    }
+    memoryBudget.enforce(
+        bufferedBytes, inFlightBytes, nameIndex -> pipes.get(nameIndex).flushBuffer());
+  }
+
+  @Override
+  public boolean isOverMemoryBudget() {
+    return memoryBudget.isOverBudget();
   }
 
   @Override
   public void insert(SinkRecord record) {
-    String nameIndex = getNameIndex(record.topic(), record.kafkaPartition());
+    getOrStartPipe(record.topic(), record.kafkaPartition()).insert(record);
+  }
+
+  private ServiceContext getOrStartPipe(final String topic, final int partition) {
+    String nameIndex = getNameIndex(topic, partition);
     // init a new topic partition
     if (!pipes.containsKey(nameIndex)) {
       LOG_WARN_MSG(
           "Topic: {} Partition: {} hasn't been initialized by OPEN " + "function",
-          record.topic(),
-          record.kafkaPartition());
-      startTask(
-          Utils.tableName(record.topic(), this.topic2TableMap),
-          new TopicPartition(record.topic(), record.kafkaPartition()));
+          topic,
+          partition);
+      startTask(Utils.tableName(topic, this.topic2TableMap), new TopicPartition(topic, partition));
     }
-    pipes.get(nameIndex).insert(record);
+    return pipes.get(nameIndex);
   }
 
   @Override
@@ -186,6 +408,8 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
   @Override
   public void callAllGetOffset() {
     for (ServiceContext pipe : pipes.values()) {
+      pipe.flushBrokenRecords(true);
+      pipe.publishBrokenRecordUploads(true);
       pipe.getOffset();
     }
   }
@@ -227,6 +451,10 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
           context.unregisterPipeJMXMetrics();
         });
     pipes.clear();
+    partitionWorkers.stop();
+    stopPrewarmExecutor();
+    stopFileUploadExecutor();
+    stopCleanerExecutor();
   }
 
   @Override
@@ -280,6 +508,74 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     }
   }
 
+  @Override
+  public void setFileUploadThreads(final int threads) {
+    if (threads < 0) {
+      LOG_ERROR_MSG("number of file upload threads is {}, it is negative, reset to 0", threads);
+      this.fileUploadThreads = 0;
+    } else {
+      this.fileUploadThreads = threads;
+      LOG_INFO_MSG("set number of file upload threads to {}", threads);
+    }
+  }
+
+  @Override
+  public void setCleanerThreads(final int threads) {
+    if (threads < 1) {
+      LOG_ERROR_MSG("number of cleaner threads is {}, it is less than 1, reset to 1", threads);
+      this.cleanerThreads = 1;
+    } else {
+      this.cleanerThreads = threads;
+      LOG_INFO_MSG("set number of cleaner threads to {}", threads);
+    }
+  }
+
+  @Override
+  public void setPartitionWorkerThreads(final int threads) {
+    if (threads < 1) {
+      LOG_ERROR_MSG(
+          "number of partition worker threads is {}, it is less than 1, reset to 1", threads);
+    } else {
+      LOG_INFO_MSG("set number of partition worker threads to {}", threads);
+    }
+    partitionWorkers.stop();
+    partitionWorkers = new PartitionWorkerPool(threads);
+  }
+
+  @Override
+  public void setPartitionOpenThreads(final int threads) {
+    if (threads < 1) {
+      LOG_ERROR_MSG(
+          "number of partition open threads is {}, it is less than 1, reset to 1", threads);
+      partitionOpenThreads = 1;
+    } else {
+      LOG_INFO_MSG("set number of partition open threads to {}", threads);
+      partitionOpenThreads = threads;
+    }
+  }
+
+  @Override
+  public void setBufferMemoryLimit(final long bytes) {
+    if (bytes < 0) {
+      LOG_ERROR_MSG("buffer memory limit is {}, it is less than 0, reset to 0", bytes);
+      memoryBudget = new BufferMemoryBudget(0);
+    } else {
+      LOG_INFO_MSG("set buffer memory limit to {} bytes", bytes);
+      memoryBudget = new BufferMemoryBudget(bytes);
+    }
+  }
+
+  @Override
+  public void setAdaptiveFlushMaxSize(final long bytes) {
+    if (bytes < 0) {
+      LOG_ERROR_MSG("adaptive flush max size is {}, it is less than 0, reset to 0", bytes);
+      adaptiveFlushMaxSize = 0;
+    } else {
+      LOG_INFO_MSG("set adaptive flush max size to {} bytes", bytes);
+      adaptiveFlushMaxSize = bytes;
+    }
+  }
+
   @Override
   public void setTopic2TableMap(Map<String, String> topic2TableMap) {
     this.topic2TableMap = topic2TableMap;
@@ -349,6 +645,106 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     return topic + "_" + partition;
   }
 
+  /**
+   * Run the upload of a flushed buffer. With upload threads configured, the upload is queued on
+   * the task wide executor, and runs on the calling thread when the queue is full (backpressure).
+   * Otherwise it runs on the calling thread right away.
+   *
+   * @param upload the upload to run
+   * @return future completed once the file is on stage
+   */
+  private Future<?> submitFileUpload(final Runnable upload) {
+    if (fileUploadThreads == 0) {
+      FutureTask<Void> task = new FutureTask<>(upload, null);
+      task.run();
+      return task;
+    }
+    return getFileUploadExecutor().submit(upload);
+  }
+
+  private synchronized ExecutorService getFileUploadExecutor() {
+    if (fileUploadExecutor == null) {
+      fileUploadExecutor =
+          new ThreadPoolExecutor(
+              fileUploadThreads,
+              fileUploadThreads,
+              0L,
+              TimeUnit.MILLISECONDS,
+              new ArrayBlockingQueue<>(fileUploadThreads * FILE_UPLOAD_QUEUE_SIZE_PER_THREAD),
+              new ThreadPoolExecutor.CallerRunsPolicy());
+      LOG_INFO_MSG("file upload executor started with {} threads", fileUploadThreads);
+    }
+    return fileUploadExecutor;
+  }
+
+  private synchronized ScheduledExecutorService getCleanerExecutor() {
+    if (cleanerExecutor == null) {
+      cleanerExecutor = Executors.newScheduledThreadPool(cleanerThreads);
+      LOG_INFO_MSG("cleaner executor started with {} threads", cleanerThreads);
+    }
+    return cleanerExecutor;
+  }
+
+  private synchronized SnowpipeIngestReportPoller getIngestReportPoller() {
+    if (ingestReportPoller == null) {
+      ingestReportPoller = new SnowpipeIngestReportPoller(cleanerThreads);
+      ingestReportPoller.start(getCleanerExecutor(), CLEAN_TIME);
+    }
+    return ingestReportPoller;
+  }
+
+  private synchronized void unregisterFromIngestReportPoller(final String pipeName) {
+    if (ingestReportPoller != null) {
+      ingestReportPoller.unregister(pipeName);
+    }
+  }
+
+  private synchronized void stopCleanerExecutor() {
+    if (ingestReportPoller != null) {
+      ingestReportPoller.stop();
+      ingestReportPoller = null;
+    }
+    if (cleanerExecutor != null) {
+      cleanerExecutor.shutdownNow();
+      cleanerExecutor = null;
+      LOG_INFO_MSG("cleaner executor terminated");
+    }
+  }
+
+  /**
+   * Randomize the first run of a cleaner within [CLEAN_TIME / 2, CLEAN_TIME * 3 / 2) so that the
+   * cleaners of partitions opened together don't all run at the same time.
+   *
+   * @return delay in milliseconds
+   */
+  private static long cleanerInitialDelay() {
+    return CLEAN_TIME / 2 + ThreadLocalRandom.current().nextLong(CLEAN_TIME);
+  }
+
+  private synchronized ExecutorService getPrewarmExecutor() {
+    if (prewarmExecutor == null) {
+      prewarmExecutor = Executors.newFixedThreadPool(partitionOpenThreads);
+      LOG_INFO_MSG("prewarm executor started with {} threads", partitionOpenThreads);
+    }
+    return prewarmExecutor;
+  }
+
+  private synchronized void stopPrewarmExecutor() {
+    if (prewarmExecutor != null) {
+      prewarmExecutor.shutdownNow();
+      prewarmExecutor = null;
+      LOG_INFO_MSG("prewarm executor terminated");
+    }
+  }
+
+  private synchronized void stopFileUploadExecutor() {
+    if (fileUploadExecutor != null) {
+      fileUploadExecutor.shutdownNow();
+      fileUploadExecutor = null;
+      LOG_INFO_MSG("file upload executor terminated");
+    }
+  }
+
   private class ServiceContext {
     private final String tableName;
     private final String stageName;
@@ -357,23 +753,42 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     private final SnowflakeIngestionService ingestionService;
     private List<String> fileNames;
 
-    // Includes a list of files:
+    // Includes an index of files:
     // 1. Which are added after a flush into internal stage is successful
     // 2. While an app restarts and we do list on an internal stage to find out what needs to be
     // done on leaked files.
-    private List<String> cleanerFileNames;
-    private SnowpipeBuffer buffer;
+    private PendingFileIndex cleanerFiles;
+
+    // LOADED/FAILED statuses of cleanerFiles dispatched by the ingest report poller, consumed
+    // by the next checkStatus
+    private final Map<String, InternalUtils.IngestedFileStatus> ingestReport;
+
+    // Buffers handed off to the file upload executor, in offset order. A file is only added to
+    // fileNames and flushedOffset once it and all files before it are on stage.
+    private final LinkedList<PendingFileUpload> pendingFileUploads;
+    // replaced under bufferLock, its size is read without the lock by the task thread
+    private volatile SnowpipeBuffer buffer;
+
+    // broken records written to the table stage in batches, flushed on size or time like buffer
+    private BrokenRecordBatch brokenRecords;
+    // batches handed off to the file upload executor, their records can't be committed before
+    // they are on the table stage
+    private final LinkedList<PendingBrokenRecordUpload> pendingBrokenRecordUploads;
     private final String prefix;
     private final AtomicLong committedOffset; // loaded offset + 1
     private final AtomicLong flushedOffset; // flushed offset (file on stage)
     private final AtomicLong processedOffset; // processed offset
-    private long previousFlushTimeStamp;
+    // written by the partition worker which flushes, read by the task thread for time based flushes
+    private volatile long previousFlushTimeStamp;
 
-    // threads
-    private final ExecutorService cleanerExecutor;
-    private final ExecutorService reprocessCleanerExecutor;
+    // cleaner runs, scheduled on the task wide cleaner executor. Started by the partition worker
+    // which initializes the pipe, stopped by the task thread
+    private volatile Future<?> cleanerTask;
+    private volatile Future<?> reprocessCleanerTask;
     private final Lock bufferLock;
     private final Lock fileListLock;
+    private final Lock pendingFileUploadsLock;
+    private final Lock brokenRecordsLock;
 
     // telemetry
     private final SnowflakeTelemetryPipeStatus pipeStatus;
@@ -384,12 +799,24 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     private final MetricsJmxReporter metricsJmxReporter;
 
     // buffer metrics, updated everytime when a buffer is flushed to internal stage
-    private Histogram partitionBufferSizeBytesHistogram; // in Bytes
+    private Histogram partitionBufferSizeBytesHistogram; // in Bytes, encoded in UTF-8
+    private Histogram partitionBufferCompressedSizeBytesHistogram; // in Bytes, gzip compressed
     private Histogram partitionBufferCountHistogram;
 
+    // tunes the flush thresholds of the pipe, null when the configured thresholds are used
+    private final AdaptiveFlushController adaptiveFlush;
+
+    // telemetry of the pipe start, filled by the background provisioning or by init
+    private final SnowflakeTelemetryPipeCreation pipeCreation;
+
+    // completed by the background provisioning of the table, stage and pipe, true on success and
+    // false if init has to check them again. Null if the pipe is provisioned by init
+    private CompletableFuture<Boolean> provisioning;
+
     // make the initialization lazy
-    private boolean hasInitialized = false;
-    private boolean forceCleanerFileReset = false;
+    private volatile boolean hasInitialized = false;
+    // set and cleared by the cleaner runs, which may run on different cleaner threads
+    private volatile boolean forceCleanerFileReset = false;
 
     // exactly once semantics
     private final AtomicLong clientSequencer = new AtomicLong(-1);
@@ -408,17 +835,32 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
       this.stageName = stageName;
       this.conn = conn;
       this.fileNames = new LinkedList<>();
-      this.cleanerFileNames = new LinkedList<>();
+      this.cleanerFiles = new PendingFileIndex();
+      this.pendingFileUploads = new LinkedList<>();
+      this.ingestReport = new ConcurrentHashMap<>();
       this.buffer = new SnowpipeBuffer();
+      this.brokenRecords = new BrokenRecordBatch();
+      this.pendingBrokenRecordUploads = new LinkedList<>();
       this.ingestionService = conn.buildIngestService(stageName, pipeName);
+      this.pipeCreation = new SnowflakeTelemetryPipeCreation(tableName, stageName, pipeName);
       this.prefix = FileNameUtils.filePrefix(conn.getConnectorName(), tableName, partition);
       this.processedOffset = new AtomicLong(-1);
       this.flushedOffset = new AtomicLong(-1);
       this.committedOffset = new AtomicLong(0);
       this.previousFlushTimeStamp = System.currentTimeMillis();
+      this.adaptiveFlush =
+          adaptiveFlushMaxSize > 0
+              ? new AdaptiveFlushController(
+                  TimeUnit.SECONDS.toMillis(SnowflakeSinkConnectorConfig.BUFFER_FLUSH_TIME_SEC_MIN),
+                  TimeUnit.SECONDS.toMillis(getFlushTime()),
+                  getFileSize(),
+                  adaptiveFlushMaxSize)
+              : null;
 
       this.bufferLock = new ReentrantLock();
       this.fileListLock = new ReentrantLock();
+      this.pendingFileUploadsLock = new ReentrantLock();
+      this.brokenRecordsLock = new ReentrantLock();
       this.metricRegistry = new MetricRegistry();
       this.metricsJmxReporter =
           new MetricsJmxReporter(this.metricRegistry, conn.getConnectorName());
@@ -427,9 +869,6 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
           new SnowflakeTelemetryPipeStatus(
               tableName, stageName, pipeName, enableCustomJMXMonitoring, this.metricsJmxReporter);
 
-      this.cleanerExecutor = Executors.newSingleThreadExecutor();
-      this.reprocessCleanerExecutor = Executors.newSingleThreadExecutor();
-
       if (enableCustomJMXMonitoring) {
         partitionBufferCountHistogram =
             this.metricRegistry.histogram(
@@ -437,6 +876,20 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
         partitionBufferSizeBytesHistogram =
             this.metricRegistry.histogram(
                 MetricsUtil.constructMetricName(pipeName, BUFFER_SUB_DOMAIN, BUFFER_SIZE_BYTES));
+        partitionBufferCompressedSizeBytesHistogram =
+            this.metricRegistry.histogram(
+                MetricsUtil.constructMetricName(
+                    pipeName, BUFFER_SUB_DOMAIN, BUFFER_COMPRESSED_SIZE_BYTES));
+        if (adaptiveFlush != null) {
+          this.metricRegistry.register(
+              MetricsUtil.constructMetricName(
+                  pipeName, BUFFER_SUB_DOMAIN, BUFFER_FLUSH_TIME_THRESHOLD_MS),
+              (Gauge<Long>) adaptiveFlush::getFlushTimeThresholdMillis);
+          this.metricRegistry.register(
+              MetricsUtil.constructMetricName(
+                  pipeName, BUFFER_SUB_DOMAIN, BUFFER_FLUSH_SIZE_THRESHOLD_BYTES),
+              (Gauge<Long>) adaptiveFlush::getFlushSizeThresholdBytes);
+        }
       }
 
       LOGGER.info(
@@ -447,18 +900,19 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
 
     private void init(long recordOffset) {
       LOG_INFO_MSG("init pipe: {}", pipeName);
-      SnowflakeTelemetryPipeCreation pipeCreation =
-          new SnowflakeTelemetryPipeCreation(tableName, stageName, pipeName);
-
-      // wait for sinkConnector to start
-      createTableAndStage(pipeCreation);
-      // recover will only check pipe status and create pipe if it does not exist.
-      recover(pipeCreation);
-
-      // when exactly_once is enabled,fetch clientSequencer and offsetPersistedInSnowflake
-      if (ingestionDeliveryGuarantee
-          == SnowflakeSinkConnectorConfig.IngestionDeliveryGuarantee.EXACTLY_ONCE) {
-        initClientInfoForExactlyOnceDelivery();
+      pipeCreation.setStartTime(System.currentTimeMillis());
+
+      if (!awaitProvisioning()) {
+        // wait for sinkConnector to start
+        createTableAndStage(pipeCreation);
+        // recover will only check pipe status and create pipe if it does not exist.
+        recover(pipeCreation);
+
+        // when exactly_once is enabled,fetch clientSequencer and offsetPersistedInSnowflake
+        if (ingestionDeliveryGuarantee
+            == SnowflakeSinkConnectorConfig.IngestionDeliveryGuarantee.EXACTLY_ONCE) {
+          initClientInfoForExactlyOnceDelivery();
+        }
       }
 
       try {
@@ -469,6 +923,26 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
       }
     }
 
+    /**
+     * Wait for the background provisioning of the table, stage and pipe
+     *
+     * @return true if they are ready, false if they have to be checked by init
+     */
+    private boolean awaitProvisioning() {
+      if (provisioning == null) {
+        return false;
+      }
+      try {
+        return provisioning.join();
+      } catch (CompletionException | CancellationException e) {
+        LOG_WARN_MSG(
+            "pipe {}: background provisioning failed, checking again: {}",
+            pipeName,
+            e.getMessage());
+        return false;
+      }
+    }
+
     /**
      * Initialize the client info (clientSequencer and offsetPersistedInSnowflake) by calling
      * ingestion service API configureClient and getClientStatus
@@ -509,8 +983,8 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
         List<String> tmpCleanerFileNames = conn.listStage(stageName, prefix);
         fileListLock.lock();
         try {
-          cleanerFileNames.addAll(tmpCleanerFileNames);
-          cleanerFileNames = cleanerFileNames.stream().distinct().collect(Collectors.toList());
+          // files already known are kept once
+          cleanerFiles.addAll(tmpCleanerFileNames);
         } finally {
           fileListLock.unlock();
         }
@@ -543,57 +1017,68 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
 
       fileListLock.lock();
       try {
-        cleanerFileNames.addAll(currentFilesOnStage);
+        cleanerFiles.addAll(currentFilesOnStage);
       } finally {
         fileListLock.unlock();
       }
 
-      cleanerExecutor.submit(
-          () -> {
-            LOG_INFO_MSG("pipe {}: cleaner started", pipeName);
-            while (!isStopped) {
-              try {
-                telemetryService.reportKafkaPartitionUsage(pipeStatus, false);
-                Thread.sleep(CLEAN_TIME);
+      telemetryService.reportKafkaPartitionUsage(pipeStatus, false);
+      getIngestReportPoller()
+          .register(pipeName, ingestionService, this::getCleanerFileNames, ingestReport::putAll);
+      ScheduledExecutorService executor = getCleanerExecutor();
+      cleanerTask =
+          executor.scheduleWithFixedDelay(
+              this::runCleaner, cleanerInitialDelay(), CLEAN_TIME, TimeUnit.MILLISECONDS);
+      LOG_INFO_MSG("pipe {}: cleaner started", pipeName);
 
-                if (forceCleanerFileReset && resetCleanerFiles()) {
-                  continue;
-                }
+      if (reprocessFiles.size() > 0) {
+        // After we start the cleaner, delay a while and start deleting files.
+        reprocessCleanerTask =
+            executor.schedule(
+                () -> {
+                  try {
+                    LOG_INFO_MSG(
+                        "Purging files already present on the stage before start."
+                            + " ReprocessFileSize:{}",
+                        reprocessFiles.size());
+                    purge(reprocessFiles);
+                  } catch (Exception e) {
+                    LOG_ERROR_MSG(
+                        "Reprocess cleaner encountered an exception {}:\n{}\n{}",
+                        e.getClass(),
+                        e.getMessage(),
+                        e.getStackTrace());
+                  }
+                },
+                CLEAN_TIME,
+                TimeUnit.MILLISECONDS);
+      }
+    }
 
-                checkStatus();
-              } catch (InterruptedException e) {
-                LOG_INFO_MSG("Cleaner terminated by an interrupt:\n{}", e.getMessage());
-                break;
-              } catch (Exception e) {
-                LOG_WARN_MSG(
-                    "Cleaner encountered an exception {}:\n{}\n{}",
-                    e.getClass(),
-                    e.getMessage(),
-                    e.getStackTrace());
-                telemetryService.reportKafkaConnectFatalError(e.getMessage());
-                forceCleanerFileReset = true;
-              }
-            }
-          });
+    /**
+     * One run of the cleaner, scheduled every CLEAN_TIME. Exceptions are not rethrown since that
+     * would cancel the next runs, the stage file list is reset on the next run instead.
+     */
+    private void runCleaner() {
+      if (isStopped) {
+        return;
+      }
+      try {
+        if (forceCleanerFileReset && resetCleanerFiles()) {
+          return;
+        }
 
-      if (reprocessFiles.size() > 0) {
-        // After we start the cleaner thread, delay a while and start deleting files.
-        reprocessCleanerExecutor.submit(
-            () -> {
-              try {
-                Thread.sleep(CLEAN_TIME);
-                LOG_INFO_MSG(
-                    "Purging files already present on the stage before start. ReprocessFileSize:{}",
-                    reprocessFiles.size());
-                purge(reprocessFiles);
-              } catch (Exception e) {
-                LOG_ERROR_MSG(
-                    "Reprocess cleaner encountered an exception {}:\n{}\n{}",
-                    e.getClass(),
-                    e.getMessage(),
-                    e.getStackTrace());
-              }
-            });
+        checkStatus();
+      } catch (Exception e) {
+        LOG_WARN_MSG(
+            "Cleaner encountered an exception {}:\n{}\n{}",
+            e.getClass(),
+            e.getMessage(),
+            e.getStackTrace());
+        telemetryService.reportKafkaConnectFatalError(e.getMessage());
+        forceCleanerFileReset = true;
+      } finally {
+        telemetryService.reportKafkaPartitionUsage(pipeStatus, false);
       }
     }
 
@@ -619,24 +1104,28 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
      */
     private void filterFileReprocess(
         List<String> currentFilesOnStage, List<String> reprocessFiles, long recordOffset) {
-      // iterate over a copy since reprocess files get removed from it
-      new LinkedList<>(currentFilesOnStage)
-          .forEach(
-              name -> {
-                long fileStartOffset = FileNameUtils.fileNameToStartOffset(name);
-                // If start offset of this file is greater than the offset of the record that is
-                // sent to the connector,
-                // all content of this file will be reprocessed. Thus this file can be deleted.
-                if (recordOffset <= fileStartOffset) {
-                  reprocessFiles.add(name);
-                  currentFilesOnStage.remove(name);
-                }
-              });
+      currentFilesOnStage.removeIf(
+          name -> {
+            long fileStartOffset = FileNameUtils.fileNameToStartOffset(name);
+            // If start offset of this file is greater than the offset of the record that is
+            // sent to the connector,
+            // all content of this file will be reprocessed. Thus this file can be deleted.
+            if (recordOffset <= fileStartOffset) {
+              reprocessFiles.add(name);
+              return true;
+            }
+            return false;
+          });
     }
 
     private void stopCleaner() {
-      cleanerExecutor.shutdownNow();
-      reprocessCleanerExecutor.shutdownNow();
+      unregisterFromIngestReportPoller(pipeName);
+      if (cleanerTask != null) {
+        cleanerTask.cancel(true);
+      }
+      if (reprocessCleanerTask != null) {
+        reprocessCleanerTask.cancel(true);
+      }
       LOG_INFO_MSG("pipe {}: cleaner terminated", pipeName);
     }
 
@@ -683,7 +1172,7 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
             processedOffset.set(snowflakeRecord.kafkaOffset());
             pipeStatus.setProcessedOffset(snowflakeRecord.kafkaOffset());
             buffer.insert(snowflakeRecord);
-            if (buffer.getBufferSizeBytes() >= getFileSize()
+            if (isFlushBufferedBytesBased(buffer.getBufferSizeBytes())
                 || (getRecordNumber() != 0 && buffer.getNumOfRecords() >= getRecordNumber())) {
               tmpBuff = buffer;
               this.buffer = new SnowpipeBuffer();
@@ -751,9 +1240,19 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     }
 
     private boolean shouldFlush() {
+      if (adaptiveFlush != null) {
+        return adaptiveFlush.isFlushTimeBased(this.previousFlushTimeStamp);
+      }
       return (System.currentTimeMillis() - this.previousFlushTimeStamp) >= (getFlushTime() * 1000);
     }
 
+    private boolean isFlushBufferedBytesBased(final long bufferSizeBytes) {
+      if (adaptiveFlush != null) {
+        return adaptiveFlush.isFlushBufferedBytesBased(bufferSizeBytes);
+      }
+      return bufferSizeBytes >= getFileSize();
+    }
+
     private void flushBuffer() {
       // Just checking buffer size, no atomic operation required
       if (buffer.isEmpty()) {
@@ -770,18 +1269,154 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
       flush(tmpBuff);
     }
 
+    private long getBufferSizeBytes() {
+      // Just checking buffer size, no atomic operation required
+      return buffer.getBufferSizeBytes();
+    }
+
+    /** @return bytes of the flushed buffers whose upload is not published yet */
+    private long getPendingUploadSizeBytes() {
+      // release the buffers of the finished uploads first
+      publishFileUploads(false);
+      long sizeBytes = 0;
+      pendingFileUploadsLock.lock();
+      try {
+        for (PendingFileUpload upload : pendingFileUploads) {
+          sizeBytes += upload.buffer.getBufferSizeBytes();
+        }
+      } finally {
+        pendingFileUploadsLock.unlock();
+      }
+      return sizeBytes;
+    }
+
     private void writeBrokenDataToTableStage(SinkRecord record) {
       SnowflakeRecordContent key = (SnowflakeRecordContent) record.key();
       SnowflakeRecordContent value = (SnowflakeRecordContent) record.value();
-      if (key != null) {
-        String fileName = FileNameUtils.brokenRecordFileName(prefix, record.kafkaOffset(), true);
-        conn.putToTableStage(tableName, fileName, snowflakeContentToByteArray(key));
-        pipeStatus.updateBrokenRecordMetrics(1l);
+      BrokenRecordBatch fullBatch = null;
+      brokenRecordsLock.lock();
+      try {
+        if (key != null) {
+          brokenRecords.add(record.kafkaOffset(), true, snowflakeContentToByteArray(key));
+        }
+        if (value != null) {
+          brokenRecords.add(record.kafkaOffset(), false, snowflakeContentToByteArray(value));
+        }
+        if (brokenRecords.getSizeBytes() >= getFileSize()) {
+          fullBatch = brokenRecords;
+          brokenRecords = new BrokenRecordBatch();
+        }
+      } finally {
+        brokenRecordsLock.unlock();
+      }
+
+      if (fullBatch != null) {
+        uploadBrokenRecords(fullBatch);
       }
-      if (value != null) {
-        String fileName = FileNameUtils.brokenRecordFileName(prefix, record.kafkaOffset(), false);
-        conn.putToTableStage(tableName, fileName, snowflakeContentToByteArray(value));
-        pipeStatus.updateBrokenRecordMetrics(1l);
+    }
+
+    /**
+     * Write the buffered broken records to the table stage
+     *
+     * @param force flush even if the flush time of the batch hasn't been reached
+     */
+    private void flushBrokenRecords(final boolean force) {
+      BrokenRecordBatch batch;
+      brokenRecordsLock.lock();
+      try {
+        if (brokenRecords.isEmpty()
+            || (!force
+                && System.currentTimeMillis() - brokenRecords.getCreationTime()
+                    < getFlushTime() * 1000)) {
+          return;
+        }
+        batch = brokenRecords;
+        brokenRecords = new BrokenRecordBatch();
+      } finally {
+        brokenRecordsLock.unlock();
+      }
+      uploadBrokenRecords(batch);
+    }
+
+    private void uploadBrokenRecords(final BrokenRecordBatch batch) {
+      String fileName =
+          FileNameUtils.brokenRecordFileName(prefix, batch.getFirstOffset(), batch.getLastOffset());
+      LOG_DEBUG_MSG(
+          "flush {} broken contents of pipe {}, {} bytes, offset {} - {}",
+          batch.getNumOfContents(),
+          pipeName,
+          batch.getSizeBytes(),
+          batch.getFirstOffset(),
+          batch.getLastOffset());
+      Future<?> upload =
+          submitFileUpload(
+              () -> {
+                conn.putToTableStage(tableName, fileName, batch.getData());
+                conn.putToTableStage(
+                    tableName,
+                    FileNameUtils.brokenRecordManifestFileName(fileName),
+                    batch.getManifest());
+                pipeStatus.updateBrokenRecordMetrics(batch.getNumOfContents());
+              });
+
+      brokenRecordsLock.lock();
+      try {
+        pendingBrokenRecordUploads.add(
+            new PendingBrokenRecordUpload(batch.getFirstOffset(), upload));
+      } finally {
+        brokenRecordsLock.unlock();
+      }
+    }
+
+    /**
+     * Forget the finished uploads of broken records, a failed upload is rethrown and kills the
+     * connector like a failed file upload
+     *
+     * @param waitForAll wait for all pending uploads
+     */
+    private void publishBrokenRecordUploads(final boolean waitForAll) {
+      brokenRecordsLock.lock();
+      try {
+        Iterator<PendingBrokenRecordUpload> iterator = pendingBrokenRecordUploads.iterator();
+        while (iterator.hasNext()) {
+          PendingBrokenRecordUpload upload = iterator.next();
+          if (!waitForAll && !upload.future.isDone()) {
+            continue;
+          }
+          try {
+            upload.future.get();
+          } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw SnowflakeErrors.ERROR_2003.getException(e);
+          } catch (ExecutionException e) {
+            iterator.remove();
+            if (e.getCause() instanceof RuntimeException) {
+              throw (RuntimeException) e.getCause();
+            }
+            throw SnowflakeErrors.ERROR_2003.getException(e);
+          }
+          iterator.remove();
+        }
+      } finally {
+        brokenRecordsLock.unlock();
+      }
+    }
+
+    /**
+     * @return offset of the first broken record which is not on the table stage yet, or
+     *     Long.MAX_VALUE if there is none
+     */
+    private long getFirstPendingBrokenRecordOffset() {
+      publishBrokenRecordUploads(false);
+      brokenRecordsLock.lock();
+      try {
+        long offset = brokenRecords.isEmpty() ? Long.MAX_VALUE : brokenRecords.getFirstOffset();
+        for (PendingBrokenRecordUpload upload : pendingBrokenRecordUploads) {
+          offset = Math.min(offset, upload.firstOffset);
+        }
+        return offset;
+      } finally {
+        brokenRecordsLock.unlock();
       }
     }
 
@@ -796,6 +1431,22 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     }
 
     private long getOffset() {
+      long flushedFilesOffset = getFlushedFilesOffset();
+      if (getFirstPendingBrokenRecordOffset() < flushedFilesOffset) {
+        // good records after a buffered broken one are ingested, write the broken batch now
+        // instead of holding the offset back until its flush time, so that a restart doesn't
+        // consume the good records again
+        flushBrokenRecords(true);
+        publishBrokenRecordUploads(true);
+      }
+      // broken records which are not on the table stage yet are consumed again after a restart
+      return Math.min(flushedFilesOffset, getFirstPendingBrokenRecordOffset());
+    }
+
+    /** @return committed offset after the flushed files are ingested */
+    private long getFlushedFilesOffset() {
+      // files must be on stage before they are ingested and their offsets committed
+      publishFileUploads(true);
       if (fileNames.isEmpty()) {
         return committedOffset.get();
       }
@@ -846,17 +1497,88 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
       if (buff == null || buff.isEmpty()) {
         return;
       }
-      this.previousFlushTimeStamp = System.currentTimeMillis();
+      long currentTime = System.currentTimeMillis();
+      if (adaptiveFlush != null) {
+        adaptiveFlush.onFlush(
+            buff.getBufferSizeBytes(),
+            buff.getNumOfRecords(),
+            currentTime - this.previousFlushTimeStamp);
+      }
+      this.previousFlushTimeStamp = currentTime;
 
-      // If we failed to submit/put, throw an runtime exception that kills the connector.
-      // SnowflakeThreadPoolUtils.flusherThreadPool.submit(
+      // If we failed to put, the exception is rethrown when the upload is published and kills the
+      // connector.
       String fileName = FileNameUtils.fileName(prefix, buff.getFirstOffset(), buff.getLastOffset());
-      String content = buff.getData();
-      conn.putWithCache(stageName, fileName, content);
+      PendingFileUpload upload = new PendingFileUpload(fileName, buff);
+      upload.future = submitFileUpload(upload::upload);
+
+      pendingFileUploadsLock.lock();
+      try {
+        pendingFileUploads.add(upload);
+      } finally {
+        pendingFileUploadsLock.unlock();
+      }
+
+      publishFileUploads(false);
+    }
+
+    /**
+     * Publish finished uploads in offset order: the first unfinished upload stops the publishing,
+     * so that flushedOffset never moves past a file which is not on stage yet.
+     *
+     * @param waitForAll wait for all pending uploads instead of stopping at the first unfinished
+     */
+    private void publishFileUploads(final boolean waitForAll) {
+      pendingFileUploadsLock.lock();
+      try {
+        while (!pendingFileUploads.isEmpty()) {
+          PendingFileUpload upload = pendingFileUploads.peek();
+          if (!waitForAll && !upload.future.isDone()) {
+            return;
+          }
+          try {
+            upload.future.get();
+          } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw SnowflakeErrors.ERROR_2011.getException(e);
+          } catch (ExecutionException e) {
+            // files after a failed one can't be committed, drop them, their offsets are
+            // reprocessed after the task restarts
+            dropFileUploads();
+            if (e.getCause() instanceof RuntimeException) {
+              throw (RuntimeException) e.getCause();
+            }
+            throw SnowflakeErrors.ERROR_2011.getException(e);
+          }
+          pendingFileUploads.poll();
+          onFileUploaded(upload.fileName, upload.buffer);
+        }
+      } finally {
+        pendingFileUploadsLock.unlock();
+      }
+    }
+
+    /** Cancel the pending uploads and release their buffers, the caller holds the lock */
+    private void dropFileUploads() {
+      // cancel all of them first, so that no queued upload starts while waiting for a running one
+      pendingFileUploads.forEach(upload -> upload.future.cancel(false));
+      try {
+        for (PendingFileUpload upload : pendingFileUploads) {
+          upload.release();
+        }
+      } catch (InterruptedException e) {
+        Thread.currentThread().interrupt();
+        throw SnowflakeErrors.ERROR_2011.getException(e);
+      } finally {
+        pendingFileUploads.clear();
+      }
+    }
 
+    private void onFileUploaded(final String fileName, final SnowpipeBuffer buff) {
       // compute metrics which will be exported to JMX for now.
       // TODO: Send it to Telemetry API too
       computeBufferMetrics(buff);
+      buff.release();
 
       // This is safe and atomic
       flushedOffset.updateAndGet((value) -> Math.max(buff.getLastOffset() + 1, value));
@@ -867,7 +1589,7 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
       fileListLock.lock();
       try {
         fileNames.add(fileName);
-        cleanerFileNames.add(fileName);
+        cleanerFiles.add(fileName);
       } finally {
         fileListLock.unlock();
       }
@@ -876,112 +1598,124 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     }
 
     private void checkStatus() {
-      // We are using a temporary list which will reset the cleanerFileNames
-      // After this checkStatus() call, we will have an updated cleanerFileNames which are subset of
-      // existing cleanerFileNames
-      // this time th
-      List<String> tmpFileNames;
+      // We are using a temporary index which will reset the cleanerFiles
+      // After this checkStatus() call, we will have an updated cleanerFiles which is a subset of
+      // existing cleanerFiles
+      PendingFileIndex tmpFiles;
 
       fileListLock.lock();
       try {
-        tmpFileNames = cleanerFileNames;
-        cleanerFileNames = new LinkedList<>();
+        tmpFiles = cleanerFiles;
+        cleanerFiles = new PendingFileIndex();
       } finally {
         fileListLock.unlock();
       }
 
       long currentTime = System.currentTimeMillis();
-      List<String> loadedFiles = new LinkedList<>();
-      List<String> failedFiles = new LinkedList<>();
+      List<PendingFile> loadedFiles = new ArrayList<>();
+      List<PendingFile> failedFiles = new ArrayList<>();
 
-      // ingest report
+      // ingest report, read by the task wide poller
       // This will update the loadedFiles (successfully loaded) &
       // failedFiles: PARTIAL + FAILED
-      // In any cases tmpFileNames will be updated.
-      // If we get all files in ingestReport, tmpFileNames will be empty
+      // In any cases tmpFiles will be updated.
+      // If we get all files in ingestReport, tmpFiles will be empty
       filterResultFromSnowpipeScan(
-          ingestionService.readIngestReport(tmpFileNames), tmpFileNames, loadedFiles, failedFiles);
-
-      // old files
-      List<String> oldFiles = new LinkedList<>();
-
-      // iterate over a copy since failed files get removed from it
-      // Iterate over those files which were not found in ingest report call and are sitting more
-      // than an hour earlier.
-      // Also add those files into oldFiles which are not purged/found in ingestReport since last 10
-      // minutes.
-      new LinkedList<>(tmpFileNames)
-          .forEach(
-              name -> {
-                long time = FileNameUtils.fileNameToTimeIngested(name);
-                if (time < currentTime - ONE_HOUR) {
-                  failedFiles.add(name);
-                  tmpFileNames.remove(name);
-                } else if (time < currentTime - TEN_MINUTES) {
-                  oldFiles.add(name);
-                }
-              });
+          takeIngestReport(tmpFiles.getFileNames()), tmpFiles, loadedFiles, failedFiles);
+
+      // Those files which were not found in ingest report call and are sitting more than an hour
+      // earlier failed.
+      failedFiles.addAll(tmpFiles.removeIngestedBefore(currentTime - ONE_HOUR));
       // load history
-      // Use loadHistoryScan API to scan last one hour of data and if filter files from above
-      // filtered list.
+      // Use loadHistoryScan API to scan last one hour of data when files are not purged/found in
+      // ingestReport since last 10 minutes, and filter files from the remaining ones.
       // This is the last filtering we do and after this, we start purging loadedFiles and moving
       // failedFiles to tableStage
-      if (!oldFiles.isEmpty()) {
+      if (tmpFiles.hasIngestedBefore(currentTime - TEN_MINUTES)) {
         filterResultFromSnowpipeScan(
-            ingestionService.readOneHourHistory(tmpFileNames, currentTime - ONE_HOUR),
-            tmpFileNames,
+            ingestionService.readOneHourHistory(tmpFiles.getFileNames(), currentTime - ONE_HOUR),
+            tmpFiles,
             loadedFiles,
             failedFiles);
       }
-      purge(loadedFiles);
+      List<String> loadedFileNames =
+          loadedFiles.stream().map(PendingFile::getName).collect(Collectors.toList());
+      List<String> failedFileNames =
+          failedFiles.stream().map(PendingFile::getName).collect(Collectors.toList());
+      purge(loadedFileNames);
 
-      moveToTableStage(failedFiles);
+      moveToTableStage(failedFileNames);
+
+      // statuses dispatched meanwhile for files resolved by the load history
+      loadedFileNames.forEach(ingestReport::remove);
+      failedFileNames.forEach(ingestReport::remove);
 
       fileListLock.lock();
       try {
         // Add back all those files which were neither found in ingestReport nor in loadHistoryScan
-        cleanerFileNames.addAll(tmpFileNames);
+        cleanerFiles.addAll(tmpFiles);
       } finally {
         fileListLock.unlock();
       }
 
       // update purged offset in telemetry
       loadedFiles.forEach(
-          name ->
+          file ->
               pipeStatus.setPurgedOffsetAtomically(
-                  value -> Math.max(FileNameUtils.fileNameToEndOffset(name), value)));
+                  value -> Math.max(file.getEndOffset(), value)));
       // update file count in telemetry
       int fileCountRemovedFromStage = loadedFiles.size() + failedFiles.size();
       pipeStatus.addAndGetFileCountOnStage(-fileCountRemovedFromStage);
       pipeStatus.addAndGetFileCountOnIngestion(-fileCountRemovedFromStage);
-      pipeStatus.updateFailedIngestionMetrics(failedFiles.size());
 
       pipeStatus.addAndGetFileCountPurged(loadedFiles.size());
       // update lag information
       loadedFiles.forEach(
-          name ->
-              pipeStatus.updateIngestionLag(
-                  currentTime - FileNameUtils.fileNameToTimeIngested(name)));
+          file -> pipeStatus.updateIngestionLag(currentTime - file.getTimeIngested()));
+    }
+
+    private List<String> getCleanerFileNames() {
+      fileListLock.lock();
+      try {
+        return cleanerFiles.getFileNames();
+      } finally {
+        fileListLock.unlock();
+      }
+    }
+
+    /**
+     * Remove and return the statuses dispatched by the ingest report poller for the given files
+     *
+     * @param files files waiting for their ingestion status
+     * @return file name to status, only for files with a known status
+     */
+    private Map<String, InternalUtils.IngestedFileStatus> takeIngestReport(List<String> files) {
+      Map<String, InternalUtils.IngestedFileStatus> result = new HashMap<>();
+      for (String name : files) {
+        InternalUtils.IngestedFileStatus status = ingestReport.remove(name);
+        if (status != null) {
+          result.put(name, status);
+        }
+      }
+      return result;
     }
 
     // fileStatus Map may include mapping of fileNames with their ingestion status.
     // It can be received either from insertReport API or loadHistoryScan
     private void filterResultFromSnowpipeScan(
         Map<String, InternalUtils.IngestedFileStatus> fileStatus,
-        List<String> allFiles,
-        List<String> loadedFiles,
-        List<String> failedFiles) {
+        PendingFileIndex allFiles,
+        List<PendingFile> loadedFiles,
+        List<PendingFile> failedFiles) {
       fileStatus.forEach(
           (name, status) -> {
             switch (status) {
               case LOADED:
-                loadedFiles.add(name);
-                allFiles.remove(name);
+                loadedFiles.add(removePendingFile(allFiles, name));
                 break;
               case FAILED:
               case PARTIALLY_LOADED:
-                failedFiles.add(name);
-                allFiles.remove(name);
+                failedFiles.add(removePendingFile(allFiles, name));
                 break;
               default:
                 // otherwise, do nothing
@@ -989,6 +1723,11 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
           });
     }
 
+    private PendingFile removePendingFile(final PendingFileIndex files, final String name) {
+      PendingFile file = files.remove(name);
+      return file != null ? file : new PendingFile(name);
+    }
+
     private void purge(List<String> files) {
       if (!files.isEmpty()) {
         LOG_DEBUG_MSG(
@@ -996,7 +1735,7 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
             pipeName,
             files.size(),
             Arrays.toString(files.toArray()));
-        conn.purgeStage(stageName, files);
+        pipeStatus.addAndGetPurgeStatementCount(conn.purgeStage(stageName, files));
       }
     }
 
@@ -1007,7 +1746,8 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
             pipeName,
             failedFiles.size(),
             Arrays.toString(failedFiles.toArray()));
-        conn.moveToTableStage(tableName, stageName, failedFiles);
+        conn.moveToTableStage(
+            tableName, stageName, failedFiles, pipeStatus::updateFailedIngestionMetrics);
       }
     }
 
@@ -1025,6 +1765,21 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     }
 
     private void close() {
+      try {
+        flushBrokenRecords(true);
+        publishBrokenRecordUploads(true);
+      } catch (Exception e) {
+        LOG_WARN_MSG(
+            "pipe {}: failed to write broken records to the table stage:\n{}",
+            pipeName,
+            e.getMessage());
+      }
+      try {
+        publishFileUploads(true);
+      } catch (Exception e) {
+        LOG_WARN_MSG(
+            "pipe {}: failed to finish pending file uploads:\n{}", pipeName, e.getMessage());
+      }
       try {
         stopCleaner();
       } catch (Exception e) {
@@ -1081,6 +1836,8 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
     private void computeBufferMetrics(final SnowpipeBuffer buffer) {
       if (enableCustomJMXMonitoring) {
         partitionBufferSizeBytesHistogram.update(buffer.getBufferSizeBytes());
+        partitionBufferCompressedSizeBytesHistogram.update(
+            buffer.fileBuffer.getCompressedSizeBytes());
         partitionBufferCountHistogram.update(buffer.getNumOfRecords());
       }
     }
@@ -1101,6 +1858,55 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
       return this.metricRegistry;
     }
 
+    /** A batch of broken records handed off to the file upload executor */
+    private class PendingBrokenRecordUpload {
+      private final long firstOffset;
+      private final Future<?> future;
+
+      private PendingBrokenRecordUpload(long firstOffset, Future<?> future) {
+        this.firstOffset = firstOffset;
+        this.future = future;
+      }
+    }
+
+    /** A flushed buffer handed off to the file upload executor */
+    private class PendingFileUpload {
+      private final String fileName;
+      private final SnowpipeBuffer buffer;
+      // set by the upload when it starts, or by release if the upload didn't start yet, so that a
+      // dropped buffer is never released while it is uploaded
+      private final AtomicBoolean started;
+      private final CountDownLatch finished;
+      private Future<?> future;
+
+      private PendingFileUpload(String fileName, SnowpipeBuffer buffer) {
+        this.fileName = fileName;
+        this.buffer = buffer;
+        this.started = new AtomicBoolean(false);
+        this.finished = new CountDownLatch(1);
+      }
+
+      private void upload() {
+        if (!started.compareAndSet(false, true)) {
+          // dropped before it started
+          return;
+        }
+        try {
+          conn.putWithCache(stageName, fileName, buffer.getData());
+        } finally {
+          finished.countDown();
+        }
+      }
+
+      /** Release the buffer of a dropped upload, once the upload is finished if it started */
+      private void release() throws InterruptedException {
+        if (!started.compareAndSet(false, true)) {
+          finished.await();
+        }
+        buffer.release();
+      }
+    }
+
     /**
      * Implementation of Buffer for Snowpipe based implementation of KC.
      *
@@ -1112,12 +1918,12 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
      * when we would generate files in internal stage for snowpipe to ingest later using Snowpipe's
      * REST APIs
      */
-    private class SnowpipeBuffer extends PartitionBuffer<String> {
-      private final StringBuilder stringBuilder;
+    private class SnowpipeBuffer extends PartitionBuffer<GzipFileBuffer> {
+      private final GzipFileBuffer fileBuffer;
 
       private SnowpipeBuffer() {
         super();
-        stringBuilder = new StringBuilder();
+        fileBuffer = new GzipFileBuffer();
       }
 
       @Override
@@ -1127,24 +1933,33 @@ class SnowflakeSinkServiceV1 extends EnableLogging implements SnowflakeSinkServi
           setFirstOffset(record.kafkaOffset());
         }
 
-        stringBuilder.append(data);
+        // the record is encoded once, its size is the actual size in the file
+        long sizeBytes = fileBuffer.append(data);
         setNumOfRecords(getNumOfRecords() + 1);
-        setBufferSizeBytes(getBufferSizeBytes() + data.length() * 2L); // 1 char = 2 bytes
+        setBufferSizeBytes(getBufferSizeBytes() + sizeBytes);
         setLastOffset(record.kafkaOffset());
-        pipeStatus.addAndGetMemoryUsage(data.length() * 2L);
+        pipeStatus.addAndGetMemoryUsage(sizeBytes);
       }
 
-      public String getData() {
-        String result = stringBuilder.toString();
+      public GzipFileBuffer getData() {
+        fileBuffer.finish();
         LOG_DEBUG_MSG(
-            "flush buffer: {} records, {} bytes, offset {} - {}",
+            "flush buffer: {} records, {} bytes, {} bytes in UTF-8, {} bytes compressed, offset {}"
+                + " - {}",
             getNumOfRecords(),
             getBufferSizeBytes(),
+            fileBuffer.getUncompressedSizeBytes(),
+            fileBuffer.getCompressedSizeBytes(),
             getFirstOffset(),
             getLastOffset());
         pipeStatus.addAndGetTotalSizeOfData(getBufferSizeBytes());
         pipeStatus.addAndGetTotalNumberOfRecord(getNumOfRecords());
-        return result;
+        return fileBuffer;
+      }
+
+      /** Free the compressed content once the file is on stage */
+      private void release() {
+        fileBuffer.release();
       }
 
       @Override
@@ -0,0 +1,158 @@
+package com.snowflake.kafka.connector.internal;
+
+import com.google.common.annotations.VisibleForTesting;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ScheduledFuture;
+import java.util.concurrent.TimeUnit;
+import java.util.function.Consumer;
+import java.util.function.Supplier;
+
+/**
+ * Task wide poller of the Snowpipe insertReport API.
+ *
+ * <p>Every pipe has its own insertReport endpoint and begin mark, so requests can't be merged
+ * across pipes. Instead of every cleaner calling the API on its own schedule, the poller runs one
+ * round per period: only pipes with files waiting on stage are polled, the requests are sent
+ * concurrently on a bounded pool, and the LOADED/FAILED statuses are handed back to each pipe.
+ */
+class SnowpipeIngestReportPoller extends EnableLogging {
+  private final Map<String, PipeRegistration> pipes;
+  private final ExecutorService reportExecutor;
+  private ScheduledFuture<?> pollTask;
+
+  /** @param threads maximum number of insertReport requests in flight */
+  SnowpipeIngestReportPoller(int threads) {
+    this.pipes = new ConcurrentHashMap<>();
+    this.reportExecutor = Executors.newFixedThreadPool(threads);
+  }
+
+  /**
+   * Add a pipe to the polling rounds
+   *
+   * @param pipeName pipe name
+   * @param ingestionService ingestion service of the pipe
+   * @param pendingFiles supplies the files of the pipe waiting for their ingestion status
+   * @param listener receives the files found LOADED, FAILED or PARTIALLY_LOADED
+   */
+  void register(
+      String pipeName,
+      SnowflakeIngestionService ingestionService,
+      Supplier<List<String>> pendingFiles,
+      Consumer<Map<String, InternalUtils.IngestedFileStatus>> listener) {
+    pipes.put(pipeName, new PipeRegistration(ingestionService, pendingFiles, listener));
+  }
+
+  void unregister(String pipeName) {
+    pipes.remove(pipeName);
+  }
+
+  /**
+   * Schedule the polling rounds, does nothing if they are already scheduled
+   *
+   * @param scheduler executor running the rounds
+   * @param periodMs delay between two rounds in milliseconds
+   */
+  synchronized void start(ScheduledExecutorService scheduler, long periodMs) {
+    if (pollTask == null) {
+      pollTask =
+          scheduler.scheduleWithFixedDelay(this::poll, periodMs, periodMs, TimeUnit.MILLISECONDS);
+    }
+  }
+
+  synchronized void stop() {
+    if (pollTask != null) {
+      pollTask.cancel(true);
+      pollTask = null;
+    }
+    reportExecutor.shutdownNow();
+  }
+
+  /**
+   * One polling round over all registered pipes. Never throws, failed pipes are polled again.
+   * Pipes whose ingestion service was closed before they were unregistered are skipped.
+   */
+  @VisibleForTesting
+  void poll() {
+    try {
+      Map<String, PipeRegistration> registrations = new HashMap<>(pipes);
+      Map<String, Future<Map<String, InternalUtils.IngestedFileStatus>>> reports = new HashMap<>();
+      registrations.forEach(
+          (pipeName, registration) -> {
+            if (registration.ingestionService.isClosed()) {
+              return;
+            }
+            List<String> files = registration.pendingFiles.get();
+            if (!files.isEmpty()) {
+              reports.put(
+                  pipeName,
+                  reportExecutor.submit(
+                      () -> registration.ingestionService.readIngestReport(files)));
+            }
+          });
+
+      for (Map.Entry<String, Future<Map<String, InternalUtils.IngestedFileStatus>>> report :
+          reports.entrySet()) {
+        try {
+          registrations
+              .get(report.getKey())
+              .listener
+              .accept(filterFinishedFiles(report.getValue().get()));
+        } catch (ExecutionException e) {
+          LOG_WARN_MSG(
+              "Failed to read ingest report of pipe {}:\n{}",
+              report.getKey(),
+              e.getCause().getMessage());
+        }
+      }
+      LOG_DEBUG_MSG(
+          "polled ingest report of {} pipes out of {}", reports.size(), registrations.size());
+    } catch (InterruptedException e) {
+      Thread.currentThread().interrupt();
+      LOG_INFO_MSG("Ingest report poller terminated by an interrupt:\n{}", e.getMessage());
+    } catch (Exception e) {
+      LOG_WARN_MSG(
+          "Ingest report poller encountered an exception {}:\n{}", e.getClass(), e.getMessage());
+    }
+  }
+
+  private static Map<String, InternalUtils.IngestedFileStatus> filterFinishedFiles(
+      Map<String, InternalUtils.IngestedFileStatus> fileStatus) {
+    Map<String, InternalUtils.IngestedFileStatus> result = new HashMap<>();
+    fileStatus.forEach(
+        (name, status) -> {
+          switch (status) {
+            case LOADED:
+            case FAILED:
+            case PARTIALLY_LOADED:
+              result.put(name, status);
+              break;
+            default:
+              // still in progress or not found
+          }
+        });
+    return result;
+  }
+
+  private static class PipeRegistration {
+    private final SnowflakeIngestionService ingestionService;
+    private final Supplier<List<String>> pendingFiles;
+    private final Consumer<Map<String, InternalUtils.IngestedFileStatus>> listener;
+
+    private PipeRegistration(
+        SnowflakeIngestionService ingestionService,
+        Supplier<List<String>> pendingFiles,
+        Consumer<Map<String, InternalUtils.IngestedFileStatus>> listener) {
+      this.ingestionService = ingestionService;
+      this.pendingFiles = pendingFiles;
+      this.listener = listener;
+    }
+  }
+}
@@ -0,0 +1,97 @@
+package com.snowflake.kafka.connector.internal;
+
+import com.google.common.cache.Cache;
+import com.google.common.cache.CacheBuilder;
+import com.google.common.util.concurrent.UncheckedExecutionException;
+import java.util.Arrays;
+import java.util.List;
+import java.util.Optional;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.TimeUnit;
+import java.util.function.Supplier;
+
+/**
+ * Metadata of the tables used by one connection: their columns, and whether a role may evolve
+ * their schema.
+ *
+ * <p>Every partition opened on a table checks it with desc table and show grants, which are the
+ * same for all partitions of the table. Entries expire after a fixed time so that changes made
+ * outside of the connector are eventually seen, and the connection drops the entries of a table
+ * after running DDL on it. Concurrent lookups of the same table run the query once.
+ */
+class TableMetadataCache {
+  private final Cache<String, Optional<List<TableColumn>>> tableColumns;
+  private final Cache<List<String>, Boolean> schemaEvolutionPermissions;
+
+  /** @param ttlMillis time after which an entry is queried again */
+  TableMetadataCache(final long ttlMillis) {
+    this.tableColumns =
+        CacheBuilder.newBuilder().expireAfterWrite(ttlMillis, TimeUnit.MILLISECONDS).build();
+    this.schemaEvolutionPermissions =
+        CacheBuilder.newBuilder().expireAfterWrite(ttlMillis, TimeUnit.MILLISECONDS).build();
+  }
+
+  /**
+   * @param tableName table name
+   * @param describeTable runs desc table, empty if the table doesn't exist
+   * @return columns of the table, empty if the table doesn't exist
+   */
+  Optional<List<TableColumn>> getColumns(
+      final String tableName, final Supplier<Optional<List<TableColumn>>> describeTable) {
+    return get(tableColumns, tableName, describeTable);
+  }
+
+  /**
+   * @param tableName table name
+   * @param role role of the connector
+   * @param checkPermission runs show grants and show tables
+   * @return whether the role may evolve the schema of the table
+   */
+  boolean hasSchemaEvolutionPermission(
+      final String tableName, final String role, final Supplier<Boolean> checkPermission) {
+    return get(schemaEvolutionPermissions, Arrays.asList(tableName, role), checkPermission);
+  }
+
+  /** Drop everything known about the table, called after DDL on it */
+  void invalidate(final String tableName) {
+    tableColumns.invalidate(tableName);
+    schemaEvolutionPermissions.asMap().keySet().removeIf(key -> key.get(0).equals(tableName));
+  }
+
+  private static <K, V> V get(final Cache<K, V> cache, final K key, final Supplier<V> loader) {
+    try {
+      return cache.get(key, loader::get);
+    } catch (ExecutionException | UncheckedExecutionException e) {
+      // failed queries are not cached
+      if (e.getCause() instanceof RuntimeException) {
+        throw (RuntimeException) e.getCause();
+      }
+      throw new IllegalStateException(e.getCause());
+    }
+  }
+
+  /** One row of desc table */
+  static class TableColumn {
+    private final String name;
+    private final String type;
+    private final boolean nullable;
+
+    TableColumn(final String name, final String type, final boolean nullable) {
+      this.name = name;
+      this.type = type;
+      this.nullable = nullable;
+    }
+
+    String getName() {
+      return name;
+    }
+
+    String getType() {
+      return type;
+    }
+
+    boolean isNullable() {
+      return nullable;
+    }
+  }
+}
@@ -76,9 +76,45 @@ public class MetricsUtil {
   // the inmemory buffer size in bytes
   public static final String BUFFER_SIZE_BYTES = "buffer-size-bytes";
 
+  // size of the flushed buffer once gzip compressed, the size of the file on the stage
+  public static final String BUFFER_COMPRESSED_SIZE_BYTES = "buffer-compressed-size-bytes";
+
   // in memory buffer count representing the number of records in kafka
   public static final String BUFFER_RECORD_COUNT = "buffer-record-count";
 
+  // flush time threshold of a buffer tuned from its arrival rate
+  public static final String BUFFER_FLUSH_TIME_THRESHOLD_MS = "flush-time-threshold-ms";
+
+  // flush size threshold of a buffer tuned from its arrival rate
+  public static final String BUFFER_FLUSH_SIZE_THRESHOLD_BYTES = "flush-size-threshold-bytes";
+
+  // Avro converter reader cache related constants
+  public static final String AVRO_READER_CACHE_SUB_DOMAIN = "avro-reader-cache";
+
+  // number of records decoded with a cached reader
+  public static final String AVRO_READER_CACHE_HIT_COUNT = "hit-count";
+
+  // number of readers built because the writer schema was not cached
+  public static final String AVRO_READER_CACHE_MISS_COUNT = "miss-count";
+
+  // number of readers in the cache
+  public static final String AVRO_READER_CACHE_SIZE = "size";
+
+  // Dead letter queue related constants
+  public static final String DLQ_SUB_DOMAIN = "dlq";
+
+  // number of records sent to the dead letter queue
+  public static final String DLQ_REPORTED_COUNT = "reported-count";
+
+  // number of records which could not be delivered to the dead letter queue
+  public static final String DLQ_FAILED_COUNT = "failed-count";
+
+  // number of records sent to the dead letter queue and not acknowledged yet
+  public static final String DLQ_IN_FLIGHT_COUNT = "in-flight-count";
+
+  // number of times a report waited because too many records were in flight
+  public static final String DLQ_BACKPRESSURE_WAIT_COUNT = "backpressure-wait-count";
+
   // Event Latency related constants
 
   public static final String LATENCY_SUB_DOMAIN = "latencies";
@@ -19,9 +19,16 @@ import com.snowflake.kafka.connector.internal.SnowflakeConnectionService;
 import com.snowflake.kafka.connector.internal.SnowflakeErrors;
 import com.snowflake.kafka.connector.internal.SnowflakeKafkaConnectorException;
 import com.snowflake.kafka.connector.records.RecordService;
+import java.util.ArrayList;
+import java.util.Collection;
 import java.util.HashMap;
+import java.util.Iterator;
+import java.util.LinkedHashSet;
 import java.util.List;
 import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ConcurrentMap;
 import javax.annotation.Nonnull;
 import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.JsonNode;
 import org.apache.kafka.connect.data.Field;
@@ -36,6 +43,9 @@ public class SchematizationUtils {
 
   private static final Logger LOGGER = LoggerFactory.getLogger(SchematizationUtils.class);
 
+  // One lock per table, so that partitions of a table evolve its schema one at a time
+  private static final ConcurrentMap<String, Object> TABLE_LOCKS = new ConcurrentHashMap<>();
+
   /**
    * Transform the objectName to uppercase unless it is enclosed in double quotes
    *
@@ -66,6 +76,74 @@ public class SchematizationUtils {
       List<String> nonNullableColumns,
       List<String> extraColNames,
       SinkRecord record) {
+    evolveSchemaIfNeeded(
+        conn,
+        tableName,
+        nonNullableColumns,
+        extraColNames == null ? null : getColumnTypes(record, extraColNames));
+  }
+
+  /**
+   * Batch version of {@link #evolveSchemaIfNeeded(SnowflakeConnectionService, String, List, List,
+   * SinkRecord)}: the columns reported by all the rows of a buffer are evolved together, with at
+   * most one ALTER TABLE updating the nullability and one adding the columns.
+   *
+   * <p>Channels of the same table evolve it one at a time. Columns the table already has, or which
+   * are already nullable, are skipped, so concurrent partitions receiving the same new schema don't
+   * repeat the DDL. The columns come from the desc table cached by the connection, which drops it
+   * after every DDL on the table, so a column is only skipped once the table really has it.
+   *
+   * @param conn connection to the Snowflake
+   * @param tableName table name
+   * @param nonNullableColumns columns that needs to update the nullability, from all rows
+   * @param extraColNames columns that needs to be added, from all rows
+   * @param records the sink records of the rows, used to find the types of the extra columns
+   */
+  public static void evolveSchemaIfNeeded(
+      @Nonnull SnowflakeConnectionService conn,
+      String tableName,
+      Collection<String> nonNullableColumns,
+      Collection<String> extraColNames,
+      List<SinkRecord> records) {
+    // the types come from the records, they are collected before taking the table lock
+    Map<String, String> extraColumnsToType =
+        extraColNames.isEmpty() ? new HashMap<>() : getColumnTypes(records, extraColNames);
+    synchronized (getTableLock(tableName)) {
+      Map<String, Boolean> columnNullability = conn.getColumnNullability(tableName);
+      List<String> newNonNullableColumns = new ArrayList<>();
+      for (String columnName : nonNullableColumns) {
+        if (!columnNullability.getOrDefault(formatName(columnName), false)) {
+          newNonNullableColumns.add(columnName);
+        }
+      }
+      Map<String, String> newExtraColumnsToType = new HashMap<>();
+      for (Map.Entry<String, String> column : extraColumnsToType.entrySet()) {
+        if (!columnNullability.containsKey(formatName(column.getKey()))) {
+          newExtraColumnsToType.put(column.getKey(), column.getValue());
+        }
+      }
+
+      evolveSchemaIfNeeded(
+          conn,
+          tableName,
+          newNonNullableColumns.isEmpty() ? null : newNonNullableColumns,
+          newExtraColumnsToType.isEmpty() ? null : newExtraColumnsToType);
+    }
+  }
+
+  /**
+   * @param tableName table name
+   * @return the lock of the table, held while its schema is checked and evolved
+   */
+  private static Object getTableLock(String tableName) {
+    return TABLE_LOCKS.computeIfAbsent(tableName, name -> new Object());
+  }
+
+  private static void evolveSchemaIfNeeded(
+      SnowflakeConnectionService conn,
+      String tableName,
+      List<String> nonNullableColumns,
+      Map<String, String> extraColumnsToType) {
     // Update nullability if needed, ignore any exceptions since other task might be succeeded
     if (nonNullableColumns != null) {
       try {
@@ -82,8 +160,7 @@ public class SchematizationUtils {
     }
 
     // Add columns if needed, ignore any exceptions since other task might be succeeded
-    if (extraColNames != null) {
-      Map<String, String> extraColumnsToType = getColumnTypes(record, extraColNames);
+    if (extraColumnsToType != null) {
       try {
         conn.appendColumnsToTable(tableName, extraColumnsToType);
       } catch (SnowflakeKafkaConnectorException e) {
@@ -98,6 +175,50 @@ public class SchematizationUtils {
     }
   }
 
+  /**
+   * Collect the data types of the columns from all the records. The type of a column comes from
+   * the first record having it in its schema, or a non null value for records without schema.
+   *
+   * @param records the sink records that contain the schema and actual data
+   * @param columnNames the names of the extra columns
+   * @return a Map object where the key is column name and value is Snowflake data type
+   */
+  static Map<String, String> getColumnTypes(
+      List<SinkRecord> records, Collection<String> columnNames) {
+    Map<String, String> columnToType = new HashMap<>();
+    Set<String> remainingColumns = new LinkedHashSet<>(columnNames);
+    for (SinkRecord record : records) {
+      if (remainingColumns.isEmpty()) {
+        break;
+      }
+      Map<String, String> schemaMap = getSchemaMapFromRecord(record);
+      JsonNode recordNode =
+          schemaMap.isEmpty()
+              ? RecordService.convertToJson(record.valueSchema(), record.value())
+              : null;
+      Iterator<String> iterator = remainingColumns.iterator();
+      while (iterator.hasNext()) {
+        String columnName = iterator.next();
+        String type;
+        if (recordNode == null) {
+          type = schemaMap.get(columnName);
+        } else {
+          JsonNode value = recordNode.get(columnName);
+          type = value == null || value.isNull() ? null : inferDataTypeFromJsonObject(value);
+        }
+        if (type != null) {
+          columnToType.put(columnName, type);
+          iterator.remove();
+        }
+      }
+    }
+    if (!remainingColumns.isEmpty() && !records.isEmpty()) {
+      // only null values or unknown to the schemas, typed from the first record
+      columnToType.putAll(getColumnTypes(records.get(0), new ArrayList<>(remainingColumns)));
+    }
+    return columnToType;
+  }
+
   /**
    * With the list of columns, collect their data types from either the schema or the data itself
    *
@@ -9,19 +9,26 @@ import com.google.common.annotations.VisibleForTesting;
 import com.snowflake.kafka.connector.SnowflakeSinkConnectorConfig;
 import com.snowflake.kafka.connector.Utils;
 import com.snowflake.kafka.connector.dlq.KafkaRecordErrorReporter;
+import com.snowflake.kafka.connector.internal.BufferMemoryBudget;
 import com.snowflake.kafka.connector.internal.LoggerHandler;
+import com.snowflake.kafka.connector.internal.PartitionWorkerPool;
 import com.snowflake.kafka.connector.internal.SnowflakeConnectionService;
 import com.snowflake.kafka.connector.internal.SnowflakeErrors;
 import com.snowflake.kafka.connector.internal.SnowflakeSinkService;
 import com.snowflake.kafka.connector.internal.telemetry.SnowflakeTelemetryService;
 import com.snowflake.kafka.connector.records.RecordService;
 import com.snowflake.kafka.connector.records.SnowflakeMetadataConfig;
+import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.Collection;
 import java.util.HashMap;
+import java.util.LinkedHashSet;
+import java.util.List;
 import java.util.Map;
 import java.util.Optional;
 import java.util.Properties;
+import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
 import net.snowflake.ingest.streaming.SnowflakeStreamingIngestClient;
 import net.snowflake.ingest.streaming.SnowflakeStreamingIngestClientFactory;
 import net.snowflake.ingest.utils.SFException;
@@ -106,9 +113,25 @@ public class SnowflakeSinkServiceV2 implements SnowflakeSinkService {
    * Key is formulated in {@link #partitionChannelKey(String, int)} }
    *
    * <p>value is the Streaming Ingest Channel implementation (Wrapped around TopicPartitionChannel)
+   *
+   * <p>Partition workers reopen closed channels concurrently, hence the concurrent map
    */
   private final Map<String, TopicPartitionChannel> partitionsToChannel;
 
+  // Set in config (number of partitions of a batch processed in parallel)
+  private PartitionWorkerPool partitionWorkers =
+      new PartitionWorkerPool(SnowflakeSinkConnectorConfig.PARTITION_WORKER_THREADS_DEFAULT);
+
+  // refreshes the offset tokens of the channels read by preCommit, started with the first channel
+  private final StreamingOffsetTokenPoller offsetTokenPoller;
+
+  // Set in config (number of partitions opened in parallel after a rebalance)
+  private int partitionOpenThreads = SnowflakeSinkConnectorConfig.PARTITION_OPEN_THREADS_DEFAULT;
+
+  // Set in config (maximum bytes buffered by all the channels of the task)
+  private BufferMemoryBudget memoryBudget =
+      new BufferMemoryBudget(SnowflakeSinkConnectorConfig.BUFFER_MEMORY_LIMIT_BYTES_DEFAULT);
+
   public SnowflakeSinkServiceV2(
       SnowflakeConnectionService conn, Map<String, String> connectorConfig) {
     if (conn == null || conn.isClosed()) {
@@ -136,7 +159,8 @@ public class SnowflakeSinkServiceV2 implements SnowflakeSinkService {
     this.streamingIngestClientName =
         STREAMING_CLIENT_PREFIX_NAME + conn.getConnectorName() + "_" + taskId;
     initStreamingClient();
-    this.partitionsToChannel = new HashMap<>();
+    this.partitionsToChannel = new ConcurrentHashMap<>();
+    this.offsetTokenPoller = new StreamingOffsetTokenPoller(partitionsToChannel::values);
   }
 
   /**
@@ -157,6 +181,64 @@ public class SnowflakeSinkServiceV2 implements SnowflakeSinkService {
     createStreamingChannelForTopicPartition(tableName, topicPartition);
   }
 
+  /**
+   * Opens the channels of the assigned partitions in two phases run in parallel. The tables are
+   * checked or created first, once per table, then the channels of the partitions whose table is
+   * ready are opened. Partitions not opened before the timeout are opened on their first record.
+   *
+   * @param partitionTables destination table name of each partition
+   * @param timeoutMillis time after which no more tables or channels are opened
+   */
+  @Override
+  public void startPartitions(Map<TopicPartition, String> partitionTables, long timeoutMillis) {
+    final long startTime = System.currentTimeMillis();
+    final long deadline = startTime + timeoutMillis;
+    PartitionWorkerPool openWorkers = new PartitionWorkerPool(partitionOpenThreads);
+    try {
+      Set<String> readyTables = ConcurrentHashMap.newKeySet();
+      List<Runnable> tableUnits = new ArrayList<>();
+      for (String tableName : new LinkedHashSet<>(partitionTables.values())) {
+        tableUnits.add(
+            () -> {
+              // the table should be present before opening a channel
+              createTableIfNotExists(tableName);
+              readyTables.add(tableName);
+            });
+      }
+      openWorkers.runAllUntil(tableUnits, deadline);
+      final long tablesTime = System.currentTimeMillis();
+      LOGGER.info(
+          "Checked {} of {} tables in {} ms",
+          readyTables.size(),
+          tableUnits.size(),
+          tablesTime - startTime);
+
+      List<Runnable> channelUnits = new ArrayList<>(partitionTables.size());
+      partitionTables.forEach(
+          (topicPartition, tableName) -> {
+            if (readyTables.contains(tableName)) {
+              channelUnits.add(
+                  () -> createStreamingChannelForTopicPartition(tableName, topicPartition));
+            }
+          });
+      int skippedChannels = openWorkers.runAllUntil(channelUnits, deadline);
+      int openedChannels = channelUnits.size() - skippedChannels;
+      LOGGER.info(
+          "Opened {} of {} channels in {} ms",
+          openedChannels,
+          partitionTables.size(),
+          System.currentTimeMillis() - tablesTime);
+      if (openedChannels < partitionTables.size()) {
+        LOGGER.warn(
+            "{} partitions were not opened within {} ms, they are opened on their first record",
+            partitionTables.size() - openedChannels,
+            timeoutMillis);
+      }
+    } finally {
+      openWorkers.stop();
+    }
+  }
+
   /**
    * Always opens a new channel and creates a new instance of TopicPartitionChannel.
    *
@@ -180,6 +262,7 @@ public class SnowflakeSinkServiceV2 implements SnowflakeSinkService {
             this.kafkaRecordErrorReporter,
             this.sinkTaskContext,
             this.conn));
+    offsetTokenPoller.start(StreamingUtils.DURATION_BETWEEN_OFFSET_TOKEN_POLLS);
   }
 
   /**
@@ -195,21 +278,58 @@ public class SnowflakeSinkServiceV2 implements SnowflakeSinkService {
   @Override
   public void insert(Collection<SinkRecord> records) {
     // note that records can be empty but, we will still need to check for time based flush
-    for (SinkRecord record : records) {
-      // check if need to handle null value records
-      if (recordService.shouldSkipNullValue(record, behaviorOnNullValues)) {
-        continue;
-      }
-      // While inserting into buffer, we will check for count threshold and buffered bytes
-      // threshold.
-      insert(record);
-    }
+    List<Runnable> units = new ArrayList<>();
+    PartitionWorkerPool.groupByPartition(records)
+        .forEach(
+            (topicPartition, partitionBatch) ->
+                units.add(
+                    () -> {
+                      for (SinkRecord record : partitionBatch) {
+                        // check if need to handle null value records
+                        if (recordService.shouldSkipNullValue(record, behaviorOnNullValues)) {
+                          continue;
+                        }
+                        // While inserting into buffer, we will check for count threshold and
+                        // buffered bytes threshold.
+                        insert(record);
+                      }
+                    }));
+    partitionWorkers.runAll(units);
 
     // check all partitions to see if they need to be flushed based on time
+    List<Runnable> timeBasedFlushes = new ArrayList<>(partitionsToChannel.size());
     for (TopicPartitionChannel partitionChannel : partitionsToChannel.values()) {
       // Time based flushing
-      partitionChannel.insertBufferedRecordsIfFlushTimeThresholdReached();
+      timeBasedFlushes.add(partitionChannel::insertBufferedRecordsIfFlushTimeThresholdReached);
+    }
+    partitionWorkers.runAll(timeBasedFlushes);
+
+    enforceMemoryBudget();
+  }
+
+  /**
+   * Insert the rows of the largest buffers when the channels of the task buffer more than the
+   * memory limit. The buffers are inserted concurrently, like the time based flushes.
+   */
+  private void enforceMemoryBudget() {
+    if (!memoryBudget.isEnabled()) {
+      return;
     }
+    Map<String, Long> bufferedBytes = new HashMap<>(partitionsToChannel.size());
+    partitionsToChannel.forEach(
+        (channelKey, channel) -> bufferedBytes.put(channelKey, channel.getBufferSizeBytes()));
+    List<Runnable> flushes = new ArrayList<>();
+    // insertRows is synchronous, nothing stays in flight once the flushes are done
+    memoryBudget.enforce(
+        bufferedBytes,
+        0,
+        channelKey -> flushes.add(partitionsToChannel.get(channelKey)::flushBuffer));
+    partitionWorkers.runAll(flushes);
+  }
+
+  @Override
+  public boolean isOverMemoryBudget() {
+    return memoryBudget.isOverBudget();
   }
 
   /**
@@ -270,6 +390,8 @@ public class SnowflakeSinkServiceV2 implements SnowflakeSinkService {
           topicPartitionChannel.closeChannel();
         });
     partitionsToChannel.clear();
+    offsetTokenPoller.stop();
+    partitionWorkers.stop();
     closeStreamingClient();
   }
 
@@ -348,6 +470,41 @@ public class SnowflakeSinkServiceV2 implements SnowflakeSinkService {
     }
   }
 
+  @Override
+  public void setPartitionWorkerThreads(int threads) {
+    if (threads < 1) {
+      LOGGER.error(
+          "number of partition worker threads is {}, it is less than 1, reset to 1", threads);
+    } else {
+      LOGGER.info("set number of partition worker threads to {}", threads);
+    }
+    partitionWorkers.stop();
+    partitionWorkers = new PartitionWorkerPool(threads);
+  }
+
+  @Override
+  public void setPartitionOpenThreads(int threads) {
+    if (threads < 1) {
+      LOGGER.error(
+          "number of partition open threads is {}, it is less than 1, reset to 1", threads);
+      partitionOpenThreads = 1;
+    } else {
+      LOGGER.info("set number of partition open threads to {}", threads);
+      partitionOpenThreads = threads;
+    }
+  }
+
+  @Override
+  public void setBufferMemoryLimit(long bytes) {
+    if (bytes < 0) {
+      LOGGER.error("buffer memory limit is {}, it is less than 0, reset to 0", bytes);
+      memoryBudget = new BufferMemoryBudget(0);
+    } else {
+      LOGGER.info("set buffer memory limit to {} bytes", bytes);
+      memoryBudget = new BufferMemoryBudget(bytes);
+    }
+  }
+
   @Override
   public void setTopic2TableMap(Map<String, String> topicToTableMap) {
     this.topicToTableMap = topicToTableMap;
@@ -0,0 +1,69 @@
+package com.snowflake.kafka.connector.internal.streaming;
+
+import com.snowflake.kafka.connector.internal.LoggerHandler;
+import java.time.Duration;
+import java.util.Collection;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.TimeUnit;
+import java.util.function.Supplier;
+
+/**
+ * Task wide poller fetching the committed offset token of every open channel in the background,
+ * so that preCommit reads the last polled offset token instead of calling Snowflake for each
+ * partition.
+ *
+ * <p>The ingest SDK used here has no call returning the offset tokens of several channels, so the
+ * channels are polled one after the other on a single thread. A round starts once the previous
+ * one is done.
+ */
+class StreamingOffsetTokenPoller {
+  private static final LoggerHandler LOGGER =
+      new LoggerHandler(StreamingOffsetTokenPoller.class.getName());
+
+  private final Supplier<Collection<TopicPartitionChannel>> channels;
+
+  private ScheduledExecutorService executor;
+
+  /** @param channels open channels of the task, read again on every round */
+  StreamingOffsetTokenPoller(final Supplier<Collection<TopicPartitionChannel>> channels) {
+    this.channels = channels;
+  }
+
+  /**
+   * Start polling, does nothing if already started
+   *
+   * @param delay delay between the end of a round and the start of the next one
+   */
+  synchronized void start(final Duration delay) {
+    if (executor != null) {
+      return;
+    }
+    executor = Executors.newSingleThreadScheduledExecutor();
+    executor.scheduleWithFixedDelay(
+        this::poll, delay.toMillis(), delay.toMillis(), TimeUnit.MILLISECONDS);
+    LOGGER.info("offset token poller started, delay:{} ms", delay.toMillis());
+  }
+
+  /** One round, exceptions are not rethrown since that would cancel the next rounds */
+  void poll() {
+    for (TopicPartitionChannel channel : channels.get()) {
+      try {
+        if (!channel.isChannelClosed()) {
+          channel.pollOffsetToken();
+        }
+      } catch (Exception e) {
+        LOGGER.warn("offset token poll failed, message:{}", e.getMessage());
+      }
+    }
+  }
+
+  /** Stop polling, a round in progress is interrupted */
+  synchronized void stop() {
+    if (executor != null) {
+      executor.shutdownNow();
+      executor = null;
+      LOGGER.info("offset token poller terminated");
+    }
+  }
+}
@@ -36,6 +36,9 @@ public class StreamingUtils {
 
   protected static final int MAX_GET_OFFSET_TOKEN_RETRIES = 3;
 
+  // Delay between two rounds of the background offset token poller
+  protected static final Duration DURATION_BETWEEN_OFFSET_TOKEN_POLLS = Duration.ofSeconds(5);
+
   // Buffer related defaults and minimum set at connector level by clients/customers.
   public static final long STREAMING_BUFFER_FLUSH_TIME_MINIMUM_SEC =
       Duration.ofSeconds(1).getSeconds();
@@ -28,11 +28,16 @@ import dev.failsafe.function.CheckedSupplier;
 import java.io.ByteArrayOutputStream;
 import java.io.ObjectOutputStream;
 import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashSet;
+import java.util.LinkedHashSet;
 import java.util.List;
 import java.util.Map;
+import java.util.Set;
 import java.util.concurrent.ExecutionException;
 import java.util.concurrent.atomic.AtomicBoolean;
 import java.util.concurrent.atomic.AtomicLong;
+import java.util.concurrent.atomic.AtomicReference;
 import java.util.concurrent.locks.Lock;
 import java.util.concurrent.locks.ReentrantLock;
 import net.snowflake.client.jdbc.internal.fasterxml.jackson.core.JsonProcessingException;
@@ -69,8 +74,11 @@ public class TopicPartitionChannel {
 
   private static final long NO_OFFSET_TOKEN_REGISTERED_IN_SNOWFLAKE = -1L;
 
-  // last time we invoked insertRows API
-  private long previousFlushTimeStampMs;
+  // last time we invoked insertRows API, written and read by the partition workers
+  private volatile long previousFlushTimeStampMs;
+
+  // First offset rejected because of the table schema by the last buffer which evolved the table
+  private long lastSchemaEvolutionOffset = NO_OFFSET_TOKEN_REGISTERED_IN_SNOWFLAKE;
 
   /* Buffer to hold JSON converted incoming SinkRecords */
   private StreamingBuffer streamingBuffer;
@@ -95,9 +103,14 @@ public class TopicPartitionChannel {
   private AtomicLong offsetPersistedInSnowflake =
       new AtomicLong(NO_OFFSET_TOKEN_REGISTERED_IN_SNOWFLAKE);
 
+  // Latest offset token fetched by the background poller, read by preCommit. Null until the first
+  // poll and after a failed poll, preCommit then fetches the offset token itself
+  private final AtomicReference<Long> polledOffsetToken = new AtomicReference<>();
+
   // used to communicate to the streaming ingest's insertRows API
   // This is non final because we might decide to get the new instance of Channel
-  private SnowflakeStreamingIngestChannel channel;
+  // Volatile since the offset token poller reads it from its own thread
+  private volatile SnowflakeStreamingIngestChannel channel;
 
   /**
    * Offsets are reset in kafka when one of following cases arises in which we rely on source of
@@ -476,20 +489,36 @@ public class TopicPartitionChannel {
           System.currentTimeMillis(),
           this.previousFlushTimeStampMs,
           this.streamingBufferThreshold.getFlushTimeThresholdSeconds());
-      StreamingBuffer copiedStreamingBuffer;
-      bufferLock.lock();
-      try {
-        copiedStreamingBuffer = this.streamingBuffer;
-        this.streamingBuffer = new StreamingBuffer();
-      } finally {
-        bufferLock.unlock();
-      }
-      if (copiedStreamingBuffer != null) {
-        insertBufferedRecords(copiedStreamingBuffer);
-      }
+      flushBuffer();
+    }
+  }
+
+  /**
+   * Insert the buffered rows regardless of the thresholds, e.g. when the buffers of the task hold
+   * too much memory.
+   *
+   * <p>Note: We acquire buffer lock since we copy the buffer.
+   */
+  protected void flushBuffer() {
+    StreamingBuffer copiedStreamingBuffer;
+    bufferLock.lock();
+    try {
+      copiedStreamingBuffer = this.streamingBuffer;
+      this.streamingBuffer = new StreamingBuffer();
+    } finally {
+      bufferLock.unlock();
+    }
+    if (copiedStreamingBuffer != null) {
+      insertBufferedRecords(copiedStreamingBuffer);
     }
   }
 
+  /** @return bytes of the records buffered and not inserted yet */
+  protected long getBufferSizeBytes() {
+    // Just checking buffer size, no atomic operation required
+    return this.streamingBuffer.getBufferSizeBytes();
+  }
+
   /**
    * Invokes insertRows API using the provided offsets which were initially buffered for this
    * partition. This buffer is decided based on the flush time threshold, buffered bytes or number
@@ -502,6 +531,11 @@ public class TopicPartitionChannel {
       this.previousFlushTimeStampMs = System.currentTimeMillis();
       return null;
     }
+    // The offset token of the buffer covers its records sent to the DLQ, they must be delivered
+    // before the token can be committed
+    if (streamingBufferToInsert.hasReportedRecords()) {
+      this.kafkaRecordErrorReporter.flush();
+    }
     InsertRowsResponse response = null;
     try {
       response = insertRowsWithFallback(streamingBufferToInsert);
@@ -513,16 +547,14 @@ public class TopicPartitionChannel {
           this.getChannelName(),
           streamingBufferToInsert,
           response.hasErrors());
+      // Check whether we need to reset the offset due to schema evolution
+      if (response.needToResetOffset()) {
+        response = resetOffsetAfterSchemaEvolution(streamingBufferToInsert, response);
+      }
       if (response.hasErrors()) {
         handleInsertRowsFailures(
             response.getInsertErrors(), streamingBufferToInsert.getSinkRecords());
       }
-
-      // Check whether we need to reset the offset due to schema evolution
-      if (response.needToResetOffset()) {
-        streamingApiFallbackSupplier(
-            StreamingApiFallbackInvoker.INSERT_ROWS_SCHEMA_EVOLUTION_FALLBACK);
-      }
       return response;
     } catch (TopicPartitionChannelInsertionException ex) {
       // Suppressing the exception because other channels might still continue to ingest
@@ -617,61 +649,96 @@ public class TopicPartitionChannel {
           this.insertRowsStreamingBuffer.getData();
       List<Map<String, Object>> records = recordsAndOffsets.getKey();
       List<Long> offsets = recordsAndOffsets.getValue();
-      InsertValidationResponse finalResponse = new InsertValidationResponse();
-      boolean needToResetOffset = false;
+      InsertValidationResponse response =
+          this.channel.insertRows(
+              records, Long.toString(this.insertRowsStreamingBuffer.getLastOffset()));
       if (!enableSchemaEvolution) {
-        finalResponse =
-            this.channel.insertRows(
-                records, Long.toString(this.insertRowsStreamingBuffer.getLastOffset()));
-      } else {
-        for (int idx = 0; idx < records.size(); idx++) {
-          // For schema evolution, we need to call the insertRows API row by row in order to
-          // preserve the original order, for anything after the first schema mismatch error we will
-          // retry after the evolution
-          InsertValidationResponse response =
-              this.channel.insertRow(records.get(idx), Long.toString(offsets.get(idx)));
-          if (response.hasErrors()) {
-            InsertValidationResponse.InsertError insertError = response.getInsertErrors().get(0);
-            List<String> extraColNames = insertError.getExtraColNames();
-            List<String> nonNullableColumns = insertError.getMissingNotNullColNames();
-            long originalSinkRecordIdx =
-                offsets.get(idx) - this.insertRowsStreamingBuffer.getFirstOffset();
-            if (extraColNames == null && nonNullableColumns == null) {
-              InsertValidationResponse.InsertError newInsertError =
-                  new InsertValidationResponse.InsertError(
-                      insertError.getRowContent(), originalSinkRecordIdx);
-              newInsertError.setException(insertError.getException());
-              newInsertError.setExtraColNames(insertError.getExtraColNames());
-              newInsertError.setMissingNotNullColNames(insertError.getMissingNotNullColNames());
-              // Simply added to the final response if it's not schema related errors
-              finalResponse.addError(insertError);
-            } else {
-              SchematizationUtils.evolveSchemaIfNeeded(
-                  this.conn,
-                  this.channel.getTableName(),
-                  nonNullableColumns,
-                  extraColNames,
-                  this.insertRowsStreamingBuffer.getSinkRecord(originalSinkRecordIdx));
-              // Offset reset needed since it's possible that we successfully ingested partial batch
-              needToResetOffset = true;
-              break;
-            }
-          }
+        return new InsertRowsResponse(response);
+      }
+
+      // For schema evolution, the whole buffer is inserted at once. The table is evolved once for
+      // the columns of all the rows rejected because of extra or missing non nullable columns.
+      // These rows are not inserted again here, the channel has already accepted the rows after
+      // them, check resetOffsetAfterSchemaEvolution
+      InsertValidationResponse finalResponse = new InsertValidationResponse();
+      List<InsertValidationResponse.InsertError> schemaEvolutionErrors = new ArrayList<>();
+      for (InsertValidationResponse.InsertError insertError : response.getInsertErrors()) {
+        InsertValidationResponse.InsertError originalInsertError =
+            withRowIndex(
+                insertError,
+                offsets.get((int) insertError.getRowIndex())
+                    - this.insertRowsStreamingBuffer.getFirstOffset());
+        if (insertError.getExtraColNames() == null
+            && insertError.getMissingNotNullColNames() == null) {
+          // Simply added to the final response if it's not schema related errors
+          finalResponse.addError(originalInsertError);
+        } else {
+          schemaEvolutionErrors.add(originalInsertError);
         }
       }
-      return new InsertRowsResponse(finalResponse, needToResetOffset);
+      if (!schemaEvolutionErrors.isEmpty()) {
+        evolveSchema(schemaEvolutionErrors);
+      }
+      return new InsertRowsResponse(finalResponse, schemaEvolutionErrors);
     }
+
+    /**
+     * Evolve the table once for the schema errors of an insertRows call, for the union of the
+     * columns reported by all rows
+     *
+     * @param schemaEvolutionErrors schema errors whose row index points to the record in the buffer
+     */
+    private void evolveSchema(List<InsertValidationResponse.InsertError> schemaEvolutionErrors) {
+      Set<String> nonNullableColumns = new LinkedHashSet<>();
+      Set<String> extraColNames = new LinkedHashSet<>();
+      List<SinkRecord> schemaErrorRecords = new ArrayList<>();
+      for (InsertValidationResponse.InsertError insertError : schemaEvolutionErrors) {
+        if (insertError.getMissingNotNullColNames() != null) {
+          nonNullableColumns.addAll(insertError.getMissingNotNullColNames());
+        }
+        if (insertError.getExtraColNames() != null) {
+          extraColNames.addAll(insertError.getExtraColNames());
+          schemaErrorRecords.add(
+              this.insertRowsStreamingBuffer.getSinkRecord(insertError.getRowIndex()));
+        }
+      }
+      SchematizationUtils.evolveSchemaIfNeeded(
+          this.conn,
+          this.channel.getTableName(),
+          nonNullableColumns,
+          extraColNames,
+          schemaErrorRecords);
+    }
+  }
+
+  /** Copy of the error with another row index */
+  private static InsertValidationResponse.InsertError withRowIndex(
+      InsertValidationResponse.InsertError insertError, long rowIndex) {
+    InsertValidationResponse.InsertError newInsertError =
+        new InsertValidationResponse.InsertError(insertError.getRowContent(), rowIndex);
+    newInsertError.setException(insertError.getException());
+    newInsertError.setExtraColNames(insertError.getExtraColNames());
+    newInsertError.setMissingNotNullColNames(insertError.getMissingNotNullColNames());
+    return newInsertError;
   }
 
   // A class that wraps around the InsertValidationResponse from the Ingest SDK plus some additional
   // information
   static class InsertRowsResponse {
     private final InsertValidationResponse response;
-    private final boolean needToResetOffset;
 
-    InsertRowsResponse(InsertValidationResponse response, boolean needToResetOffset) {
+    // Rows rejected because of the table schema, the table was evolved for them
+    private final List<InsertValidationResponse.InsertError> schemaEvolutionErrors;
+
+    InsertRowsResponse(InsertValidationResponse response) {
+      this(response, Collections.emptyList());
+    }
+
+    InsertRowsResponse(
+        InsertValidationResponse response,
+        List<InsertValidationResponse.InsertError> schemaEvolutionErrors) {
       this.response = response;
-      this.needToResetOffset = needToResetOffset;
+      this.schemaEvolutionErrors = schemaEvolutionErrors;
     }
 
     boolean hasErrors() {
@@ -682,9 +749,106 @@ public class TopicPartitionChannel {
       return response.getInsertErrors();
     }
 
+    List<InsertValidationResponse.InsertError> getSchemaEvolutionErrors() {
+      return this.schemaEvolutionErrors;
+    }
+
     boolean needToResetOffset() {
-      return this.needToResetOffset;
+      return !this.schemaEvolutionErrors.isEmpty();
+    }
+  }
+
+  /**
+   * Reopens the channel after the table was evolved for the rows of the buffer rejected because of
+   * its schema, and resets the offset in kafka so that the partition is sent again from the first
+   * failing row, in order. The reopen drops the rows accepted after it with the offset token of
+   * the buffer.
+   *
+   * <p>The reopen also drops the rows before the first failing one which are not committed yet.
+   * They are inserted again from the buffer, with the offset token of the row before the first
+   * failing one. If some of them are not in the buffer anymore, the offset is reset to the offset
+   * committed in Snowflake instead.
+   *
+   * <p>Rows rejected again from the same offset don't fit the evolved table, they are reported like
+   * the other insert errors instead of replaying the partition forever.
+   *
+   * @param insertedBuffer buffer which was inserted
+   * @param response response of the insertRows call, with its schema evolution errors
+   * @return response holding the errors of the rows which are not sent again by Kafka
+   */
+  private InsertRowsResponse resetOffsetAfterSchemaEvolution(
+      final StreamingBuffer insertedBuffer, final InsertRowsResponse response) {
+    final long firstOffset = insertedBuffer.getFirstOffset();
+    final long firstFailingOffset =
+        firstOffset + response.getSchemaEvolutionErrors().get(0).getRowIndex();
+    if (firstFailingOffset == this.lastSchemaEvolutionOffset) {
+      LOGGER.warn(
+          "Rows from offset:{} still don't match the schema of table:{} after schema evolution,"
+              + " reporting them for channel:{}",
+          firstFailingOffset,
+          this.tableName,
+          this.getChannelName());
+      this.lastSchemaEvolutionOffset = NO_OFFSET_TOKEN_REGISTERED_IN_SNOWFLAKE;
+      InsertValidationResponse insertErrors = new InsertValidationResponse();
+      response.getInsertErrors().forEach(insertErrors::addError);
+      response.getSchemaEvolutionErrors().forEach(insertErrors::addError);
+      return new InsertRowsResponse(insertErrors);
+    }
+    this.lastSchemaEvolutionOffset = firstFailingOffset;
+    final long offsetRecoveredFromSnowflake =
+        getRecoveredOffsetFromSnowflake(
+            StreamingApiFallbackInvoker.INSERT_ROWS_SCHEMA_EVOLUTION_FALLBACK);
+    final long offsetToResume =
+        offsetRecoveredFromSnowflake + 1 >= firstOffset
+            ? Math.max(firstFailingOffset, offsetRecoveredFromSnowflake + 1)
+            : offsetRecoveredFromSnowflake + 1;
+
+    // Rows from the resumed offset are sent again by Kafka, rows inserted again from the buffer
+    // get their errors from the new insertRows call
+    InsertValidationResponse insertErrors = new InsertValidationResponse();
+    for (InsertValidationResponse.InsertError insertError : response.getInsertErrors()) {
+      if (firstOffset + insertError.getRowIndex() <= offsetRecoveredFromSnowflake) {
+        insertErrors.addError(insertError);
+      }
+    }
+
+    // Either the rows before the first failing one which are not committed, in order, or, as a
+    // last resort if the buffer was committed before the channel was reopened, the rows rejected
+    // because of the schema, out of order since Kafka doesn't send them again
+    Set<Long> schemaErrorOffsets = new HashSet<>();
+    for (InsertValidationResponse.InsertError insertError : response.getSchemaEvolutionErrors()) {
+      schemaErrorOffsets.add(firstOffset + insertError.getRowIndex());
     }
+    Pair<List<Map<String, Object>>, List<Long>> recordsAndOffsets = insertedBuffer.getData();
+    List<Map<String, Object>> rowsToInsert = new ArrayList<>();
+    List<Long> rowIndexesToInsert = new ArrayList<>();
+    for (int idx = 0; idx < recordsAndOffsets.getValue().size(); idx++) {
+      long offset = recordsAndOffsets.getValue().get(idx);
+      if (offset <= offsetRecoveredFromSnowflake
+          ? schemaErrorOffsets.contains(offset)
+          : offset < offsetToResume) {
+        rowsToInsert.add(recordsAndOffsets.getKey().get(idx));
+        rowIndexesToInsert.add(offset - firstOffset);
+      }
+    }
+    if (!rowsToInsert.isEmpty()) {
+      LOGGER.warn(
+          "Inserting again {} rows of channel:{} dropped by the reopen, offset recovered from"
+              + " Snowflake:{}, first failing offset:{}",
+          rowsToInsert.size(),
+          this.getChannelName(),
+          offsetRecoveredFromSnowflake,
+          firstFailingOffset);
+      InsertValidationResponse retryResponse =
+          this.channel.insertRows(rowsToInsert, Long.toString(offsetToResume - 1));
+      for (InsertValidationResponse.InsertError insertError : retryResponse.getInsertErrors()) {
+        insertErrors.addError(
+            withRowIndex(insertError, rowIndexesToInsert.get((int) insertError.getRowIndex())));
+      }
+    }
+    resetChannelMetadataAfterRecovery(
+        StreamingApiFallbackInvoker.INSERT_ROWS_SCHEMA_EVOLUTION_FALLBACK, offsetToResume - 1);
+    return new InsertRowsResponse(insertErrors);
   }
 
   /**
@@ -738,6 +902,8 @@ public class TopicPartitionChannel {
               insertedRecordsToBuffer.get(rowIndexToOriginalSinkRecord),
               insertError.getException());
         }
+        // insertRows already took the offset token covering these records
+        this.kafkaRecordErrorReporter.flush();
       }
     } else {
       throw new DataException(
@@ -745,11 +911,43 @@ public class TopicPartitionChannel {
     }
   }
 
-  // TODO: SNOW-529755 POLL committed offsets in backgraound thread
+  /**
+   * Fetch the committed offset token once, without retry nor fallback. Called periodically by
+   * {@link StreamingOffsetTokenPoller} so that preCommit doesn't call Snowflake.
+   *
+   * <p>The offset persisted in Snowflake only moves forward, unless offsets were reset in Kafka,
+   * in which case the reset owns it until the expected offset arrives.
+   *
+   * <p>A failure clears the polled offset token, and the next preCommit fetches it with retries and
+   * reopens the channel if needed, on the task thread.
+   */
+  void pollOffsetToken() {
+    try {
+      final long offsetToken = fetchLatestCommittedOffsetFromSnowflake();
+      this.polledOffsetToken.set(offsetToken);
+      if (offsetToken != NO_OFFSET_TOKEN_REGISTERED_IN_SNOWFLAKE) {
+        this.bufferLock.lock();
+        try {
+          if (!this.isOffsetResetInKafka.get()) {
+            this.offsetPersistedInSnowflake.accumulateAndGet(offsetToken, Math::max);
+          }
+        } finally {
+          this.bufferLock.unlock();
+        }
+      }
+    } catch (SFException | ConnectException e) {
+      this.polledOffsetToken.set(null);
+      LOGGER.warn(
+          "Failed to poll offsetToken for channel:{}, message:{}",
+          this.getChannelName(),
+          e.getMessage());
+    }
+  }
 
   /**
-   * Get committed offset from Snowflake. It does an HTTP call internally to find out what was the
-   * last offset inserted.
+   * Get committed offset from Snowflake. The offset token polled in the background is used when
+   * there is one, otherwise it does an HTTP call internally to find out what was the last offset
+   * inserted.
    *
    * <p>If committedOffset fetched from Snowflake is null, we would return -1(default value of
    * committedOffset) back to original call. (-1) would return an empty Map of partition and offset
@@ -768,7 +966,9 @@ public class TopicPartitionChannel {
    * @return (offsetToken present in Snowflake + 1), else -1
    */
   public long getOffsetSafeToCommitToKafka() {
-    final long committedOffsetInSnowflake = fetchOffsetTokenWithRetry();
+    final Long polledOffsetToken = this.polledOffsetToken.get();
+    final long committedOffsetInSnowflake =
+        polledOffsetToken == null ? fetchOffsetTokenWithRetry() : polledOffsetToken;
     if (committedOffsetInSnowflake == NO_OFFSET_TOKEN_REGISTERED_IN_SNOWFLAKE) {
       return offsetSafeToCommitToKafka.get();
     } else {
@@ -899,7 +1099,10 @@ public class TopicPartitionChannel {
           this.getChannelName());
       this.streamingBuffer = new StreamingBuffer();
       // Reset Offset in kafka for this topic partition.
-      this.sinkTaskContext.offset(this.topicPartition, offsetToResetInKafka);
+      // partitions may be processed by parallel workers, the task context is not thread safe
+      synchronized (this.sinkTaskContext) {
+        this.sinkTaskContext.offset(this.topicPartition, offsetToResetInKafka);
+      }
 
       // Need to update the in memory processed offset otherwise if same offset is send again, it
       // might get rejected.
@@ -1095,61 +1298,94 @@ public class TopicPartitionChannel {
    *
    * <p>This is an approximate size since there is no API available to find out size of record.
    *
-   * <p>We first serialize the incoming kafka record into a Json format and find estimate size.
+   * <p>We estimate the size from the row which was built out of the incoming kafka record, the
+   * same row is later passed to insertRows API. Column names and values are counted with their
+   * size in UTF-8, the encoding in which they are sent, without encoding them.
    *
    * <p>Please note, the size we calculate here is not accurate and doesnt match with actual size of
    * Kafka record which we buffer in memory. (Kafka Sink Record has lot of other metadata
    * information which is discarded when we calculate the size of Json Record)
    *
-   * <p>We also do the same processing just before calling insertRows API for the buffered rows.
-   *
    * <p>Downside of this calculation is we might try to buffer more records but we could be close to
    * JVM memory getting full
    *
-   * @param kafkaSinkRecord sink record received as is from Kafka (With connector specific converter
-   *     being invoked)
-   * @return Approximate long size of record in bytes. 0 if record is broken
+   * @param tableRow row built from the kafka record, null if the record is broken or could not be
+   *     converted
+   * @return Approximate long size of record in bytes. 0 if there is no row
    */
-  protected long getApproxSizeOfRecordInBytes(SinkRecord kafkaSinkRecord) {
-    long sinkRecordBufferSizeInBytes = 0l;
-
-    SinkRecord snowflakeRecord = getSnowflakeSinkRecordFromKafkaRecord(kafkaSinkRecord);
-
-    if (isRecordBroken(snowflakeRecord)) {
+  protected long getApproxSizeOfRecordInBytes(Map<String, Object> tableRow) {
+    if (tableRow == null) {
       // we won't be able to find accurate size of serialized record since serialization itself
-      // failed
-      // But this will not happen in streaming ingest since we deprecated custom converters.
+      // failed, and the record is not buffered as a row
       return 0L;
     }
 
-    try {
-      // get the row that we want to insert into Snowflake.
-      Map<String, Object> tableRow =
-          recordService.getProcessedRecordForStreamingIngest(snowflakeRecord);
-      // need to loop through the map and get the object node
-      for (Map.Entry<String, Object> entry : tableRow.entrySet()) {
-        sinkRecordBufferSizeInBytes += entry.getKey().length() * 2L;
-        // Can Typecast into string because value is JSON
-        Object value = entry.getValue();
-        if (value != null) {
-          if (value instanceof String) {
-            sinkRecordBufferSizeInBytes += ((String) value).length() * 2L; // 1 char = 2 bytes
-          } else {
-            // for now it could only be a list of string
-            for (String s : (List<String>) value) {
-              sinkRecordBufferSizeInBytes += s.length() * 2L;
-            }
+    long sinkRecordBufferSizeInBytes = 0l;
+    // need to loop through the map and get the object node
+    for (Map.Entry<String, Object> entry : tableRow.entrySet()) {
+      sinkRecordBufferSizeInBytes += Utils.utf8Length(entry.getKey());
+      // Can Typecast into string because value is JSON
+      Object value = entry.getValue();
+      if (value != null) {
+        if (value instanceof String) {
+          sinkRecordBufferSizeInBytes += Utils.utf8Length((String) value);
+        } else {
+          // for now it could only be a list of string
+          for (String s : (List<String>) value) {
+            sinkRecordBufferSizeInBytes += Utils.utf8Length(s);
           }
         }
       }
-    } catch (JsonProcessingException e) {
-      // We ignore any errors here because this is just calculating the record size
     }
 
     sinkRecordBufferSizeInBytes += StreamingUtils.MAX_RECORD_OVERHEAD_BYTES;
     return sinkRecordBufferSizeInBytes;
   }
 
+  /**
+   * Transform a kafka record into the row inserted into Snowflake. Broken records and records
+   * failing the conversion are sent to the DLQ.
+   *
+   * @param kafkaSinkRecord sink record received as is from Kafka (With connector specific converter
+   *     being invoked)
+   * @return the row whose keys are column names and values are corresponding data in that column,
+   *     null if the record can't be inserted
+   */
+  private Map<String, Object> getTableRowFromKafkaRecord(SinkRecord kafkaSinkRecord) {
+    SinkRecord snowflakeRecord = getSnowflakeSinkRecordFromKafkaRecord(kafkaSinkRecord);
+
+    // broken record
+    if (isRecordBroken(snowflakeRecord)) {
+      // check for error tolerance and log tolerance values
+      // errors.log.enable and errors.tolerance
+      LOGGER.debug(
+          "Broken record offset:{}, topic:{}",
+          kafkaSinkRecord.kafkaOffset(),
+          kafkaSinkRecord.topic());
+      kafkaRecordErrorReporter.reportError(kafkaSinkRecord, new DataException("Broken Record"));
+      return null;
+    }
+
+    // lag telemetry, note that sink record timestamp might be null
+    if (snowflakeRecord.timestamp() != null
+        && snowflakeRecord.timestampType() != NO_TIMESTAMP_TYPE) {
+      // TODO:SNOW-529751 telemetry
+    }
+
+    // Convert this records into Json Schema which has content and metadata, add it to DLQ if
+    // there is an exception
+    try {
+      return recordService.getProcessedRecordForStreamingIngest(snowflakeRecord);
+    } catch (JsonProcessingException e) {
+      LOGGER.warn(
+          "Record has JsonProcessingException offset:{}, topic:{}",
+          kafkaSinkRecord.kafkaOffset(),
+          kafkaSinkRecord.topic());
+      kafkaRecordErrorReporter.reportError(kafkaSinkRecord, e);
+      return null;
+    }
+  }
+
   // ------ INNER CLASS ------ //
 
   /**
@@ -1160,8 +1396,8 @@ public class TopicPartitionChannel {
    * records from Kafka and once threshold has reached, we would call insertRows API to insert into
    * Snowflake.
    *
-   * <p>We would transform kafka records to Snowflake understood records (In JSON format) just
-   * before calling insertRows API.
+   * <p>We transform kafka records to Snowflake understood records (In JSON format) once, when they
+   * are inserted into the buffer, and keep the rows until insertRows API is called.
    */
   @VisibleForTesting
   protected class StreamingBuffer
@@ -1169,9 +1405,18 @@ public class TopicPartitionChannel {
     // Records coming from Kafka
     private final List<SinkRecord> sinkRecords;
 
+    // Rows built from the records which are not broken, and their offsets
+    private final List<Map<String, Object>> rows;
+    private final List<Long> rowOffsets;
+
+    // Whether a record of the buffer was sent to the DLQ instead of being inserted
+    private boolean hasReportedRecords;
+
     StreamingBuffer() {
       super();
       sinkRecords = new ArrayList<>();
+      rows = new ArrayList<>();
+      rowOffsets = new ArrayList<>();
     }
 
     @Override
@@ -1184,7 +1429,15 @@ public class TopicPartitionChannel {
       setNumOfRecords(getNumOfRecords() + 1);
       setLastOffset(kafkaSinkRecord.kafkaOffset());
 
-      final long currentKafkaRecordSizeInBytes = getApproxSizeOfRecordInBytes(kafkaSinkRecord);
+      final Map<String, Object> tableRow = getTableRowFromKafkaRecord(kafkaSinkRecord);
+      if (tableRow != null) {
+        rows.add(tableRow);
+        rowOffsets.add(kafkaSinkRecord.kafkaOffset());
+      } else {
+        hasReportedRecords = true;
+      }
+
+      final long currentKafkaRecordSizeInBytes = getApproxSizeOfRecordInBytes(tableRow);
       // update size of buffer
       setBufferSizeBytes(getBufferSizeBytes() + currentKafkaRecordSizeInBytes);
     }
@@ -1193,57 +1446,20 @@ public class TopicPartitionChannel {
      * Get all rows and their offsets. Each map corresponds to one row whose keys are column names
      * and values are corresponding data in that column.
      *
-     * <p>This goes over through all buffered kafka records and transforms into JsonSchema and
-     * JsonNode Check {@link #handleNativeRecord(SinkRecord, boolean)}
+     * <p>Rows were built when the kafka records were inserted, broken records are not part of them.
+     * Check {@link #handleNativeRecord(SinkRecord, boolean)}
      *
      * @return A pair that contains the records and their corresponding offsets
      */
     @Override
     public Pair<List<Map<String, Object>>, List<Long>> getData() {
-      final List<Map<String, Object>> records = new ArrayList<>();
-      final List<Long> offsets = new ArrayList<>();
-      for (SinkRecord kafkaSinkRecord : sinkRecords) {
-        SinkRecord snowflakeRecord = getSnowflakeSinkRecordFromKafkaRecord(kafkaSinkRecord);
-
-        // broken record
-        if (isRecordBroken(snowflakeRecord)) {
-          // check for error tolerance and log tolerance values
-          // errors.log.enable and errors.tolerance
-          LOGGER.debug(
-              "Broken record offset:{}, topic:{}",
-              kafkaSinkRecord.kafkaOffset(),
-              kafkaSinkRecord.topic());
-          kafkaRecordErrorReporter.reportError(kafkaSinkRecord, new DataException("Broken Record"));
-        } else {
-          // lag telemetry, note that sink record timestamp might be null
-          if (snowflakeRecord.timestamp() != null
-              && snowflakeRecord.timestampType() != NO_TIMESTAMP_TYPE) {
-            // TODO:SNOW-529751 telemetry
-          }
-
-          // Convert this records into Json Schema which has content and metadata, add it to DLQ if
-          // there is an exception
-          try {
-            Map<String, Object> tableRow =
-                recordService.getProcessedRecordForStreamingIngest(snowflakeRecord);
-            records.add(tableRow);
-            offsets.add(snowflakeRecord.kafkaOffset());
-          } catch (JsonProcessingException e) {
-            LOGGER.warn(
-                "Record has JsonProcessingException offset:{}, topic:{}",
-                kafkaSinkRecord.kafkaOffset(),
-                kafkaSinkRecord.topic());
-            kafkaRecordErrorReporter.reportError(kafkaSinkRecord, e);
-          }
-        }
-      }
       LOGGER.debug(
           "Get rows for streaming ingest. {} records, {} bytes, offset {} - {}",
           getNumOfRecords(),
           getBufferSizeBytes(),
           getFirstOffset(),
           getLastOffset());
-      return new Pair<>(records, offsets);
+      return new Pair<>(rows, rowOffsets);
     }
 
     @Override
@@ -1251,6 +1467,11 @@ public class TopicPartitionChannel {
       return sinkRecords;
     }
 
+    /** @return true if a record of the buffer was sent to the DLQ */
+    public boolean hasReportedRecords() {
+      return hasReportedRecords;
+    }
+
     public SinkRecord getSinkRecord(long idx) {
       return sinkRecords.get((int) idx);
     }
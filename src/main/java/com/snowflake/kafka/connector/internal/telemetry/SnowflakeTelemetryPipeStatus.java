@@ -13,6 +13,7 @@ import static com.snowflake.kafka.connector.internal.telemetry.TelemetryConstant
 import static com.snowflake.kafka.connector.internal.telemetry.TelemetryConstants.FILE_COUNT_TABLE_STAGE_INGEST_FAIL;
 import static com.snowflake.kafka.connector.internal.telemetry.TelemetryConstants.MEMORY_USAGE;
 import static com.snowflake.kafka.connector.internal.telemetry.TelemetryConstants.PIPE_NAME;
+import static com.snowflake.kafka.connector.internal.telemetry.TelemetryConstants.PURGE_STATEMENT_COUNT;
 import static com.snowflake.kafka.connector.internal.telemetry.TelemetryConstants.RECORD_NUMBER;
 import static com.snowflake.kafka.connector.internal.telemetry.TelemetryConstants.STAGE_NAME;
 import static com.snowflake.kafka.connector.internal.telemetry.TelemetryConstants.START_TIME;
@@ -77,6 +78,9 @@ public class SnowflakeTelemetryPipeStatus extends SnowflakeTelemetryBasicInfo {
   // Cleaner restart count
   AtomicLong cleanerRestartCount; // how many times the cleaner restarted
 
+  // Purge statement count
+  private final AtomicLong purgeStatementCount; // statements executed to purge loaded files
+
   // Memory usage
   AtomicLong memoryUsage; // buffer size of the pipe in Bytes
 
@@ -135,6 +139,7 @@ public class SnowflakeTelemetryPipeStatus extends SnowflakeTelemetryBasicInfo {
     this.fileCountTableStageIngestFail = new AtomicLong(0);
     this.fileCountTableStageBrokenRecord = new AtomicLong(0);
     this.cleanerRestartCount = new AtomicLong(0);
+    this.purgeStatementCount = new AtomicLong(0);
     this.memoryUsage = new AtomicLong(0);
 
     this.averageKafkaLagMs = new AtomicLong(0);
@@ -251,6 +256,7 @@ public class SnowflakeTelemetryPipeStatus extends SnowflakeTelemetryBasicInfo {
         && this.fileCountTableStageIngestFail.get() == 0
         && this.fileCountTableStageBrokenRecord.get() == 0
         && this.cleanerRestartCount.get() == 0
+        && this.purgeStatementCount.get() == 0
         && this.memoryUsage.get() == 0
         && this.averageKafkaLagMs.get() == 0
         && this.averageKafkaLagRecordCount.get() == 0
@@ -278,6 +284,7 @@ public class SnowflakeTelemetryPipeStatus extends SnowflakeTelemetryBasicInfo {
     msg.put(FILE_COUNT_TABLE_STAGE_INGEST_FAIL, fileCountTableStageIngestFail.get());
     msg.put(FILE_COUNT_TABLE_STAGE_BROKEN_RECORD, fileCountTableStageBrokenRecord.get());
     msg.put(CLEANER_RESTART_COUNT, cleanerRestartCount.get());
+    msg.put(PURGE_STATEMENT_COUNT, purgeStatementCount.get());
     msg.put(MEMORY_USAGE, memoryUsage.get());
 
     lagLock.lock();
@@ -417,6 +424,10 @@ public class SnowflakeTelemetryPipeStatus extends SnowflakeTelemetryBasicInfo {
     this.fileCountPurged.addAndGet(fileCountPurged);
   }
 
+  public void addAndGetPurgeStatementCount(long purgeStatementCount) {
+    this.purgeStatementCount.addAndGet(purgeStatementCount);
+  }
+
   public long incrementAndGetCleanerRestartCount() {
     return this.cleanerRestartCount.incrementAndGet();
   }
@@ -27,6 +27,8 @@ public final class TelemetryConstants {
 
   public static final String CLEANER_RESTART_COUNT = "cleaner_restart_count";
 
+  public static final String PURGE_STATEMENT_COUNT = "purge_statement_count";
+
   public static final String MEMORY_USAGE = "memory_usage";
 
   public static final String AVERAGE_KAFKA_LAG_MS = "average_kafka_lag";
@@ -0,0 +1,133 @@
+package com.snowflake.kafka.connector.records;
+
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.AVRO_READER_CACHE_HIT_COUNT;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.AVRO_READER_CACHE_MISS_COUNT;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.AVRO_READER_CACHE_SIZE;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.AVRO_READER_CACHE_SUB_DOMAIN;
+import static com.snowflake.kafka.connector.internal.metrics.MetricsUtil.JMX_METRIC_PREFIX;
+
+import com.codahale.metrics.Gauge;
+import com.codahale.metrics.MetricRegistry;
+import com.codahale.metrics.jmx.JmxReporter;
+import com.google.common.annotations.VisibleForTesting;
+import com.google.common.cache.Cache;
+import com.google.common.cache.CacheBuilder;
+import com.snowflake.kafka.connector.internal.LoggerHandler;
+import com.snowflake.kafka.connector.internal.SnowflakeErrors;
+import javax.management.MalformedObjectNameException;
+import javax.management.ObjectName;
+import org.apache.avro.Conversions;
+import org.apache.avro.Schema;
+import org.apache.avro.generic.GenericData;
+import org.apache.avro.generic.GenericDatumReader;
+import org.apache.avro.generic.GenericRecord;
+import org.apache.avro.io.DatumReader;
+
+/**
+ * Bounded LRU cache of the Avro readers used by one converter, keyed by writer schema id.
+ *
+ * <p>Building a GenericDatumReader resolves the writer schema against the reader schema, which
+ * costs much more than decoding one record. The reader schema is fixed for a converter, so the
+ * writer schema id is enough to find a ready to use reader. Readers are thread safe and can be
+ * shared.
+ *
+ * <p>Hit and miss counts are exposed through JMX after {@link #registerJmxMetrics(String)}
+ */
+class AvroDatumReaderCache {
+  private static final LoggerHandler LOGGER =
+      new LoggerHandler(AvroDatumReaderCache.class.getName());
+
+  private final Schema readerSchema;
+  private final GenericData genericData;
+  private final Cache<Integer, DatumReader<GenericRecord>> readers;
+
+  private JmxReporter jmxReporter;
+
+  /**
+   * @param readerSchema reader schema of the converter, null to read with the writer schema
+   * @param maxSize maximum number of readers kept in the cache
+   */
+  AvroDatumReaderCache(final Schema readerSchema, final long maxSize) {
+    this.readerSchema = readerSchema;
+    this.genericData = new GenericData();
+    // Conversion for logical type Decimal. There are conversions for other logical types as well.
+    this.genericData.addLogicalTypeConversion(new Conversions.DecimalConversion());
+    this.readers = CacheBuilder.newBuilder().maximumSize(maxSize).recordStats().build();
+  }
+
+  /**
+   * Get the reader of the given writer schema, create and cache it if missing
+   *
+   * @param writerSchemaId id of the writer schema in schema registry
+   * @param writerSchema avro schema with which data got serialized
+   * @return reader from the writer schema to the reader schema
+   */
+  DatumReader<GenericRecord> getReader(final int writerSchemaId, final Schema writerSchema) {
+    DatumReader<GenericRecord> reader = readers.getIfPresent(writerSchemaId);
+    if (reader == null) {
+      reader =
+          new GenericDatumReader<>(
+              writerSchema, readerSchema == null ? writerSchema : readerSchema, genericData);
+      readers.put(writerSchemaId, reader);
+    }
+    return reader;
+  }
+
+  @VisibleForTesting
+  long getHitCount() {
+    return readers.stats().hitCount();
+  }
+
+  @VisibleForTesting
+  long getMissCount() {
+    return readers.stats().missCount();
+  }
+
+  /**
+   * Expose the cache metrics as MBeans, does nothing if they are already exposed
+   *
+   * @param converterName name identifying the converter in the MBean object names
+   */
+  synchronized void registerJmxMetrics(final String converterName) {
+    if (jmxReporter != null) {
+      return;
+    }
+    MetricRegistry metricRegistry = new MetricRegistry();
+    metricRegistry.register(AVRO_READER_CACHE_HIT_COUNT, (Gauge<Long>) this::getHitCount);
+    metricRegistry.register(AVRO_READER_CACHE_MISS_COUNT, (Gauge<Long>) this::getMissCount);
+    metricRegistry.register(AVRO_READER_CACHE_SIZE, (Gauge<Long>) readers::size);
+    jmxReporter =
+        JmxReporter.forRegistry(metricRegistry)
+            .inDomain(JMX_METRIC_PREFIX)
+            .createsObjectNamesWith(
+                (ignoreMeterType, jmxDomain, metricName) ->
+                    getObjectName(jmxDomain, converterName, metricName))
+            .build();
+    jmxReporter.start();
+  }
+
+  /** Remove the MBeans registered by {@link #registerJmxMetrics(String)} */
+  synchronized void unregisterJmxMetrics() {
+    if (jmxReporter != null) {
+      jmxReporter.stop();
+      jmxReporter = null;
+    }
+  }
+
+  private static ObjectName getObjectName(
+      final String jmxDomain, final String converterName, final String metricName) {
+    try {
+      return new ObjectName(
+          jmxDomain
+              + ":converter="
+              + converterName
+              + ",category="
+              + AVRO_READER_CACHE_SUB_DOMAIN
+              + ",name="
+              + metricName);
+    } catch (MalformedObjectNameException e) {
+      LOGGER.warn("Could not create Object name for MetricName:{}", metricName);
+      throw SnowflakeErrors.ERROR_5020.getException();
+    }
+  }
+}
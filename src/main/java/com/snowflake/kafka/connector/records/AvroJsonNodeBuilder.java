@@ -0,0 +1,123 @@
+package com.snowflake.kafka.connector.records;
+
+import java.io.IOException;
+import java.math.BigDecimal;
+import java.nio.ByteBuffer;
+import java.nio.charset.StandardCharsets;
+import java.util.Collection;
+import java.util.Map;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.JsonNode;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.ObjectMapper;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.node.ArrayNode;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.node.JsonNodeFactory;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.node.ObjectNode;
+import org.apache.avro.Schema;
+import org.apache.avro.generic.GenericData;
+import org.apache.avro.generic.GenericEnumSymbol;
+import org.apache.avro.generic.GenericFixed;
+import org.apache.avro.generic.IndexedRecord;
+
+/**
+ * Build the JsonNode of an Avro datum by walking it once, instead of printing it with {@link
+ * GenericData#toString(Object)} and parsing the text again.
+ *
+ * <p>The result is the same tree as the text round trip:
+ *
+ * <ul>
+ *   <li>record fields follow the record schema order
+ *   <li>bytes are decoded as ISO-8859-1, one character per byte, without going through the JSON
+ *       escaping of the text
+ *   <li>fixed values are arrays of signed bytes
+ *   <li>decimals keep their text representation, e.g. 90.0000 is a double and 90 an integer
+ *   <li>timestamps and other logical types without a conversion stay plain numbers
+ *   <li>NaN and infinite floating point numbers are strings
+ * </ul>
+ */
+final class AvroJsonNodeBuilder {
+  private static final JsonNodeFactory NODE_FACTORY = JsonNodeFactory.instance;
+
+  private final ObjectMapper mapper;
+
+  /** @param mapper parses the datums which have no direct JsonNode equivalent */
+  AvroJsonNodeBuilder(final ObjectMapper mapper) {
+    this.mapper = mapper;
+  }
+
+  /**
+   * @param datum Avro datum, usually a GenericRecord
+   * @return JsonNode of the datum
+   */
+  JsonNode toJsonNode(final Object datum) throws IOException {
+    if (datum == null) {
+      return NODE_FACTORY.nullNode();
+    }
+    if (datum instanceof IndexedRecord) {
+      IndexedRecord record = (IndexedRecord) datum;
+      ObjectNode node = NODE_FACTORY.objectNode();
+      for (Schema.Field field : record.getSchema().getFields()) {
+        node.set(field.name(), toJsonNode(record.get(field.pos())));
+      }
+      return node;
+    }
+    if (datum instanceof Collection) {
+      ArrayNode node = NODE_FACTORY.arrayNode();
+      for (Object element : (Collection<?>) datum) {
+        node.add(toJsonNode(element));
+      }
+      return node;
+    }
+    if (datum instanceof Map) {
+      ObjectNode node = NODE_FACTORY.objectNode();
+      for (Map.Entry<?, ?> entry : ((Map<?, ?>) datum).entrySet()) {
+        node.set(entry.getKey().toString(), toJsonNode(entry.getValue()));
+      }
+      return node;
+    }
+    if (datum instanceof CharSequence || datum instanceof GenericEnumSymbol) {
+      return NODE_FACTORY.textNode(datum.toString());
+    }
+    if (datum instanceof ByteBuffer) {
+      return NODE_FACTORY.textNode(
+          StandardCharsets.ISO_8859_1.decode(((ByteBuffer) datum).duplicate()).toString());
+    }
+    if (datum instanceof GenericFixed) {
+      ArrayNode node = NODE_FACTORY.arrayNode();
+      for (byte b : ((GenericFixed) datum).bytes()) {
+        node.add((int) b);
+      }
+      return node;
+    }
+    if (datum instanceof Integer) {
+      return NODE_FACTORY.numberNode((Integer) datum);
+    }
+    if (datum instanceof Long) {
+      long value = (Long) datum;
+      // the parser returns an int node when the value fits
+      return value == (int) value
+          ? NODE_FACTORY.numberNode((int) value)
+          : NODE_FACTORY.numberNode(value);
+    }
+    if (datum instanceof Boolean) {
+      return NODE_FACTORY.booleanNode((Boolean) datum);
+    }
+    if (datum instanceof Float) {
+      float value = (Float) datum;
+      if (Float.isNaN(value) || Float.isInfinite(value)) {
+        return NODE_FACTORY.textNode(datum.toString());
+      }
+      // the text of a float is parsed as a double, 1.1f stays 1.1
+      return NODE_FACTORY.numberNode(Double.parseDouble(datum.toString()));
+    }
+    if (datum instanceof Double) {
+      double value = (Double) datum;
+      if (Double.isNaN(value) || Double.isInfinite(value)) {
+        return NODE_FACTORY.textNode(datum.toString());
+      }
+      return NODE_FACTORY.numberNode(value);
+    }
+    if (datum instanceof BigDecimal) {
+      return mapper.readTree(datum.toString());
+    }
+    return mapper.readTree(GenericData.get().toString(datum));
+  }
+}
@@ -193,6 +193,15 @@ public class RecordService extends EnableLogging {
   public String getProcessedRecordForSnowpipe(SinkRecord record) {
     SnowflakeTableRow row = processRecord(record);
     StringBuilder buffer = new StringBuilder();
+    String rawContent = row.content.getRawContent();
+    if (rawContent != null) {
+      // raw passthrough, splice the json text as received into the envelope
+      buffer.append("{\"").append(CONTENT).append("\":").append(rawContent);
+      if (metadataConfig.allFlag) {
+        buffer.append(",\"").append(META).append("\":").append(row.metadata.toString());
+      }
+      return buffer.append('}').toString();
+    }
     for (JsonNode node : row.content.getData()) {
       ObjectNode data = MAPPER.createObjectNode();
       data.set(CONTENT, node);
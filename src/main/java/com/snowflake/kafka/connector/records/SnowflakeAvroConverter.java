@@ -19,20 +19,16 @@ package com.snowflake.kafka.connector.records;
 import com.snowflake.kafka.connector.internal.SnowflakeErrors;
 import io.confluent.kafka.schemaregistry.client.CachedSchemaRegistryClient;
 import io.confluent.kafka.schemaregistry.client.SchemaRegistryClient;
-import java.io.ByteArrayInputStream;
 import java.io.IOException;
-import java.io.InputStream;
 import java.nio.ByteBuffer;
 import java.util.Map;
+import java.util.concurrent.atomic.AtomicInteger;
 import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.JsonNode;
-import org.apache.avro.Conversions;
 import org.apache.avro.Schema;
 import org.apache.avro.SchemaParseException;
-import org.apache.avro.generic.GenericData;
-import org.apache.avro.generic.GenericDatumReader;
 import org.apache.avro.generic.GenericRecord;
+import org.apache.avro.io.BinaryDecoder;
 import org.apache.avro.io.DatumReader;
-import org.apache.avro.io.Decoder;
 import org.apache.avro.io.DecoderFactory;
 import org.apache.kafka.connect.data.SchemaAndValue;
 
@@ -41,6 +37,12 @@ public class SnowflakeAvroConverter extends SnowflakeConverter {
 
   public static final String BREAK_ON_SCHEMA_REGISTRY_ERROR = "break.on.schema.registry.error";
   public static final String READER_SCHEMA = "reader.schema";
+  public static final String READER_CACHE_SIZE = "reader.cache.size";
+  public static final long READER_CACHE_SIZE_DEFAULT = 100;
+  public static final String JMX_OPT = "jmx";
+
+  // tells apart the MBeans of the converters living in the same worker
+  private static final AtomicInteger CONVERTER_COUNT = new AtomicInteger(0);
 
   // By default, we don't break when schema registry is not found
   private boolean breakOnSchemaRegistryError = false;
@@ -48,10 +50,21 @@ public class SnowflakeAvroConverter extends SnowflakeConverter {
   as the reader schema. See https://avro.apache.org/docs/1.9.2/spec.html#Schema+Resolution */
   private Schema readerSchema = null;
 
+  // Readers per writer schema id, rebuilt when the reader schema is configured
+  private AvroDatumReaderCache readerCache =
+      new AvroDatumReaderCache(null, READER_CACHE_SIZE_DEFAULT);
+
+  // Binary decoder reused across records of the same thread
+  private final ThreadLocal<BinaryDecoder> decoders = new ThreadLocal<>();
+
+  private final AvroJsonNodeBuilder jsonNodeBuilder = new AvroJsonNodeBuilder(mapper);
+
   @Override
   public void configure(final Map<String, ?> configs, final boolean isKey) {
     readBreakOnSchemaRegistryError(configs);
     parseReaderSchema(configs);
+    readerCache.unregisterJmxMetrics();
+    readerCache = new AvroDatumReaderCache(readerSchema, readReaderCacheSize(configs));
     try { // todo: graceful way to check schema registry
       AvroConverterConfig avroConverterConfig = new AvroConverterConfig(configs);
       schemaRegistry =
@@ -62,6 +75,10 @@ public class SnowflakeAvroConverter extends SnowflakeConverter {
     } catch (Exception e) {
       throw SnowflakeErrors.ERROR_0012.getException(e);
     }
+    if (!"false".equalsIgnoreCase(String.valueOf(configs.get(JMX_OPT)))) {
+      readerCache.registerJmxMetrics(
+          (isKey ? "key-" : "value-") + CONVERTER_COUNT.incrementAndGet());
+    }
   }
 
   void readBreakOnSchemaRegistryError(final Map<String, ?> configs) {
@@ -75,6 +92,38 @@ public class SnowflakeAvroConverter extends SnowflakeConverter {
     }
   }
 
+  /**
+   * Read the maximum number of cached readers from config, default if missing or invalid
+   *
+   * @param configs configuration for converter
+   * @return maximum number of cached readers
+   */
+  long readReaderCacheSize(final Map<String, ?> configs) {
+    Object cacheSize = configs.get(READER_CACHE_SIZE);
+    if (cacheSize == null) {
+      return READER_CACHE_SIZE_DEFAULT;
+    }
+    try {
+      long size = Long.parseLong(cacheSize.toString().trim());
+      if (size > 0) {
+        return size;
+      }
+    } catch (NumberFormatException e) {
+      // fall through
+    }
+    LOGGER.warn(
+        "{} has to be a positive number, got {}, using {}",
+        READER_CACHE_SIZE,
+        cacheSize,
+        READER_CACHE_SIZE_DEFAULT);
+    return READER_CACHE_SIZE_DEFAULT;
+  }
+
+  /** Remove the MBeans of this converter */
+  public void close() {
+    readerCache.unregisterJmxMetrics();
+  }
+
   /**
    * Parse reader schema from config if provided
    *
@@ -106,6 +155,11 @@ public class SnowflakeAvroConverter extends SnowflakeConverter {
     return breakOnSchemaRegistryError;
   }
 
+  // for testing only
+  AvroDatumReaderCache getReaderCache() {
+    return readerCache;
+  }
+
   /**
    * set a schema registry client for test use only
    *
@@ -153,15 +207,10 @@ public class SnowflakeAvroConverter extends SnowflakeConverter {
     }
 
     try {
-      int length = buffer.limit() - 1 - 4;
-      byte[] data = new byte[length];
-      buffer.get(data, 0, length);
-
       return new SchemaAndValue(
           new SnowflakeJsonSchema(),
           new SnowflakeRecordContent(
-              parseAvroWithSchema(
-                  data, writerSchema, readerSchema == null ? writerSchema : readerSchema),
+              parseAvroWithSchema(bytes, buffer.position(), buffer.remaining(), id, writerSchema),
               id));
     } catch (Exception e) {
       if (breakOnSchemaRegistryError) {
@@ -184,25 +233,28 @@ public class SnowflakeAvroConverter extends SnowflakeConverter {
    * have to be compatible as described in
    * https://avro.apache.org/docs/1.9.2/spec.html#Schema+Resolution
    *
+   * <p>The reader resolving the writer schema against the reader schema is cached per writer
+   * schema id, see {@link AvroDatumReaderCache}
+   *
    * @param data avro data
+   * @param offset offset of the record in data
+   * @param length length of the record in data
+   * @param writerSchemaId id of the writer schema in schema registry
    * @param writerSchema avro schema with which data got serialized
-   * @param readerSchema avro schema that describes the shape of the returned JsonNode
    * @return JsonNode array
    */
-  private JsonNode parseAvroWithSchema(final byte[] data, Schema writerSchema, Schema readerSchema)
+  private JsonNode parseAvroWithSchema(
+      final byte[] data,
+      final int offset,
+      final int length,
+      final int writerSchemaId,
+      final Schema writerSchema)
       throws IOException {
-    final GenericData genericData = new GenericData();
-    // Conversion for logical type Decimal. There are conversions for other logical types as well.
-    genericData.addLogicalTypeConversion(new Conversions.DecimalConversion());
-
-    InputStream is = new ByteArrayInputStream(data);
-    Decoder decoder = DecoderFactory.get().binaryDecoder(is, null);
-    DatumReader<GenericRecord> reader =
-        new GenericDatumReader<>(writerSchema, readerSchema, genericData);
+    BinaryDecoder decoder =
+        DecoderFactory.get().binaryDecoder(data, offset, length, decoders.get());
+    decoders.set(decoder);
+    DatumReader<GenericRecord> reader = readerCache.getReader(writerSchemaId, writerSchema);
     GenericRecord datum = reader.read(null, decoder);
-    // For byte data without logical type, this toString method handles it this way:
-    // writeEscapedString(StandardCharsets.ISO_8859_1.decode(bytes), buffer);
-    // The generated string is escaped ISO_8859_1 decoded string.
-    return mapper.readTree(datum.toString());
+    return jsonNodeBuilder.toJsonNode(datum);
   }
 }
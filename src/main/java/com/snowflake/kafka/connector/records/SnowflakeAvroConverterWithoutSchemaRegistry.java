@@ -28,6 +28,8 @@ import org.apache.avro.io.DatumReader;
 import org.apache.kafka.connect.data.SchemaAndValue;
 
 public class SnowflakeAvroConverterWithoutSchemaRegistry extends SnowflakeConverter {
+  private final AvroJsonNodeBuilder jsonNodeBuilder = new AvroJsonNodeBuilder(mapper);
+
   /**
    * Parse Avro record without schema
    *
@@ -53,16 +55,17 @@ public class SnowflakeAvroConverterWithoutSchemaRegistry extends SnowflakeConver
       }
 
       ArrayList<JsonNode> buffer = new ArrayList<>();
+      GenericRecord record = null;
       while (dataFileReader.hasNext()) {
-        String jsonString = dataFileReader.next().toString();
+        record = dataFileReader.next(record);
         try {
-          buffer.add(mapper.readTree(jsonString));
+          buffer.add(jsonNodeBuilder.toJsonNode(record));
         } catch (IOException e) {
           throw SnowflakeErrors.ERROR_0010.getException(
               "Failed to parse JSON"
                   + " "
                   + "record\nInput String: "
-                  + jsonString
+                  + record
                   + "\n"
                   + e.getMessage());
         }
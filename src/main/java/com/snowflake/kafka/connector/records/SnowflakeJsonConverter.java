@@ -16,9 +16,39 @@
  */
 package com.snowflake.kafka.connector.records;
 
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.util.Map;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.core.JsonParser;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.core.JsonProcessingException;
 import org.apache.kafka.connect.data.SchemaAndValue;
 
 public class SnowflakeJsonConverter extends SnowflakeConverter {
+  public static final String RAW_PASSTHROUGH = "raw.passthrough";
+
+  /* By default, every record is parsed into a json tree. In raw passthrough mode the record is only
+  validated by a streaming parser and its text is kept, so that Snowpipe files can be written
+  without building the tree. */
+  private boolean rawPassthrough = false;
+
+  @Override
+  public void configure(final Map<String, ?> configs, final boolean isKey) {
+    readRawPassthrough(configs);
+  }
+
+  void readRawPassthrough(final Map<String, ?> configs) {
+    Object passthrough = configs.get(RAW_PASSTHROUGH);
+    if (passthrough instanceof String) {
+      rawPassthrough = ((String) passthrough).trim().equalsIgnoreCase("true");
+    } else if (passthrough instanceof Boolean) {
+      rawPassthrough = (Boolean) passthrough;
+    }
+  }
+
+  // for testing only
+  boolean getRawPassthrough() {
+    return rawPassthrough;
+  }
 
   /**
    * cast bytes array to Json array
@@ -33,6 +63,11 @@ public class SnowflakeJsonConverter extends SnowflakeConverter {
       return new SchemaAndValue(new SnowflakeJsonSchema(), new SnowflakeRecordContent());
     }
     try {
+      if (rawPassthrough && isRawPassthroughCandidate(bytes) && isValidJson(bytes)) {
+        return new SchemaAndValue(
+            new SnowflakeJsonSchema(),
+            new SnowflakeRecordContent(new String(bytes, StandardCharsets.UTF_8)));
+      }
       // always return an array of JsonNode because AVRO record may contains
       // multiple records
       return new SchemaAndValue(
@@ -42,4 +77,40 @@ public class SnowflakeJsonConverter extends SnowflakeConverter {
       return new SchemaAndValue(new SnowflakeJsonSchema(), new SnowflakeRecordContent(bytes));
     }
   }
+
+  /**
+   * Only UTF-8 text without byte order mark can be kept as is, the parser detects other encodings
+   * from the first bytes, which contain a zero byte for UTF-16 and UTF-32.
+   *
+   * @param bytes input bytes array
+   * @return true if the record can be kept as text
+   */
+  private static boolean isRawPassthroughCandidate(final byte[] bytes) {
+    if (bytes.length == 0 || bytes[0] == 0 || (bytes.length > 1 && bytes[1] == 0)) {
+      return false;
+    }
+    int first = bytes[0] & 0xFF;
+    return first != 0xEF && first != 0xFE && first != 0xFF;
+  }
+
+  /**
+   * Validate the record with a streaming parser, without building the json tree. Duplicate keys and
+   * trailing content are rejected since they would end up in the Snowpipe file as is.
+   *
+   * @param bytes input bytes array
+   * @return true if the record holds exactly one valid json value
+   */
+  private boolean isValidJson(final byte[] bytes) throws IOException {
+    try (JsonParser parser = mapper.getFactory().createParser(bytes)) {
+      parser.enable(JsonParser.Feature.STRICT_DUPLICATE_DETECTION);
+      if (parser.nextToken() == null) {
+        return false;
+      }
+      parser.skipChildren();
+      return parser.nextToken() == null;
+    } catch (JsonProcessingException e) {
+      // let the json tree parser decide whether the record is broken
+      return false;
+    }
+  }
 }
@@ -9,8 +9,11 @@ public class SnowflakeRecordContent {
 
   private static ObjectMapper MAPPER = new ObjectMapper();
   public static int NON_AVRO_SCHEMA = -1;
-  private final JsonNode[] content;
+  // parsed lazily from rawContent when the record was created in raw passthrough mode
+  private JsonNode[] content;
   private final byte[] brokenData;
+  // json text of the record as received, null unless created in raw passthrough mode
+  private final String rawContent;
   private int schemaID;
   private boolean isBroken;
 
@@ -32,6 +35,7 @@ public class SnowflakeRecordContent {
     content = new JsonNode[1];
     content[0] = MAPPER.createObjectNode();
     brokenData = null;
+    rawContent = null;
     isNullValueRecord = true;
   }
 
@@ -47,6 +51,7 @@ public class SnowflakeRecordContent {
     this.content[0] = RecordService.convertToJson(schema, data);
     this.isBroken = false;
     this.brokenData = null;
+    this.rawContent = null;
   }
 
   /**
@@ -60,6 +65,21 @@ public class SnowflakeRecordContent {
     this.isBroken = false;
     this.schemaID = NON_AVRO_SCHEMA;
     this.brokenData = null;
+    this.rawContent = null;
+  }
+
+  /**
+   * constructor for json converter in raw passthrough mode, the json tree is only built if {@link
+   * #getData()} is called
+   *
+   * @param rawJson valid json text
+   */
+  SnowflakeRecordContent(String rawJson) {
+    this.content = null;
+    this.isBroken = false;
+    this.schemaID = NON_AVRO_SCHEMA;
+    this.brokenData = null;
+    this.rawContent = rawJson;
   }
 
   /**
@@ -72,6 +92,7 @@ public class SnowflakeRecordContent {
     this.isBroken = false;
     this.schemaID = NON_AVRO_SCHEMA;
     this.brokenData = null;
+    this.rawContent = null;
   }
 
   /**
@@ -84,6 +105,7 @@ public class SnowflakeRecordContent {
     this.isBroken = true;
     this.schemaID = NON_AVRO_SCHEMA;
     this.content = null;
+    this.rawContent = null;
   }
 
   /**
@@ -116,10 +138,22 @@ public class SnowflakeRecordContent {
     return schemaID;
   }
 
+  /** @return json text of the record as received, null if not created in raw passthrough mode */
+  String getRawContent() {
+    return rawContent;
+  }
+
   public JsonNode[] getData() {
     if (isBroken) {
       throw SnowflakeErrors.ERROR_5012.getException();
     }
+    if (content == null && rawContent != null) {
+      try {
+        content = new JsonNode[] {MAPPER.readTree(rawContent)};
+      } catch (Exception e) {
+        throw SnowflakeErrors.ERROR_0010.getException(e.toString());
+      }
+    }
     assert content != null;
     return content.clone();
   }
@@ -265,6 +265,105 @@ public class ConnectorConfigTest {
     Utils.validateConfig(config);
   }
 
+  @Test
+  public void testFileUploadThreads_valid_value() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.SNOWPIPE_FILE_UPLOAD_THREADS, "8");
+    Utils.validateConfig(config);
+
+    config.put(SnowflakeSinkConnectorConfig.SNOWPIPE_FILE_UPLOAD_THREADS, "0");
+    Utils.validateConfig(config);
+  }
+
+  @Test(expected = SnowflakeKafkaConnectorException.class)
+  public void testFileUploadThreads_negative() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.SNOWPIPE_FILE_UPLOAD_THREADS, "-1");
+    Utils.validateConfig(config);
+  }
+
+  @Test(expected = SnowflakeKafkaConnectorException.class)
+  public void testFileUploadThreads_not_number() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.SNOWPIPE_FILE_UPLOAD_THREADS, "many");
+    Utils.validateConfig(config);
+  }
+
+  @Test
+  public void testPartitionWorkerThreads_valid_value() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.PARTITION_WORKER_THREADS, "8");
+    Utils.validateConfig(config);
+  }
+
+  @Test(expected = SnowflakeKafkaConnectorException.class)
+  public void testPartitionWorkerThreads_zero() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.PARTITION_WORKER_THREADS, "0");
+    Utils.validateConfig(config);
+  }
+
+  @Test
+  public void testPartitionOpenThreads_valid_value() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.PARTITION_OPEN_THREADS, "16");
+    Utils.validateConfig(config);
+  }
+
+  @Test(expected = SnowflakeKafkaConnectorException.class)
+  public void testPartitionOpenThreads_zero() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.PARTITION_OPEN_THREADS, "0");
+    Utils.validateConfig(config);
+  }
+
+  @Test
+  public void testBufferMemoryLimit_valid_value() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.BUFFER_MEMORY_LIMIT_BYTES, "10000000000");
+    Utils.validateConfig(config);
+    config.put(SnowflakeSinkConnectorConfig.BUFFER_MEMORY_LIMIT_BYTES, "0");
+    Utils.validateConfig(config);
+  }
+
+  @Test(expected = SnowflakeKafkaConnectorException.class)
+  public void testBufferMemoryLimit_negative() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.BUFFER_MEMORY_LIMIT_BYTES, "-1");
+    Utils.validateConfig(config);
+  }
+
+  @Test
+  public void testJdbcSessionPoolSize_valid_value() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.JDBC_SESSION_POOL_SIZE, "4");
+    Utils.validateConfig(config);
+    config.put(SnowflakeSinkConnectorConfig.JDBC_SESSION_POOL_SIZE, "0");
+    Utils.validateConfig(config);
+  }
+
+  @Test(expected = SnowflakeKafkaConnectorException.class)
+  public void testJdbcSessionPoolSize_negative() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.JDBC_SESSION_POOL_SIZE, "-1");
+    Utils.validateConfig(config);
+  }
+
+  @Test
+  public void testBufferFlushAdaptive_valid_value() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.BUFFER_FLUSH_ADAPTIVE, "true");
+    config.put(SnowflakeSinkConnectorConfig.BUFFER_ADAPTIVE_MAX_SIZE_BYTES, "50000000");
+    Utils.validateConfig(config);
+  }
+
+  @Test(expected = SnowflakeKafkaConnectorException.class)
+  public void testBufferFlushAdaptive_invalid_value() {
+    Map<String, String> config = getConfig();
+    config.put(SnowflakeSinkConnectorConfig.BUFFER_FLUSH_ADAPTIVE, "yes");
+    Utils.validateConfig(config);
+  }
+
   @Test
   public void testDeliveryGuarantee_valid_value() {
     Map<String, String> config = getConfig();
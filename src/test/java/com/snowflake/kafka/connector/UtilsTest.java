@@ -2,8 +2,10 @@ package com.snowflake.kafka.connector;
 
 import com.snowflake.kafka.connector.internal.SnowflakeErrors;
 import com.snowflake.kafka.connector.internal.TestUtils;
+import java.nio.charset.StandardCharsets;
 import java.util.HashMap;
 import java.util.Map;
+import org.junit.Assert;
 import org.junit.Rule;
 import org.junit.Test;
 import org.junit.contrib.java.lang.system.EnvironmentVariables;
@@ -185,4 +187,22 @@ public class UtilsTest {
             "{} test message\n{} test message\n{} test " + "message\n{} test message", 1, 2, 3, 4)
         .equals(expected);
   }
+
+  @Test
+  public void testUtf8Length() {
+    String[] values = {
+      "",
+      "{\"name\":\"test\"}",
+      "\u00e9t\u00e9",
+      "\u4e2d\u6587",
+      "\ud83d\ude00 emoji",
+      "unpaired \ud83d surrogate",
+      "unpaired \ude00",
+      "trailing \ud83d"
+    };
+    for (String value : values) {
+      Assert.assertEquals(
+          value, value.getBytes(StandardCharsets.UTF_8).length, Utils.utf8Length(value));
+    }
+  }
 }
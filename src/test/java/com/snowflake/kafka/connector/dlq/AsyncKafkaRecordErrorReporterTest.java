@@ -0,0 +1,90 @@
+package com.snowflake.kafka.connector.dlq;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.CompletableFuture;
+import org.apache.kafka.connect.errors.ConnectException;
+import org.apache.kafka.connect.sink.ErrantRecordReporter;
+import org.apache.kafka.connect.sink.SinkRecord;
+import org.junit.Assert;
+import org.junit.Test;
+
+public class AsyncKafkaRecordErrorReporterTest {
+  @Test
+  public void testFlushWaitsForReports() {
+    List<CompletableFuture<Void>> reports = new ArrayList<>();
+    AsyncKafkaRecordErrorReporter reporter =
+        new AsyncKafkaRecordErrorReporter(reporter(reports), 10);
+
+    for (int i = 0; i < 3; i++) {
+      reporter.reportError(record(i), new RuntimeException("bad record"));
+    }
+    Assert.assertEquals(3, reporter.getReportedCount());
+    Assert.assertEquals(3, reporter.getInFlightCount());
+
+    reports.forEach(report -> report.complete(null));
+    reporter.flush();
+    Assert.assertEquals(0, reporter.getInFlightCount());
+    Assert.assertEquals(0, reporter.getFailedCount());
+    Assert.assertEquals(0, reporter.getBackpressureWaitCount());
+  }
+
+  @Test
+  public void testInFlightLimit() {
+    List<CompletableFuture<Void>> reports = new ArrayList<>();
+    ErrantRecordReporter errantRecordReporter =
+        (record, error) -> {
+          // acknowledged right away, the limit still makes the reporter wait for them
+          CompletableFuture<Void> report = CompletableFuture.completedFuture(null);
+          reports.add(report);
+          return report;
+        };
+    AsyncKafkaRecordErrorReporter reporter =
+        new AsyncKafkaRecordErrorReporter(errantRecordReporter, 2);
+
+    for (int i = 0; i < 5; i++) {
+      reporter.reportError(record(i), new RuntimeException("bad record"));
+      Assert.assertTrue(reporter.getInFlightCount() <= 2);
+    }
+    Assert.assertEquals(5, reports.size());
+    Assert.assertEquals(3, reporter.getBackpressureWaitCount());
+    reporter.flush();
+  }
+
+  @Test
+  public void testFailureIsThrown() {
+    List<CompletableFuture<Void>> reports = new ArrayList<>();
+    AsyncKafkaRecordErrorReporter reporter =
+        new AsyncKafkaRecordErrorReporter(reporter(reports), 10);
+    reporter.reportError(record(0), new RuntimeException("bad record"));
+    reports.get(0).completeExceptionally(new RuntimeException("DLQ unavailable"));
+
+    try {
+      reporter.flush();
+      Assert.fail("the delivery failure should be thrown");
+    } catch (ConnectException e) {
+      Assert.assertEquals("DLQ unavailable", e.getCause().getMessage());
+    }
+    Assert.assertEquals(1, reporter.getFailedCount());
+
+    // the reporter stays failed
+    try {
+      reporter.reportError(record(1), new RuntimeException("bad record"));
+      Assert.fail("the delivery failure should be thrown");
+    } catch (ConnectException e) {
+      Assert.assertEquals(1, reports.size());
+    }
+  }
+
+  private static ErrantRecordReporter reporter(List<CompletableFuture<Void>> reports) {
+    return (record, error) -> {
+      CompletableFuture<Void> report = new CompletableFuture<>();
+      reports.add(report);
+      return report;
+    };
+  }
+
+  private static SinkRecord record(long offset) {
+    return new SinkRecord("topic", 0, null, null, null, "value", offset);
+  }
+}
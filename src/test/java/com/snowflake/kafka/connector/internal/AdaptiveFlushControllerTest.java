@@ -0,0 +1,66 @@
+package com.snowflake.kafka.connector.internal;
+
+import org.junit.Assert;
+import org.junit.Test;
+
+public class AdaptiveFlushControllerTest {
+  private static final long MIN_FLUSH_TIME_MS = 10000;
+  private static final long MAX_FLUSH_TIME_MS = 120000;
+  private static final long MIN_SIZE_BYTES = 5000000;
+  private static final long MAX_SIZE_BYTES = 100000000;
+
+  private static AdaptiveFlushController newController() {
+    return new AdaptiveFlushController(
+        MIN_FLUSH_TIME_MS, MAX_FLUSH_TIME_MS, MIN_SIZE_BYTES, MAX_SIZE_BYTES);
+  }
+
+  @Test
+  public void testConfiguredThresholdsBeforeFirstFlush() {
+    AdaptiveFlushController controller = newController();
+    Assert.assertEquals(MAX_FLUSH_TIME_MS, controller.getFlushTimeThresholdMillis());
+    Assert.assertEquals(MIN_SIZE_BYTES, controller.getFlushSizeThresholdBytes());
+    Assert.assertTrue(controller.isFlushBufferedBytesBased(MIN_SIZE_BYTES));
+    Assert.assertFalse(controller.isFlushTimeBased(System.currentTimeMillis()));
+    Assert.assertTrue(controller.isFlushTimeBased(System.currentTimeMillis() - MAX_FLUSH_TIME_MS));
+  }
+
+  @Test
+  public void testHotPartitionFlushesLargerFiles() {
+    AdaptiveFlushController controller = newController();
+    // 5 MB per second, 600 MB within the latency target
+    controller.onFlush(5000000, 5000, 1000);
+    Assert.assertEquals(MAX_SIZE_BYTES, controller.getFlushSizeThresholdBytes());
+    Assert.assertEquals(MAX_FLUSH_TIME_MS, controller.getFlushTimeThresholdMillis());
+    Assert.assertFalse(controller.isFlushBufferedBytesBased(MIN_SIZE_BYTES));
+  }
+
+  @Test
+  public void testWarmPartitionBuffersWithinLatencyTarget() {
+    AdaptiveFlushController controller = newController();
+    // 100 KB per second, 12 MB within the latency target
+    controller.onFlush(6000000, 600, 60000);
+    Assert.assertEquals(12000000, controller.getFlushSizeThresholdBytes());
+    Assert.assertEquals(MAX_FLUSH_TIME_MS, controller.getFlushTimeThresholdMillis());
+
+    // the rates are smoothed, a single slower flush only lowers the threshold
+    controller.onFlush(0, 0, 60000);
+    Assert.assertEquals(8400000, controller.getFlushSizeThresholdBytes());
+  }
+
+  @Test
+  public void testColdPartitionFlushesEarly() {
+    AdaptiveFlushController controller = newController();
+    // one record per hour
+    controller.onFlush(100, 1, 3600000);
+    Assert.assertEquals(MIN_FLUSH_TIME_MS, controller.getFlushTimeThresholdMillis());
+    Assert.assertEquals(MIN_SIZE_BYTES, controller.getFlushSizeThresholdBytes());
+  }
+
+  @Test
+  public void testIgnoreFlushWithoutElapsedTime() {
+    AdaptiveFlushController controller = newController();
+    controller.onFlush(100, 1, 0);
+    Assert.assertEquals(MAX_FLUSH_TIME_MS, controller.getFlushTimeThresholdMillis());
+    Assert.assertEquals(MIN_SIZE_BYTES, controller.getFlushSizeThresholdBytes());
+  }
+}
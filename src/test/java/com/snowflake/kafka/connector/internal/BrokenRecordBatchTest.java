@@ -0,0 +1,36 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.nio.charset.StandardCharsets;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.JsonNode;
+import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.ObjectMapper;
+import org.junit.Assert;
+import org.junit.Test;
+
+public class BrokenRecordBatchTest {
+  @Test
+  public void testBatchWithManifest() throws Exception {
+    BrokenRecordBatch batch = new BrokenRecordBatch();
+    Assert.assertTrue(batch.isEmpty());
+
+    batch.add(10, true, "key".getBytes(StandardCharsets.UTF_8));
+    batch.add(10, false, "value".getBytes(StandardCharsets.UTF_8));
+    batch.add(12, false, "other".getBytes(StandardCharsets.UTF_8));
+
+    Assert.assertFalse(batch.isEmpty());
+    Assert.assertEquals(3, batch.getNumOfContents());
+    Assert.assertEquals(13, batch.getSizeBytes());
+    Assert.assertEquals(10, batch.getFirstOffset());
+    Assert.assertEquals(12, batch.getLastOffset());
+    Assert.assertTrue(batch.getCreationTime() <= System.currentTimeMillis());
+    Assert.assertEquals("keyvalueother", new String(batch.getData(), StandardCharsets.UTF_8));
+
+    JsonNode manifest = new ObjectMapper().readTree(batch.getManifest());
+    Assert.assertEquals(3, manifest.size());
+    Assert.assertEquals(10, manifest.get(1).get("offset").asLong());
+    Assert.assertEquals("value", manifest.get(1).get("type").asText());
+    Assert.assertEquals(3, manifest.get(1).get("start").asInt());
+    Assert.assertEquals(5, manifest.get(1).get("length").asInt());
+    Assert.assertEquals("key", manifest.get(0).get("type").asText());
+    Assert.assertEquals(12, manifest.get(2).get("offset").asLong());
+  }
+}
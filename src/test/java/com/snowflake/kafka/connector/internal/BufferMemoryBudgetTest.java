@@ -0,0 +1,64 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import org.junit.Assert;
+import org.junit.Test;
+
+public class BufferMemoryBudgetTest {
+  @Test
+  public void testFlushLargestBuffersFirst() {
+    BufferMemoryBudget budget = new BufferMemoryBudget(1000);
+    Map<String, Long> bufferedBytes = new HashMap<>();
+    bufferedBytes.put("a", 100L);
+    bufferedBytes.put("b", 500L);
+    bufferedBytes.put("c", 300L);
+    bufferedBytes.put("d", 200L);
+
+    List<String> flushed = new ArrayList<>();
+    Assert.assertFalse(budget.enforce(bufferedBytes, 0, flushed::add));
+    // 1100 bytes, flushing b is enough to go under the low water mark of 750 bytes
+    Assert.assertEquals(Collections.singletonList("b"), flushed);
+
+    flushed.clear();
+    bufferedBytes.put("b", 0L);
+    Assert.assertFalse(budget.enforce(bufferedBytes, 0, flushed::add));
+    Assert.assertTrue(flushed.isEmpty());
+  }
+
+  @Test
+  public void testPauseUntilInFlightBytesAreReleased() {
+    BufferMemoryBudget budget = new BufferMemoryBudget(1000);
+    Map<String, Long> bufferedBytes = new HashMap<>();
+    bufferedBytes.put("a", 300L);
+    bufferedBytes.put("b", 200L);
+
+    List<String> flushed = new ArrayList<>();
+    Assert.assertTrue(budget.enforce(bufferedBytes, 1200, flushed::add));
+    Assert.assertEquals(Arrays.asList("a", "b"), flushed);
+    Assert.assertTrue(budget.isOverBudget());
+
+    // under the limit but over the low water mark, stay paused
+    bufferedBytes.put("a", 0L);
+    bufferedBytes.put("b", 0L);
+    Assert.assertTrue(budget.enforce(bufferedBytes, 800, flushed::add));
+
+    Assert.assertFalse(budget.enforce(bufferedBytes, 700, flushed::add));
+    Assert.assertFalse(budget.isOverBudget());
+    Assert.assertEquals(2, flushed.size());
+  }
+
+  @Test
+  public void testDisabled() {
+    BufferMemoryBudget budget = new BufferMemoryBudget(0);
+    Assert.assertFalse(budget.isEnabled());
+    List<String> flushed = new ArrayList<>();
+    Assert.assertFalse(
+        budget.enforce(Collections.singletonMap("a", Long.MAX_VALUE / 2), 0, flushed::add));
+    Assert.assertTrue(flushed.isEmpty());
+  }
+}
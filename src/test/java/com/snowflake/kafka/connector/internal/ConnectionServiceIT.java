@@ -12,6 +12,7 @@ import java.util.List;
 import java.util.Map;
 import java.util.Properties;
 import java.util.UUID;
+import java.util.concurrent.atomic.AtomicLong;
 import net.snowflake.client.jdbc.internal.apache.http.Header;
 import net.snowflake.client.jdbc.internal.apache.http.HttpHeaders;
 import net.snowflake.client.jdbc.internal.apache.http.client.methods.HttpPost;
@@ -304,6 +305,28 @@ public class ConnectionServiceIT {
     assert files.size() == 0;
   }
 
+  @Test
+  public void testParallelMoveToTableStage() {
+    conn.createStage(stageName);
+    conn.createTable(tableName);
+    List<String> filesList = new ArrayList<>();
+    for (int i = 0; i < 5; i++) {
+      String fileName =
+          FileNameUtils.fileName(TestUtils.TEST_CONNECTOR_NAME, tableName, 1, i * 10, i * 10 + 2);
+      conn.put(stageName, fileName, "test");
+      filesList.add(fileName);
+    }
+
+    AtomicLong movedFiles = new AtomicLong();
+    conn.moveToTableStage(tableName, stageName, filesList, movedFiles::addAndGet);
+    assert movedFiles.get() == 5;
+    // all files moved with their names and removed from the stage
+    List<String> files = conn.listStage(tableName, "", true);
+    assert files.size() == 5;
+    assert files.containsAll(filesList);
+    assert conn.listStage(stageName, TestUtils.TEST_CONNECTOR_NAME).isEmpty();
+  }
+
   @Test
   public void testPipeFunctions() {
     conn.createStage(stageName);
@@ -333,6 +356,31 @@ public class ConnectionServiceIT {
     assert !conn.pipeExist(pipeName);
   }
 
+  @Test
+  public void testBatchedPipeFunctions() {
+    conn.createStage(stageName);
+    conn.createTable(tableName);
+    conn.createTable(tableName1);
+    List<String> pipeNames = new ArrayList<>();
+    for (int partition = 0; partition < 3; partition++) {
+      pipeNames.add(pipeName + "_" + partition);
+    }
+    try {
+      // no pipe exists
+      assert conn.arePipesCompatible(tableName, stageName, pipeNames).isEmpty();
+      // only the missing pipes are created
+      conn.createPipe(tableName1, stageName, pipeNames.get(0));
+      conn.createPipes(tableName, stageName, pipeNames);
+      Map<String, Boolean> compatible = conn.arePipesCompatible(tableName, stageName, pipeNames);
+      Assert.assertEquals(3, compatible.size());
+      assert !compatible.get(pipeNames.get(0));
+      assert compatible.get(pipeNames.get(1));
+      assert compatible.get(pipeNames.get(2));
+    } finally {
+      pipeNames.forEach(conn::dropPipe);
+    }
+  }
+
   @Test
   public void testTableCompatible() {
     TestUtils.executeQuery(
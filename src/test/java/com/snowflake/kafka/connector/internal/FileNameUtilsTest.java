@@ -1,5 +1,8 @@
 package com.snowflake.kafka.connector.internal;
 
+import java.util.Arrays;
+import java.util.regex.Pattern;
+import org.junit.Assert;
 import org.junit.Test;
 
 public class FileNameUtilsTest {
@@ -45,13 +48,15 @@ public class FileNameUtilsTest {
 
     String brokenFileName =
         FileNameUtils.brokenRecordFileName(
-            TestUtils.TEST_CONNECTOR_NAME, topic, partition, startOffset, true);
+            TestUtils.TEST_CONNECTOR_NAME, topic, partition, startOffset, endOffset);
     assert TestUtils.verifyBrokenRecordName(brokenFileName);
+    assert TestUtils.getPartitionFromBrokenFileName(brokenFileName) == partition;
+    assert TestUtils.getOffsetFromBrokenFileName(brokenFileName) == startOffset;
 
-    brokenFileName =
-        FileNameUtils.brokenRecordFileName(
-            TestUtils.TEST_CONNECTOR_NAME, topic, partition, startOffset, false);
-    assert TestUtils.verifyBrokenRecordName(brokenFileName);
+    String manifestFileName = FileNameUtils.brokenRecordManifestFileName(brokenFileName);
+    assert manifestFileName.endsWith("_broken_manifest.json.gz");
+    assert TestUtils.verifyBrokenRecordName(manifestFileName);
+    assert TestUtils.getOffsetFromBrokenFileName(manifestFileName) == startOffset;
   }
 
   @Test
@@ -71,4 +76,19 @@ public class FileNameUtilsTest {
 
     assert !FileNameUtils.isFileExpired(unexpiredFile);
   }
+
+  @Test
+  public void testRemovePattern() {
+    String pattern = FileNameUtils.removePattern(Arrays.asList("1_2_3.json.gz", "4_5_6.json.gz"));
+    Assert.assertEquals(".*/(1_2_3[.]json[.]gz|4_5_6[.]json[.]gz)", pattern);
+
+    Pattern compiled = Pattern.compile(pattern);
+    assert compiled.matcher("stage/app/topic/0/1_2_3.json.gz").matches();
+    assert compiled.matcher("app/topic/0/4_5_6.json.gz").matches();
+    assert !compiled.matcher("app/topic/0/11_2_3.json.gz").matches();
+    assert !compiled.matcher("app/topic/0/1_2_3xjson.gz").matches();
+
+    Assert.assertNull(FileNameUtils.removePattern(Arrays.asList("1_2_3.json.gz", "a'b.gz")));
+    Assert.assertNull(FileNameUtils.removePattern(Arrays.asList("a|b.gz")));
+  }
 }
@@ -0,0 +1,67 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.charset.StandardCharsets;
+import java.util.Random;
+import java.util.zip.GZIPInputStream;
+import org.junit.Assert;
+import org.junit.Test;
+
+public class GzipFileBufferTest {
+  @Test
+  public void testRoundTrip() throws IOException {
+    GzipFileBuffer buffer = new GzipFileBuffer();
+    StringBuilder expected = new StringBuilder();
+    Random random = new Random(0);
+    // random content doesn't compress, so the file spans several chunks
+    for (int i = 0; i < 10000; i++) {
+      String record =
+          "{\"id\":" + i + ",\"value\":\"" + Long.toHexString(random.nextLong()) + "\"}";
+      expected.append(record);
+      buffer.append(record);
+    }
+    // 2 bytes per accented character
+    Assert.assertEquals(16, buffer.append("{\"name\":\"\u00e9t\u00e9\"}"));
+    expected.append("{\"name\":\"\u00e9t\u00e9\"}");
+    buffer.finish();
+
+    byte[] expectedBytes = expected.toString().getBytes(StandardCharsets.UTF_8);
+    Assert.assertEquals(expectedBytes.length, buffer.getUncompressedSizeBytes());
+    Assert.assertTrue(buffer.getCompressedSizeBytes() > GzipFileBuffer.CHUNK_SIZE);
+
+    // the content can be read again when an upload is retried
+    Assert.assertEquals(expected.toString(), decompress(buffer.getInputStream()));
+    Assert.assertEquals(expected.toString(), decompress(buffer.getInputStream()));
+    buffer.release();
+  }
+
+  @Test
+  public void testEmptyBuffer() throws IOException {
+    GzipFileBuffer buffer = new GzipFileBuffer();
+    Assert.assertEquals(0, buffer.getCompressedSizeBytes());
+    Assert.assertEquals("", decompress(buffer.getInputStream()));
+    Assert.assertEquals(0, buffer.getUncompressedSizeBytes());
+  }
+
+  @Test(expected = IllegalStateException.class)
+  public void testAppendAfterFinish() {
+    GzipFileBuffer buffer = new GzipFileBuffer();
+    buffer.append("{}");
+    buffer.finish();
+    buffer.append("{}");
+  }
+
+  private static String decompress(InputStream compressed) throws IOException {
+    ByteArrayOutputStream out = new ByteArrayOutputStream();
+    try (InputStream in = new GZIPInputStream(compressed)) {
+      byte[] bytes = new byte[4096];
+      int length;
+      while ((length = in.read(bytes)) != -1) {
+        out.write(bytes, 0, length);
+      }
+    }
+    return new String(out.toByteArray(), StandardCharsets.UTF_8);
+  }
+}
@@ -0,0 +1,89 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.HashMap;
+import java.util.Map;
+import net.snowflake.ingest.SimpleIngestManager;
+import org.junit.Assert;
+import org.junit.Test;
+import org.mockito.Mockito;
+
+public class IngestManagerRegistryTest {
+  private final Map<String, Integer> createdManagers = new HashMap<>();
+
+  private SimpleIngestManager createManager(String pipeName) {
+    createdManagers.merge(pipeName, 1, Integer::sum);
+    return Mockito.mock(SimpleIngestManager.class);
+  }
+
+  @Test
+  public void testManagerSharedByPipe() throws Exception {
+    IngestManagerRegistry registry = new IngestManagerRegistry(this::createManager, 60000);
+    SimpleIngestManager manager = registry.acquire("pipe_0");
+    Assert.assertSame(manager, registry.acquire("pipe_0"));
+    Assert.assertNotSame(manager, registry.acquire("pipe_1"));
+    Assert.assertEquals(1, (int) createdManagers.get("pipe_0"));
+    Assert.assertEquals(2, registry.size());
+
+    // the manager is kept after its last release, and reused when the pipe is opened again
+    registry.release("pipe_0");
+    registry.release("pipe_0");
+    Assert.assertSame(manager, registry.acquire("pipe_0"));
+    Assert.assertEquals(1, (int) createdManagers.get("pipe_0"));
+    Mockito.verify(manager, Mockito.never()).close();
+
+    registry.close();
+    Mockito.verify(manager).close();
+    Assert.assertEquals(0, registry.size());
+  }
+
+  @Test
+  public void testCloseIdleManagers() throws Exception {
+    IngestManagerRegistry registry = new IngestManagerRegistry(this::createManager, 0);
+    SimpleIngestManager manager = registry.acquire("pipe_0");
+    SimpleIngestManager otherManager = registry.acquire("pipe_1");
+
+    registry.release("pipe_0");
+    Mockito.verify(manager).close();
+    Mockito.verify(otherManager, Mockito.never()).close();
+    Assert.assertEquals(1, registry.size());
+
+    // a new manager is created for the next request of the pipe
+    Assert.assertNotSame(manager, registry.acquire("pipe_0"));
+    Assert.assertEquals(2, (int) createdManagers.get("pipe_0"));
+  }
+
+  @Test
+  public void testFailedCloseDoesNotBlockOthers() throws Exception {
+    IngestManagerRegistry registry = new IngestManagerRegistry(this::createManager, 60000);
+    SimpleIngestManager failingManager = registry.acquire("pipe_0");
+    Mockito.doThrow(new RuntimeException("close failed")).when(failingManager).close();
+    SimpleIngestManager manager = registry.acquire("pipe_1");
+
+    registry.close();
+    Mockito.verify(manager).close();
+  }
+
+  @Test
+  public void testClosedIngestionServiceDoesNotAcquire() throws Exception {
+    IngestManagerRegistry registry = new IngestManagerRegistry(this::createManager, 0);
+    SnowflakeIngestionServiceV1 ingestionService =
+        new SnowflakeIngestionServiceV1("stage", "pipe_0", registry);
+    SimpleIngestManager manager = ingestionService.getIngestManager();
+    Assert.assertFalse(ingestionService.isClosed());
+
+    ingestionService.close();
+    Assert.assertTrue(ingestionService.isClosed());
+    Mockito.verify(manager).close();
+    Assert.assertEquals(0, registry.size());
+
+    // a late request fails instead of acquiring a manager that is never released
+    try {
+      ingestionService.getIngestManager();
+      Assert.fail("a closed ingestion service should not acquire the ingest manager");
+    } catch (SnowflakeKafkaConnectorException e) {
+      Assert.assertEquals(SnowflakeErrors.ERROR_3009.getCode(), e.getCode());
+    }
+    Assert.assertEquals(0, registry.size());
+    Assert.assertEquals(1, (int) createdManagers.get("pipe_0"));
+  }
+}
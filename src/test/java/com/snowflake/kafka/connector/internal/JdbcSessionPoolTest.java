@@ -0,0 +1,85 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.sql.Connection;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.TimeoutException;
+import java.util.concurrent.atomic.AtomicInteger;
+import org.junit.Assert;
+import org.junit.Test;
+import org.mockito.Mockito;
+
+public class JdbcSessionPoolTest {
+  private final Connection mainSession = Mockito.mock(Connection.class);
+  private final AtomicInteger createdSessions = new AtomicInteger();
+
+  private Connection createSession() {
+    createdSessions.incrementAndGet();
+    return Mockito.mock(Connection.class);
+  }
+
+  @Test
+  public void testSessionsCreatedOnDemandAndReused() throws Exception {
+    JdbcSessionPool pool = new JdbcSessionPool(mainSession, this::createSession, 2);
+    Assert.assertEquals(0, pool.getOpenSessions());
+
+    Connection session = pool.borrow();
+    Assert.assertNotSame(mainSession, session);
+    pool.release(session);
+    Assert.assertSame(session, pool.borrow());
+    Assert.assertEquals(1, createdSessions.get());
+
+    Connection otherSession = pool.borrow();
+    Assert.assertNotSame(session, otherSession);
+    Assert.assertEquals(2, pool.getOpenSessions());
+
+    pool.release(session);
+    pool.release(otherSession);
+    pool.close();
+    Mockito.verify(session).close();
+    Mockito.verify(otherSession).close();
+    Mockito.verify(mainSession, Mockito.never()).close();
+    Assert.assertEquals(0, pool.getOpenSessions());
+  }
+
+  @Test
+  public void testBorrowWaitsForRelease() throws Exception {
+    JdbcSessionPool pool = new JdbcSessionPool(mainSession, this::createSession, 1);
+    Connection session = pool.borrow();
+
+    CompletableFuture<Connection> waiting = CompletableFuture.supplyAsync(pool::borrow);
+    try {
+      waiting.get(200, TimeUnit.MILLISECONDS);
+      Assert.fail("borrow should wait for the session to be released");
+    } catch (TimeoutException e) {
+      // expected
+    }
+
+    pool.release(session);
+    Assert.assertSame(session, waiting.get(10, TimeUnit.SECONDS));
+    Assert.assertEquals(1, createdSessions.get());
+  }
+
+  @Test
+  public void testClosedSessionReplaced() throws Exception {
+    JdbcSessionPool pool = new JdbcSessionPool(mainSession, this::createSession, 1);
+    Connection session = pool.borrow();
+    Mockito.when(session.isClosed()).thenReturn(true);
+    pool.release(session);
+
+    Assert.assertNotSame(session, pool.borrow());
+    Assert.assertEquals(2, createdSessions.get());
+    Assert.assertEquals(1, pool.getOpenSessions());
+  }
+
+  @Test
+  public void testEmptyPoolUsesMainSession() throws Exception {
+    JdbcSessionPool pool = new JdbcSessionPool(mainSession, this::createSession, 0);
+    Assert.assertSame(mainSession, pool.borrow());
+    Assert.assertSame(mainSession, pool.borrow());
+    pool.release(mainSession);
+    pool.close();
+    Assert.assertEquals(0, createdSessions.get());
+    Mockito.verify(mainSession, Mockito.never()).close();
+  }
+}
@@ -0,0 +1,127 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.CopyOnWriteArrayList;
+import java.util.concurrent.atomic.AtomicInteger;
+import org.apache.kafka.common.TopicPartition;
+import org.apache.kafka.connect.sink.SinkRecord;
+import org.junit.After;
+import org.junit.Assert;
+import org.junit.Test;
+
+public class PartitionWorkerPoolTest {
+  private final PartitionWorkerPool pool = new PartitionWorkerPool(4);
+
+  @After
+  public void teardown() {
+    pool.stop();
+  }
+
+  @Test
+  public void testGroupByPartition() {
+    List<SinkRecord> records =
+        Arrays.asList(record("a", 0, 1), record("b", 0, 1), record("a", 0, 2), record("a", 1, 1));
+    Map<TopicPartition, List<SinkRecord>> groups = PartitionWorkerPool.groupByPartition(records);
+
+    Assert.assertEquals(
+        Arrays.asList(
+            new TopicPartition("a", 0), new TopicPartition("b", 0), new TopicPartition("a", 1)),
+        new ArrayList<>(groups.keySet()));
+    Assert.assertEquals(
+        Arrays.asList(records.get(0), records.get(2)), groups.get(new TopicPartition("a", 0)));
+  }
+
+  @Test
+  public void testRunAllKeepsPartitionOrder() {
+    List<SinkRecord> records = new ArrayList<>();
+    for (int offset = 0; offset < 1000; offset++) {
+      for (int partition = 0; partition < 8; partition++) {
+        records.add(record("topic", partition, offset));
+      }
+    }
+    Map<Integer, List<Long>> processed = new ConcurrentHashMap<>();
+    List<Runnable> units = new ArrayList<>();
+    PartitionWorkerPool.groupByPartition(records)
+        .forEach(
+            (topicPartition, partitionRecords) ->
+                units.add(
+                    () -> {
+                      List<Long> offsets = new ArrayList<>();
+                      partitionRecords.forEach(record -> offsets.add(record.kafkaOffset()));
+                      processed.put(topicPartition.partition(), offsets);
+                    }));
+    pool.runAll(units);
+
+    Assert.assertEquals(8, processed.size());
+    for (List<Long> offsets : processed.values()) {
+      Assert.assertEquals(1000, offsets.size());
+      for (int i = 0; i < offsets.size(); i++) {
+        Assert.assertEquals(i, (long) offsets.get(i));
+      }
+    }
+  }
+
+  @Test
+  public void testRunAllWaitsForAllUnitsOnFailure() {
+    AtomicInteger finished = new AtomicInteger();
+    List<Runnable> units = new ArrayList<>();
+    units.add(
+        () -> {
+          throw SnowflakeErrors.ERROR_5024.getException();
+        });
+    for (int i = 0; i < 5; i++) {
+      units.add(
+          () -> {
+            try {
+              Thread.sleep(100);
+            } catch (InterruptedException e) {
+              throw new RuntimeException(e);
+            }
+            finished.incrementAndGet();
+          });
+    }
+    try {
+      pool.runAll(units);
+      Assert.fail("the failure of a unit should be thrown");
+    } catch (SnowflakeKafkaConnectorException e) {
+      Assert.assertEquals(SnowflakeErrors.ERROR_5024.getCode(), e.getCode());
+    }
+    Assert.assertEquals(5, finished.get());
+  }
+
+  @Test
+  public void testSingleThreadRunsOnCaller() {
+    PartitionWorkerPool singleThreadPool = new PartitionWorkerPool(1);
+    List<Thread> threads = new CopyOnWriteArrayList<>();
+    singleThreadPool.runAll(
+        Arrays.asList(
+            () -> threads.add(Thread.currentThread()),
+            () -> threads.add(Thread.currentThread())));
+    Assert.assertEquals(
+        Collections.nCopies(2, Thread.currentThread()), new ArrayList<>(threads));
+    singleThreadPool.stop();
+  }
+
+  @Test
+  public void testRunAllUntilSkipsUnitsAfterDeadline() {
+    AtomicInteger finished = new AtomicInteger();
+    List<Runnable> units = new ArrayList<>();
+    for (int i = 0; i < 4; i++) {
+      units.add(finished::incrementAndGet);
+    }
+    Assert.assertEquals(0, pool.runAllUntil(units, System.currentTimeMillis() + 60000));
+    Assert.assertEquals(4, finished.get());
+
+    Assert.assertEquals(4, pool.runAllUntil(units, System.currentTimeMillis() - 1));
+    Assert.assertEquals(4, finished.get());
+  }
+
+  private static SinkRecord record(String topic, int partition, long offset) {
+    return new SinkRecord(topic, partition, null, null, null, "value", offset);
+  }
+}
@@ -0,0 +1,55 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.Arrays;
+import java.util.List;
+import org.junit.Assert;
+import org.junit.Test;
+
+public class PendingFileIndexTest {
+  private static final String CONNECTOR = TestUtils.TEST_CONNECTOR_NAME;
+
+  @Test
+  public void testIndexByName() {
+    String file0 = FileNameUtils.fileName(CONNECTOR, "table", 0, 0, 9, 1000);
+    String file1 = FileNameUtils.fileName(CONNECTOR, "table", 0, 10, 19, 2000);
+    PendingFileIndex index = new PendingFileIndex();
+    index.addAll(Arrays.asList(file0, file1, file0));
+    Assert.assertEquals(Arrays.asList(file0, file1), index.getFileNames());
+
+    PendingFileIndex.PendingFile removed = index.remove(file1);
+    Assert.assertEquals(file1, removed.getName());
+    Assert.assertEquals(19, removed.getEndOffset());
+    Assert.assertEquals(2000, removed.getTimeIngested());
+    Assert.assertNull(index.remove(file1));
+    Assert.assertEquals(1, index.size());
+
+    PendingFileIndex other = new PendingFileIndex();
+    other.add(file1);
+    index.addAll(other);
+    Assert.assertEquals(Arrays.asList(file0, file1), index.getFileNames());
+  }
+
+  @Test
+  public void testRemoveIngestedBefore() {
+    String file0 = FileNameUtils.fileName(CONNECTOR, "table", 0, 0, 9, 1000);
+    String file1 = FileNameUtils.fileName(CONNECTOR, "table", 0, 10, 19, 3000);
+    String file2 = FileNameUtils.fileName(CONNECTOR, "table", 0, 20, 29, 2000);
+    PendingFileIndex index = new PendingFileIndex();
+    index.addAll(Arrays.asList(file0, file1, file2));
+
+    Assert.assertFalse(index.hasIngestedBefore(1000));
+    Assert.assertTrue(index.hasIngestedBefore(1001));
+
+    List<PendingFileIndex.PendingFile> removed = index.removeIngestedBefore(2500);
+    Assert.assertEquals(2, removed.size());
+    Assert.assertEquals(file0, removed.get(0).getName());
+    Assert.assertEquals(file2, removed.get(1).getName());
+    Assert.assertEquals(Arrays.asList(file1), index.getFileNames());
+    Assert.assertFalse(index.hasIngestedBefore(2500));
+  }
+
+  @Test(expected = SnowflakeKafkaConnectorException.class)
+  public void testInvalidFileName() {
+    new PendingFileIndex().add("invalid_name.json.gz");
+  }
+}
@@ -673,12 +673,17 @@ public class SinkServiceIT {
     service.insert(brokenValue);
     service.insert(brokenKey);
     service.insert(brokenKeyValue);
+    // broken records are buffered until their batch is flushed
+    assert conn.listStage(table, "", true).isEmpty();
+    service.callAllGetOffset();
 
     List<String> files = conn.listStage(table, "", true);
-    // two files per broken record
-    assert files.size() == 6;
+    // one batch file holding the four broken contents and its manifest
+    assert files.size() == 2;
     String name = files.get(0);
     assert TestUtils.getPartitionFromBrokenFileName(name) == partition;
+    assert TestUtils.getOffsetFromBrokenFileName(name) == startOffset;
+    assert service.getOffset(new TopicPartition(topic, partition)) == 0;
   }
 
   @Test
@@ -714,11 +719,6 @@ public class SinkServiceIT {
     service.insert(brokenKey);
     service.insert(correctValue);
 
-    List<String> files = conn.listStage(table, "", true);
-    assert files.size() == 2;
-    String name = files.get(0);
-    assert TestUtils.getPartitionFromBrokenFileName(name) == partition;
-
     TestUtils.assertWithRetry(
         () ->
             conn.listStage(
@@ -729,6 +729,12 @@ public class SinkServiceIT {
         5,
         4);
     service.callAllGetOffset();
+    List<String> files = conn.listStage(table, "", true);
+    // one batch file holding the two broken records and its manifest
+    assert files.size() == 2;
+    String name = files.get(0);
+    assert TestUtils.getPartitionFromBrokenFileName(name) == partition;
+
     files =
         conn.listStage(
             stage, FileNameUtils.filePrefix(TestUtils.TEST_CONNECTOR_NAME, table, partition));
@@ -816,8 +822,8 @@ public class SinkServiceIT {
   public void testFileSize() throws Exception {
     conn.createTable(table);
     conn.createStage(stage);
-    int numOfRecord = 111; // 181 bytes each
-    int recordSize = 180;
+    int numOfRecord = 222; // 90 bytes each in UTF-8
+    int recordSize = 90;
     long size = 10000;
 
     SnowflakeSinkService service =
@@ -980,12 +986,14 @@ public class SinkServiceIT {
             .build();
 
     service.insert(record);
+    service.callAllGetOffset();
 
     List<String> files = conn.listStage(table, "", true);
     assert files.size() == 2;
     String name = files.get(0);
     assert TestUtils.getPartitionFromBrokenFileName(name) == partition;
     assert TestUtils.getOffsetFromBrokenFileName(name) == offset;
+    assert service.getOffset(new TopicPartition(topic, partition)) == 0;
 
     service.closeAll();
   }
@@ -0,0 +1,263 @@
+package com.snowflake.kafka.connector.internal;
+
+import com.snowflake.kafka.connector.internal.telemetry.SnowflakeTelemetryService;
+import com.snowflake.kafka.connector.records.SnowflakeJsonSchema;
+import com.snowflake.kafka.connector.records.SnowflakeRecordContent;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.CopyOnWriteArrayList;
+import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicReference;
+import org.apache.kafka.common.TopicPartition;
+import org.apache.kafka.connect.sink.SinkRecord;
+import org.junit.After;
+import org.junit.Assert;
+import org.junit.Before;
+import org.junit.Test;
+import org.mockito.ArgumentCaptor;
+import org.mockito.ArgumentMatchers;
+import org.mockito.Mockito;
+
+public class SnowflakeSinkServiceV1Test {
+  private static final String TABLE = "test_table";
+  private static final String TOPIC = "test_topic";
+  private static final int PARTITION = 0;
+
+  private SnowflakeConnectionService conn;
+  private SnowflakeIngestionService ingestionService;
+  private SnowflakeSinkServiceV1 service;
+
+  @Before
+  public void setup() {
+    conn = Mockito.mock(SnowflakeConnectionService.class);
+    ingestionService = Mockito.mock(SnowflakeIngestionService.class);
+    Mockito.when(conn.getConnectorName()).thenReturn(TestUtils.TEST_CONNECTOR_NAME);
+    Mockito.when(conn.getTelemetryClient())
+        .thenReturn(Mockito.mock(SnowflakeTelemetryService.class));
+    Mockito.when(conn.buildIngestService(ArgumentMatchers.any(), ArgumentMatchers.any()))
+        .thenReturn(ingestionService);
+    Mockito.when(conn.tableExist(TABLE)).thenReturn(true);
+    Mockito.when(conn.isTableCompatible(TABLE)).thenReturn(true);
+    Mockito.when(conn.stageExist(ArgumentMatchers.any())).thenReturn(true);
+    Mockito.when(conn.isStageCompatible(ArgumentMatchers.any())).thenReturn(true);
+    Mockito.when(conn.pipeExist(ArgumentMatchers.any())).thenReturn(true);
+    Mockito.when(
+            conn.isPipeCompatible(
+                ArgumentMatchers.any(), ArgumentMatchers.any(), ArgumentMatchers.any()))
+        .thenReturn(true);
+    Mockito.when(conn.listStage(ArgumentMatchers.any(), ArgumentMatchers.any()))
+        .thenAnswer(invocation -> new ArrayList<>());
+
+    service = new SnowflakeSinkServiceV1(conn);
+    service.setCustomJMXMetrics(false);
+  }
+
+  @After
+  public void teardown() {
+    service.closeAll();
+  }
+
+  @Test
+  public void testBrokenRecordsWrittenBeforeGoodRecordsCommitted() throws Exception {
+    // every good record is flushed to its own file right away
+    service.setRecordNumber(1);
+    service.startTask(TABLE, new TopicPartition(TOPIC, PARTITION));
+
+    service.insert(brokenRecord(0));
+    // the broken batch waits for its flush time, the offset stays at the broken record
+    Assert.assertEquals(0, service.getOffset(new TopicPartition(TOPIC, PARTITION)));
+    Mockito.verify(conn, Mockito.never())
+        .putToTableStage(ArgumentMatchers.any(), ArgumentMatchers.any(), ArgumentMatchers.any());
+
+    service.insert(TestUtils.createJsonStringSinkRecords(1, 1, TOPIC, PARTITION).get(0));
+    // the good file after the broken record is committed together with the broken batch
+    Assert.assertEquals(2, service.getOffset(new TopicPartition(TOPIC, PARTITION)));
+    Mockito.verify(conn, Mockito.times(2))
+        .putToTableStage(
+            ArgumentMatchers.eq(TABLE), ArgumentMatchers.any(), ArgumentMatchers.any());
+    Mockito.verify(ingestionService).ingestFiles(ArgumentMatchers.anyList());
+  }
+
+  @Test
+  public void testUploadsPublishedInOffsetOrder() throws Exception {
+    service.setRecordNumber(1);
+    service.setFileUploadThreads(2);
+    service.startTask(TABLE, new TopicPartition(TOPIC, PARTITION));
+    CountDownLatch firstUpload = new CountDownLatch(1);
+    CountDownLatch secondUploaded = new CountDownLatch(1);
+    Mockito.doAnswer(
+            invocation -> {
+              if (FileNameUtils.fileNameToStartOffset(invocation.getArgument(1)) == 0) {
+                firstUpload.await();
+              } else {
+                secondUploaded.countDown();
+              }
+              return null;
+            })
+        .when(conn)
+        .putWithCache(ArgumentMatchers.any(), ArgumentMatchers.any(), anyGzipFileBuffer());
+
+    for (SinkRecord record : TestUtils.createJsonStringSinkRecords(0, 2, TOPIC, PARTITION)) {
+      service.insert(record);
+    }
+    Assert.assertTrue(secondUploaded.await(10, TimeUnit.SECONDS));
+
+    // the second file is on stage first, it isn't committed before the first one
+    CompletableFuture<Long> offset =
+        CompletableFuture.supplyAsync(
+            () -> service.getOffset(new TopicPartition(TOPIC, PARTITION)));
+    Thread.sleep(200);
+    Assert.assertFalse(offset.isDone());
+    Mockito.verify(ingestionService, Mockito.never()).ingestFiles(ArgumentMatchers.anyList());
+
+    firstUpload.countDown();
+    Assert.assertEquals(2, (long) offset.get(10, TimeUnit.SECONDS));
+    ArgumentCaptor<List<String>> ingestedFiles = ArgumentCaptor.forClass(List.class);
+    Mockito.verify(ingestionService).ingestFiles(ingestedFiles.capture());
+    Assert.assertEquals(2, ingestedFiles.getValue().size());
+    Assert.assertEquals(0, FileNameUtils.fileNameToStartOffset(ingestedFiles.getValue().get(0)));
+    Assert.assertEquals(1, FileNameUtils.fileNameToStartOffset(ingestedFiles.getValue().get(1)));
+  }
+
+  @Test
+  public void testFullUploadQueueThrottlesProducer() throws Exception {
+    // one upload thread and a queue of two uploads, the fourth upload runs on the producer
+    service.setRecordNumber(1);
+    service.setFileUploadThreads(1);
+    service.startTask(TABLE, new TopicPartition(TOPIC, PARTITION));
+    CountDownLatch uploads = new CountDownLatch(1);
+    List<Thread> uploadThreads = new CopyOnWriteArrayList<>();
+    Mockito.doAnswer(
+            invocation -> {
+              uploadThreads.add(Thread.currentThread());
+              uploads.await();
+              return null;
+            })
+        .when(conn)
+        .putWithCache(ArgumentMatchers.any(), ArgumentMatchers.any(), anyGzipFileBuffer());
+
+    List<SinkRecord> records = TestUtils.createJsonStringSinkRecords(0, 4, TOPIC, PARTITION);
+    AtomicReference<Thread> producerThread = new AtomicReference<>();
+    CompletableFuture<Void> producer =
+        CompletableFuture.runAsync(
+            () -> {
+              producerThread.set(Thread.currentThread());
+              records.forEach(service::insert);
+            });
+    TestUtils.assertWithRetry(() -> uploadThreads.size() == 2, 1, 10);
+    Assert.assertFalse(producer.isDone());
+    Assert.assertTrue(uploadThreads.contains(producerThread.get()));
+
+    uploads.countDown();
+    producer.get(10, TimeUnit.SECONDS);
+    Assert.assertEquals(4, service.getOffset(new TopicPartition(TOPIC, PARTITION)));
+    Assert.assertEquals(4, uploadThreads.size());
+  }
+
+  @Test
+  public void testFailedUploadCancelsPendingUploads() throws Exception {
+    service.setRecordNumber(1);
+    service.setFileUploadThreads(1);
+    service.startTask(TABLE, new TopicPartition(TOPIC, PARTITION));
+    CountDownLatch firstUpload = new CountDownLatch(1);
+    CountDownLatch otherUploads = new CountDownLatch(1);
+    CountDownLatch lastUploaded = new CountDownLatch(1);
+    Mockito.doAnswer(
+            invocation -> {
+              long startOffset = FileNameUtils.fileNameToStartOffset(invocation.getArgument(1));
+              if (startOffset == 0) {
+                firstUpload.await();
+                throw SnowflakeErrors.ERROR_2003.getException();
+              } else if (startOffset == 3) {
+                lastUploaded.countDown();
+              } else {
+                otherUploads.await();
+              }
+              return null;
+            })
+        .when(conn)
+        .putWithCache(ArgumentMatchers.any(), ArgumentMatchers.any(), anyGzipFileBuffer());
+
+    for (SinkRecord record : TestUtils.createJsonStringSinkRecords(0, 3, TOPIC, PARTITION)) {
+      service.insert(record);
+    }
+    firstUpload.countDown();
+    // the second upload may have started, its buffer is released once it is finished
+    CompletableFuture<Long> offset =
+        CompletableFuture.supplyAsync(
+            () -> service.getOffset(new TopicPartition(TOPIC, PARTITION)));
+    Thread.sleep(200);
+    otherUploads.countDown();
+    try {
+      offset.get(10, TimeUnit.SECONDS);
+      Assert.fail("the failed upload should be rethrown");
+    } catch (ExecutionException e) {
+      Assert.assertEquals(
+          SnowflakeErrors.ERROR_2003.getCode(),
+          ((SnowflakeKafkaConnectorException) e.getCause()).getCode());
+    }
+
+    // the uploads run in order on the single thread, the cancelled third one is skipped
+    service.insert(TestUtils.createJsonStringSinkRecords(3, 1, TOPIC, PARTITION).get(0));
+    Assert.assertTrue(lastUploaded.await(10, TimeUnit.SECONDS));
+    Mockito.verify(conn, Mockito.never())
+        .putWithCache(
+            ArgumentMatchers.any(),
+            ArgumentMatchers.argThat(name -> FileNameUtils.fileNameToStartOffset(name) == 2),
+            anyGzipFileBuffer());
+    Mockito.verify(ingestionService, Mockito.never()).ingestFiles(ArgumentMatchers.anyList());
+  }
+
+  @Test
+  public void testFailedUploadReleasesBuffers() throws Exception {
+    service.setRecordNumber(1);
+    service.setFileUploadThreads(1);
+    service.startTask(TABLE, new TopicPartition(TOPIC, PARTITION));
+    CountDownLatch firstUpload = new CountDownLatch(1);
+    Mockito.doAnswer(
+            invocation -> {
+              if (FileNameUtils.fileNameToStartOffset(invocation.getArgument(1)) == 0) {
+                firstUpload.await();
+                throw SnowflakeErrors.ERROR_2003.getException();
+              }
+              return null;
+            })
+        .when(conn)
+        .putWithCache(ArgumentMatchers.any(), ArgumentMatchers.any(), anyGzipFileBuffer());
+
+    // each file holds one chunk, the last two files wait in the queue behind the failing one
+    int pooledChunks = GzipFileBuffer.getPooledChunkCount();
+    for (SinkRecord record : TestUtils.createJsonStringSinkRecords(0, 3, TOPIC, PARTITION)) {
+      service.insert(record);
+    }
+    firstUpload.countDown();
+    try {
+      service.getOffset(new TopicPartition(TOPIC, PARTITION));
+      Assert.fail("the failed upload should be rethrown");
+    } catch (SnowflakeKafkaConnectorException e) {
+      Assert.assertEquals(SnowflakeErrors.ERROR_2003.getCode(), e.getCode());
+    }
+
+    // the chunks of the failed and the cancelled files are back in the pool
+    Assert.assertEquals(Math.max(pooledChunks, 3), GzipFileBuffer.getPooledChunkCount());
+  }
+
+  private static GzipFileBuffer anyGzipFileBuffer() {
+    return ArgumentMatchers.any(GzipFileBuffer.class);
+  }
+
+  private static SinkRecord brokenRecord(long offset) {
+    return new SinkRecord(
+        TOPIC,
+        PARTITION,
+        null,
+        null,
+        new SnowflakeJsonSchema(),
+        new SnowflakeRecordContent("{broken".getBytes(StandardCharsets.UTF_8)),
+        offset);
+  }
+}
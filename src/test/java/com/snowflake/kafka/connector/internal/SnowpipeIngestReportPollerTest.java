@@ -0,0 +1,104 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import org.junit.After;
+import org.junit.Assert;
+import org.junit.Before;
+import org.junit.Test;
+import org.mockito.ArgumentMatchers;
+import org.mockito.Mockito;
+
+public class SnowpipeIngestReportPollerTest {
+  private SnowpipeIngestReportPoller poller;
+
+  @Before
+  public void setup() {
+    poller = new SnowpipeIngestReportPoller(2);
+  }
+
+  @After
+  public void teardown() {
+    poller.stop();
+  }
+
+  @Test
+  public void testDispatchFinishedFiles() {
+    List<String> files = Arrays.asList("a", "b", "c", "d");
+    Map<String, InternalUtils.IngestedFileStatus> report = new HashMap<>();
+    report.put("a", InternalUtils.IngestedFileStatus.LOADED);
+    report.put("b", InternalUtils.IngestedFileStatus.FAILED);
+    report.put("c", InternalUtils.IngestedFileStatus.LOAD_IN_PROGRESS);
+    report.put("d", InternalUtils.IngestedFileStatus.NOT_FOUND);
+    SnowflakeIngestionService ingestionService = Mockito.mock(SnowflakeIngestionService.class);
+    Mockito.when(ingestionService.readIngestReport(files)).thenReturn(report);
+
+    List<Map<String, InternalUtils.IngestedFileStatus>> received = new ArrayList<>();
+    poller.register("pipe", ingestionService, () -> files, received::add);
+    poller.poll();
+
+    Assert.assertEquals(1, received.size());
+    Assert.assertEquals(2, received.get(0).size());
+    Assert.assertEquals(InternalUtils.IngestedFileStatus.LOADED, received.get(0).get("a"));
+    Assert.assertEquals(InternalUtils.IngestedFileStatus.FAILED, received.get(0).get("b"));
+  }
+
+  @Test
+  public void testSkipPipeWithoutPendingFiles() {
+    SnowflakeIngestionService ingestionService = Mockito.mock(SnowflakeIngestionService.class);
+    List<Map<String, InternalUtils.IngestedFileStatus>> received = new ArrayList<>();
+    poller.register("pipe", ingestionService, Collections::emptyList, received::add);
+    poller.poll();
+
+    Mockito.verify(ingestionService, Mockito.never())
+        .readIngestReport(ArgumentMatchers.anyList());
+    Assert.assertTrue(received.isEmpty());
+  }
+
+  @Test
+  public void testFailedPipeDoesNotBlockOthers() {
+    SnowflakeIngestionService failingService = Mockito.mock(SnowflakeIngestionService.class);
+    Mockito.when(failingService.readIngestReport(ArgumentMatchers.anyList()))
+        .thenThrow(SnowflakeErrors.ERROR_3002.getException());
+    SnowflakeIngestionService ingestionService = Mockito.mock(SnowflakeIngestionService.class);
+    Mockito.when(ingestionService.readIngestReport(ArgumentMatchers.anyList()))
+        .thenReturn(Collections.singletonMap("a", InternalUtils.IngestedFileStatus.LOADED));
+
+    List<Map<String, InternalUtils.IngestedFileStatus>> received = new ArrayList<>();
+    poller.register(
+        "failing", failingService, () -> Collections.singletonList("x"), received::add);
+    poller.register("pipe", ingestionService, () -> Collections.singletonList("a"), received::add);
+    poller.poll();
+
+    Assert.assertEquals(1, received.size());
+    Assert.assertEquals(InternalUtils.IngestedFileStatus.LOADED, received.get(0).get("a"));
+  }
+
+  @Test
+  public void testUnregister() {
+    SnowflakeIngestionService ingestionService = Mockito.mock(SnowflakeIngestionService.class);
+    poller.register("pipe", ingestionService, () -> Collections.singletonList("a"), map -> {});
+    poller.unregister("pipe");
+    poller.poll();
+
+    Mockito.verify(ingestionService, Mockito.never())
+        .readIngestReport(ArgumentMatchers.anyList());
+  }
+
+  @Test
+  public void testSkipClosedIngestionService() {
+    SnowflakeIngestionService ingestionService = Mockito.mock(SnowflakeIngestionService.class);
+    Mockito.when(ingestionService.isClosed()).thenReturn(true);
+    List<Map<String, InternalUtils.IngestedFileStatus>> received = new ArrayList<>();
+    poller.register("pipe", ingestionService, () -> Collections.singletonList("a"), received::add);
+    poller.poll();
+
+    Mockito.verify(ingestionService, Mockito.never())
+        .readIngestReport(ArgumentMatchers.anyList());
+    Assert.assertTrue(received.isEmpty());
+  }
+}
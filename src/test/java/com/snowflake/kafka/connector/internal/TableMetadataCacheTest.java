@@ -0,0 +1,95 @@
+package com.snowflake.kafka.connector.internal;
+
+import java.util.Collections;
+import java.util.List;
+import java.util.Optional;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+import org.junit.Assert;
+import org.junit.Test;
+
+public class TableMetadataCacheTest {
+  private static final long TTL_MILLIS = TimeUnit.MINUTES.toMillis(1);
+
+  @Test
+  public void testColumnsAreQueriedOnce() {
+    TableMetadataCache cache = new TableMetadataCache(TTL_MILLIS);
+    AtomicInteger queries = new AtomicInteger();
+    List<TableMetadataCache.TableColumn> columns =
+        Collections.singletonList(new TableMetadataCache.TableColumn("A", "VARIANT", true));
+
+    for (int i = 0; i < 3; i++) {
+      Optional<List<TableMetadataCache.TableColumn>> result =
+          cache.getColumns(
+              "t",
+              () -> {
+                queries.incrementAndGet();
+                return Optional.of(columns);
+              });
+      Assert.assertEquals(columns, result.get());
+    }
+    Assert.assertEquals(1, queries.get());
+
+    cache.invalidate("t");
+    cache.getColumns(
+        "t",
+        () -> {
+          queries.incrementAndGet();
+          return Optional.empty();
+        });
+    Assert.assertEquals(2, queries.get());
+  }
+
+  @Test
+  public void testPermissionIsCachedPerRole() {
+    TableMetadataCache cache = new TableMetadataCache(TTL_MILLIS);
+    AtomicInteger queries = new AtomicInteger();
+
+    Assert.assertTrue(cache.hasSchemaEvolutionPermission("t", "r1", () -> true));
+    Assert.assertFalse(cache.hasSchemaEvolutionPermission("t", "r2", () -> false));
+    Assert.assertTrue(
+        cache.hasSchemaEvolutionPermission(
+            "t",
+            "r1",
+            () -> {
+              queries.incrementAndGet();
+              return false;
+            }));
+    Assert.assertEquals(0, queries.get());
+
+    cache.invalidate("t");
+    Assert.assertFalse(cache.hasSchemaEvolutionPermission("t", "r1", () -> false));
+  }
+
+  @Test
+  public void testFailureIsNotCached() {
+    TableMetadataCache cache = new TableMetadataCache(TTL_MILLIS);
+    try {
+      cache.hasSchemaEvolutionPermission(
+          "t",
+          "r",
+          () -> {
+            throw SnowflakeErrors.ERROR_2001.getException();
+          });
+      Assert.fail("the query failure should be thrown");
+    } catch (SnowflakeKafkaConnectorException e) {
+      assert e.checkErrorCode(SnowflakeErrors.ERROR_2001);
+    }
+    Assert.assertTrue(cache.hasSchemaEvolutionPermission("t", "r", () -> true));
+  }
+
+  @Test
+  public void testZeroTtlDisablesCache() {
+    TableMetadataCache cache = new TableMetadataCache(0);
+    AtomicInteger queries = new AtomicInteger();
+    for (int i = 0; i < 2; i++) {
+      cache.getColumns(
+          "t",
+          () -> {
+            queries.incrementAndGet();
+            return Optional.empty();
+          });
+    }
+    Assert.assertEquals(2, queries.get());
+  }
+}
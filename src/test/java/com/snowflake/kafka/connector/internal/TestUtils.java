@@ -82,7 +82,8 @@ public class TestUtils {
   private static final String DES_RSA_KEY = "des_rsa_key";
   public static final String TEST_CONNECTOR_NAME = "TEST_CONNECTOR";
   private static final Pattern BROKEN_RECORD_PATTERN =
-      Pattern.compile("^[^/]+/[^/]+/(\\d+)/(\\d+)_(key|value)_(\\d+)\\.gz$");
+      Pattern.compile(
+          "^[^/]+/[^/]+/(\\d+)/(\\d+)_(\\d+)_(\\d+)_broken(_manifest\\.json)?\\.gz$");
 
   // profile path
   private static final String PROFILE_PATH = "profile.json";
@@ -371,7 +372,10 @@ public class TestUtils {
 
   /** @return snowflake connection for test */
   public static SnowflakeConnectionService getConnectionService() {
-    return SnowflakeConnectionServiceFactory.builder().setProperties(getConf()).build();
+    return SnowflakeConnectionServiceFactory.builder()
+        .setProperties(getConf())
+        .setTableMetadataCacheTtlMillis(0)
+        .build();
   }
 
   /**
@@ -379,7 +383,10 @@ public class TestUtils {
    * @return snowflake connection for given config map
    */
   public static SnowflakeConnectionService getConnectionService(Map<String, String> configuration) {
-    return SnowflakeConnectionServiceFactory.builder().setProperties(configuration).build();
+    return SnowflakeConnectionServiceFactory.builder()
+        .setProperties(configuration)
+        .setTableMetadataCacheTtlMillis(0)
+        .build();
   }
 
   /**
@@ -440,7 +447,7 @@ public class TestUtils {
   }
 
   /**
-   * read offset from broken record file
+   * read offset of the first record from broken record file
    *
    * @param name file name
    * @return offset
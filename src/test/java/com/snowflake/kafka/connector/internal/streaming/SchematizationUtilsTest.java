@@ -1,10 +1,13 @@
 package com.snowflake.kafka.connector.internal.streaming;
 
+import com.snowflake.kafka.connector.internal.SnowflakeConnectionService;
+import com.snowflake.kafka.connector.internal.SnowflakeErrors;
 import com.snowflake.kafka.connector.internal.TestUtils;
 import java.nio.charset.StandardCharsets;
 import java.util.Arrays;
 import java.util.Collections;
 import java.util.HashMap;
+import java.util.List;
 import java.util.Map;
 import net.snowflake.client.jdbc.internal.fasterxml.jackson.core.JsonProcessingException;
 import net.snowflake.client.jdbc.internal.fasterxml.jackson.databind.ObjectMapper;
@@ -16,6 +19,8 @@ import org.junit.Assert;
 import org.junit.Rule;
 import org.junit.Test;
 import org.junit.contrib.java.lang.system.EnvironmentVariables;
+import org.mockito.ArgumentMatchers;
+import org.mockito.Mockito;
 
 public class SchematizationUtilsTest {
   @Rule public final EnvironmentVariables environmentVariables = new EnvironmentVariables();
@@ -92,4 +97,95 @@ public class SchematizationUtilsTest {
     Assert.assertEquals("VARCHAR", columnToTypes.get(columnName1));
     Assert.assertEquals("VARCHAR", columnToTypes.get(columnName2));
   }
+
+  @Test
+  public void testGetColumnTypesFromBatch() throws JsonProcessingException {
+    Map<String, Object> firstValue = new HashMap<>();
+    firstValue.put("name", "a");
+    firstValue.put("age", null);
+    Map<String, Object> secondValue = new HashMap<>();
+    secondValue.put("age", 12);
+    List<SinkRecord> records =
+        Arrays.asList(recordWithoutSchema(firstValue, 0), recordWithoutSchema(secondValue, 1));
+
+    Map<String, String> columnToTypes =
+        SchematizationUtils.getColumnTypes(records, Arrays.asList("name", "age", "random"));
+    Assert.assertEquals("VARCHAR", columnToTypes.get("name"));
+    // the type comes from the first record with a non null value
+    Assert.assertEquals("BIGINT", columnToTypes.get("age"));
+    Assert.assertEquals("VARIANT", columnToTypes.get("random"));
+  }
+
+  @Test
+  public void testEvolveSchemaFromBatchOnce() throws JsonProcessingException {
+    SnowflakeConnectionService conn = Mockito.mock(SnowflakeConnectionService.class);
+    Map<String, Boolean> columnsBefore = new HashMap<>();
+    columnsBefore.put("ID", false);
+    columnsBefore.put("KEY", false);
+    Map<String, Boolean> columnsAfter = new HashMap<>();
+    columnsAfter.put("ID", true);
+    columnsAfter.put("KEY", true);
+    columnsAfter.put("NAME", true);
+    Mockito.when(conn.getColumnNullability("table")).thenReturn(columnsBefore, columnsAfter);
+    List<SinkRecord> records =
+        Collections.singletonList(recordWithoutSchema(Collections.singletonMap("name", "a"), 0));
+
+    SchematizationUtils.evolveSchemaIfNeeded(
+        conn, "table", Arrays.asList("id", "key"), Collections.singletonList("name"), records);
+    Mockito.verify(conn, Mockito.times(1))
+        .alterNonNullableColumns("table", Arrays.asList("id", "key"));
+    Mockito.verify(conn, Mockito.times(1))
+        .appendColumnsToTable("table", Collections.singletonMap("name", "VARCHAR"));
+
+    // another channel reporting the same columns doesn't alter the table again
+    SchematizationUtils.evolveSchemaIfNeeded(
+        conn,
+        "table",
+        Collections.singletonList("key"),
+        Collections.singletonList("name"),
+        records);
+    Mockito.verify(conn, Mockito.times(1))
+        .alterNonNullableColumns(ArgumentMatchers.any(), ArgumentMatchers.any());
+    Mockito.verify(conn, Mockito.times(1))
+        .appendColumnsToTable(ArgumentMatchers.any(), ArgumentMatchers.any());
+  }
+
+  @Test
+  public void testEvolveSchemaFromBatchRetriedAfterFailure() throws JsonProcessingException {
+    SnowflakeConnectionService conn = Mockito.mock(SnowflakeConnectionService.class);
+    Mockito.when(conn.getColumnNullability("table")).thenReturn(new HashMap<>());
+    Mockito.doThrow(SnowflakeErrors.ERROR_2015.getException())
+        .when(conn)
+        .appendColumnsToTable(ArgumentMatchers.any(), ArgumentMatchers.any());
+    List<SinkRecord> records =
+        Collections.singletonList(recordWithoutSchema(Collections.singletonMap("name", "a"), 0));
+
+    // the column isn't in the table after the failed DDL, the next evolution adds it again
+    SchematizationUtils.evolveSchemaIfNeeded(
+        conn, "table", Collections.emptyList(), Collections.singletonList("name"), records);
+    SchematizationUtils.evolveSchemaIfNeeded(
+        conn, "table", Collections.emptyList(), Collections.singletonList("name"), records);
+    Mockito.verify(conn, Mockito.times(2))
+        .appendColumnsToTable("table", Collections.singletonMap("name", "VARCHAR"));
+    Mockito.verify(conn, Mockito.never())
+        .alterNonNullableColumns(ArgumentMatchers.any(), ArgumentMatchers.any());
+  }
+
+  private static SinkRecord recordWithoutSchema(Map<String, ?> value, long offset)
+      throws JsonProcessingException {
+    JsonConverter jsonConverter = new JsonConverter();
+    jsonConverter.configure(Collections.singletonMap("schemas.enable", false), false);
+    SchemaAndValue schemaAndValue =
+        jsonConverter.toConnectData("topic", new ObjectMapper().writeValueAsBytes(value));
+    return new SinkRecord(
+        "topic",
+        0,
+        null,
+        null,
+        schemaAndValue.schema(),
+        schemaAndValue.value(),
+        offset,
+        System.currentTimeMillis(),
+        TimestampType.CREATE_TIME);
+  }
 }
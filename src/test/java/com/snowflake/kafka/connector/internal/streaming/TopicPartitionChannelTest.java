@@ -13,6 +13,8 @@ import com.snowflake.kafka.connector.dlq.KafkaRecordErrorReporter;
 import com.snowflake.kafka.connector.internal.BufferThreshold;
 import com.snowflake.kafka.connector.internal.SnowflakeConnectionService;
 import com.snowflake.kafka.connector.internal.TestUtils;
+import com.snowflake.kafka.connector.records.SnowflakeJsonSchema;
+import com.snowflake.kafka.connector.records.SnowflakeRecordContent;
 import java.nio.charset.StandardCharsets;
 import java.util.Arrays;
 import java.util.Collection;
@@ -41,6 +43,7 @@ import org.junit.Test;
 import org.junit.runner.RunWith;
 import org.junit.runners.Parameterized;
 import org.mockito.ArgumentMatchers;
+import org.mockito.InOrder;
 import org.mockito.Mock;
 import org.mockito.Mockito;
 
@@ -151,6 +154,36 @@ public class TopicPartitionChannelTest {
     Assert.assertEquals(100L, topicPartitionChannel.fetchOffsetTokenWithRetry());
   }
 
+  @Test
+  public void testPolledOffsetTokenIsCommitted() {
+    Mockito.when(mockStreamingChannel.getLatestCommittedOffsetToken())
+        .thenReturn("100")
+        .thenThrow(SF_EXCEPTION)
+        .thenReturn("200");
+
+    TopicPartitionChannel topicPartitionChannel =
+        new TopicPartitionChannel(
+            mockStreamingClient,
+            topicPartition,
+            TEST_CHANNEL_NAME,
+            TEST_TABLE_NAME,
+            streamingBufferThreshold,
+            sfConnectorConfig,
+            mockKafkaRecordErrorReporter,
+            mockSinkTaskContext);
+
+    // preCommit reads the polled offset token without calling Snowflake
+    topicPartitionChannel.pollOffsetToken();
+    Assert.assertEquals(101L, topicPartitionChannel.getOffsetSafeToCommitToKafka());
+    Assert.assertEquals(101L, topicPartitionChannel.getOffsetSafeToCommitToKafka());
+    Mockito.verify(mockStreamingChannel, Mockito.times(1)).getLatestCommittedOffsetToken();
+
+    // after a failed poll, preCommit fetches the offset token itself
+    topicPartitionChannel.pollOffsetToken();
+    Assert.assertEquals(201L, topicPartitionChannel.getOffsetSafeToCommitToKafka());
+    Mockito.verify(mockStreamingChannel, Mockito.times(3)).getLatestCommittedOffsetToken();
+  }
+
   // TODO:: Fix this test
   @Test
   public void testFirstRecordForChannel() {
@@ -432,25 +465,32 @@ public class TopicPartitionChannelTest {
     if (this.sfConnectorConfig
         .get(SnowflakeSinkConnectorConfig.ENABLE_SCHEMATIZATION_CONFIG)
         .equals("true")) {
+      // the second row has a regular error, the third one an extra column
       InsertValidationResponse validationResponse1 = new InsertValidationResponse();
       InsertValidationResponse.InsertError insertError1 =
-          new InsertValidationResponse.InsertError("CONTENT", 0);
+          new InsertValidationResponse.InsertError("CONTENT", 1);
       insertError1.setException(SF_EXCEPTION);
       validationResponse1.addError(insertError1);
-
-      InsertValidationResponse validationResponse2 = new InsertValidationResponse();
       InsertValidationResponse.InsertError insertError2 =
-          new InsertValidationResponse.InsertError("CONTENT", 0);
+          new InsertValidationResponse.InsertError("CONTENT", 2);
       insertError2.setException(SF_EXCEPTION);
       insertError2.setExtraColNames(Collections.singletonList("gender"));
-      validationResponse2.addError(insertError2);
+      validationResponse1.addError(insertError2);
+
+      // the first two rows are inserted again after the reopen, the second one fails again
+      InsertValidationResponse validationResponse2 = new InsertValidationResponse();
+      InsertValidationResponse.InsertError insertError3 =
+          new InsertValidationResponse.InsertError("CONTENT", 1);
+      insertError3.setException(SF_EXCEPTION);
+      validationResponse2.addError(insertError3);
 
       Mockito.when(
-              mockStreamingChannel.insertRow(
-                  ArgumentMatchers.any(), ArgumentMatchers.any(String.class)))
-          .thenReturn(new InsertValidationResponse())
+              mockStreamingChannel.insertRows(
+                  ArgumentMatchers.any(Iterable.class), ArgumentMatchers.any(String.class)))
           .thenReturn(validationResponse1)
           .thenReturn(validationResponse2);
+      // nothing committed yet when the channel is reopened
+      Mockito.when(mockStreamingChannel.getLatestCommittedOffsetToken()).thenReturn(null);
 
       SnowflakeConnectionService conn = Mockito.mock(SnowflakeConnectionService.class);
       Mockito.when(
@@ -497,8 +537,22 @@ public class TopicPartitionChannelTest {
 
       topicPartitionChannel.insertBufferedRecordsIfFlushTimeThresholdReached();
 
-      // Verify that the buffer is cleaned up and one record is in the DLQ
+      // The table is evolved once, then the channel is reopened, the rows before the one with the
+      // extra column are inserted again and kafka sends the partition again from that row
       Assert.assertTrue(topicPartitionChannel.isPartitionBufferEmpty());
+      Mockito.verify(conn, Mockito.times(1))
+          .appendColumnsToTable(ArgumentMatchers.any(), ArgumentMatchers.any());
+      Mockito.verify(mockStreamingClient, Mockito.times(2)).openChannel(ArgumentMatchers.any());
+      Mockito.verify(mockStreamingChannel)
+          .insertRows(ArgumentMatchers.any(Iterable.class), ArgumentMatchers.eq("2"));
+      Mockito.verify(mockStreamingChannel)
+          .insertRows(
+              ArgumentMatchers.argThat(rows -> ((List<?>) rows).size() == 2),
+              ArgumentMatchers.eq("1"));
+      Mockito.verify(mockSinkTaskContext).offset(topicPartition, 2L);
+      Mockito.verify(mockStreamingChannel, Mockito.never())
+          .insertRow(ArgumentMatchers.any(), ArgumentMatchers.any(String.class));
+      // only the row with a regular error is in the DLQ, reported once
       Assert.assertEquals(1, kafkaRecordErrorReporter.getReportedRecords().size());
     }
   }
@@ -697,6 +751,50 @@ public class TopicPartitionChannelTest {
     assert kafkaRecordErrorReporter.getReportedRecords().size() == 1;
   }
 
+  /* Records sent to the DLQ are delivered before the offset token covering them is inserted. */
+  @Test
+  public void testInsertRows_ReportedRecordsFlushedBeforeOffsetToken() throws Exception {
+    Mockito.when(
+            mockStreamingChannel.insertRows(
+                ArgumentMatchers.any(Iterable.class), ArgumentMatchers.any(String.class)))
+        .thenReturn(new InsertValidationResponse());
+
+    TopicPartitionChannel topicPartitionChannel =
+        new TopicPartitionChannel(
+            mockStreamingClient,
+            topicPartition,
+            TEST_CHANNEL_NAME,
+            TEST_TABLE_NAME,
+            streamingBufferThreshold,
+            sfConnectorConfig,
+            mockKafkaRecordErrorReporter,
+            mockSinkTaskContext);
+
+    SinkRecord brokenRecord =
+        new SinkRecord(
+            TOPIC,
+            PARTITION,
+            null,
+            null,
+            new SnowflakeJsonSchema(),
+            new SnowflakeRecordContent("{broken".getBytes(StandardCharsets.UTF_8)),
+            0);
+    TopicPartitionChannel.StreamingBuffer streamingBuffer =
+        topicPartitionChannel.new StreamingBuffer();
+    streamingBuffer.insert(brokenRecord);
+    streamingBuffer.insert(TestUtils.createJsonStringSinkRecords(1, 1, TOPIC, PARTITION).get(0));
+    topicPartitionChannel.insertBufferedRecords(streamingBuffer);
+
+    InOrder inOrder = Mockito.inOrder(mockKafkaRecordErrorReporter, mockStreamingChannel);
+    inOrder
+        .verify(mockKafkaRecordErrorReporter)
+        .reportError(ArgumentMatchers.eq(brokenRecord), ArgumentMatchers.any());
+    inOrder.verify(mockKafkaRecordErrorReporter).flush();
+    inOrder
+        .verify(mockStreamingChannel)
+        .insertRows(ArgumentMatchers.any(Iterable.class), ArgumentMatchers.eq("1"));
+  }
+
   // --------------- TEST THRESHOLDS ---------------
   @Test
   public void testBufferBytesThreshold() throws Exception {
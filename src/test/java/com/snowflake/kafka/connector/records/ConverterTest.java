@@ -60,6 +60,7 @@ import org.apache.kafka.connect.data.SchemaAndValue;
 import org.apache.kafka.connect.data.SchemaBuilder;
 import org.apache.kafka.connect.data.Struct;
 import org.apache.kafka.connect.json.JsonConverter;
+import org.apache.kafka.connect.sink.SinkRecord;
 import org.apache.kafka.connect.storage.SimpleHeaderConverter;
 import org.junit.Assert;
 import org.junit.Test;
@@ -109,6 +110,55 @@ public class ConverterTest {
     assert ((SnowflakeRecordContent) sv.value()).getData()[0].toString().equals("{}");
   }
 
+  @Test
+  public void testJsonConverterRawPassthrough() throws IOException {
+    SnowflakeJsonConverter converter = new SnowflakeJsonConverter();
+    converter.configure(
+        Collections.singletonMap(SnowflakeJsonConverter.RAW_PASSTHROUGH, "true"), false);
+    assert converter.getRawPassthrough();
+    SnowflakeJsonConverter treeConverter = new SnowflakeJsonConverter();
+    assert !treeConverter.getRawPassthrough();
+
+    RecordService service = new RecordService();
+    String json = "{ \"str\": \"t\\u00e9st\", \"num\": 1.50, \"arr\": [1, null, true] }";
+    byte[] bytes = json.getBytes(StandardCharsets.UTF_8);
+    SnowflakeRecordContent content =
+        (SnowflakeRecordContent) converter.toConnectData("test", bytes).value();
+    assert json.equals(content.getRawContent());
+    // the tree is still available to the other paths
+    assert content.getData()[0].equals(mapper.readTree(json));
+
+    String raw =
+        service.getProcessedRecordForSnowpipe(
+            new SinkRecord("test", 0, null, null, new SnowflakeJsonSchema(), content, 1));
+    SnowflakeRecordContent treeContent =
+        (SnowflakeRecordContent) treeConverter.toConnectData("test", bytes).value();
+    assert treeContent.getRawContent() == null;
+    String tree =
+        service.getProcessedRecordForSnowpipe(
+            new SinkRecord("test", 0, null, null, new SnowflakeJsonSchema(), treeContent, 1));
+    assert mapper.readTree(raw).equals(mapper.readTree(tree));
+
+    // invalid json is still a broken record
+    content =
+        (SnowflakeRecordContent)
+            converter.toConnectData("test", "{\"a\":".getBytes(StandardCharsets.UTF_8)).value();
+    assert content.isBroken();
+
+    // duplicate keys and trailing content go through the json tree
+    content =
+        (SnowflakeRecordContent)
+            converter
+                .toConnectData("test", "{\"a\":1,\"a\":2}".getBytes(StandardCharsets.UTF_8))
+                .value();
+    assert content.getRawContent() == null;
+    assert content.getData()[0].toString().equals("{\"a\":2}");
+    content =
+        (SnowflakeRecordContent)
+            converter.toConnectData("test", "{} {}".getBytes(StandardCharsets.UTF_8)).value();
+    assert content.getRawContent() == null;
+  }
+
   @Test
   public void testAvroConverter() throws IOException {
     // todo: test schema registry
@@ -179,6 +229,104 @@ public class ConverterTest {
     assert ((SnowflakeRecordContent) input.value()).getData()[0].toString().equals("{}");
   }
 
+  @Test
+  public void testAvroJsonNodeBuilder() throws IOException {
+    org.apache.avro.Schema nestedSchema =
+        org.apache.avro.SchemaBuilder.record("nested").fields().requiredInt("id").endRecord();
+    org.apache.avro.Schema schema =
+        org.apache.avro.SchemaBuilder.record("test_avro")
+            .fields()
+            .requiredInt("int")
+            .requiredLong("smallLong")
+            .requiredLong("long")
+            .requiredFloat("float")
+            .requiredFloat("nan")
+            .requiredDouble("double")
+            .requiredBoolean("boolean")
+            .requiredString("string")
+            .requiredBytes("bytes")
+            .name("fixed")
+            .type()
+            .fixed("fixed")
+            .size(2)
+            .noDefault()
+            .name("enum")
+            .type()
+            .enumeration("enum")
+            .symbols("A", "B")
+            .noDefault()
+            .name("array")
+            .type()
+            .array()
+            .items()
+            .stringType()
+            .noDefault()
+            .name("map")
+            .type()
+            .map()
+            .values()
+            .longType()
+            .noDefault()
+            .optionalString("optional")
+            .name("nested")
+            .type(nestedSchema)
+            .noDefault()
+            .endRecord();
+
+    GenericRecord nested = new GenericData.Record(nestedSchema);
+    nested.put("id", 7);
+    GenericRecord record = new GenericData.Record(schema);
+    record.put("int", 1);
+    record.put("smallLong", 2L);
+    record.put("long", Long.MAX_VALUE);
+    record.put("float", 1.1f);
+    record.put("nan", Float.NaN);
+    record.put("double", 1.0E10);
+    record.put("boolean", true);
+    record.put("string", "quote\" slash/ \u00e9");
+    record.put("bytes", java.nio.ByteBuffer.wrap(new byte[] {0, 34, 92, (byte) 0xe9, (byte) 0x85}));
+    record.put(
+        "fixed",
+        new GenericData.Fixed(schema.getField("fixed").schema(), new byte[] {1, (byte) 0xff}));
+    record.put("enum", new GenericData.EnumSymbol(schema.getField("enum").schema(), "B"));
+    record.put("array", Arrays.asList("a", "b"));
+    record.put("map", Collections.singletonMap("key", 3L));
+    record.put("optional", null);
+    record.put("nested", nested);
+
+    // same tree as the text round trip
+    JsonNode expected = mapper.readTree(record.toString());
+    JsonNode actual = new AvroJsonNodeBuilder(mapper).toJsonNode(record);
+    assert expected.equals(actual) : expected + " != " + actual;
+    assert actual.get("bytes").asText().length() == 5;
+  }
+
+  @Test
+  public void testAvroReaderCache() throws IOException {
+    MockSchemaRegistryClient client = new MockSchemaRegistryClient();
+    SnowflakeAvroConverter converter = new SnowflakeAvroConverter();
+    converter.setSchemaRegistry(client);
+    for (int i = 0; i < 3; i++) {
+      SchemaAndValue input = converter.toConnectData("test", client.getData());
+      assert ((SnowflakeRecordContent) input.value())
+          .getData()[0]
+          .asText()
+          .equals(mapper.readTree("{\"int" + "\":1234}").asText());
+    }
+    // one reader is built for the writer schema and reused afterwards
+    assert converter.getReaderCache().getMissCount() == 1;
+    assert converter.getReaderCache().getHitCount() == 2;
+
+    assert converter.readReaderCacheSize(Collections.emptyMap())
+        == SnowflakeAvroConverter.READER_CACHE_SIZE_DEFAULT;
+    assert converter.readReaderCacheSize(
+            Collections.singletonMap(SnowflakeAvroConverter.READER_CACHE_SIZE, "10"))
+        == 10;
+    assert converter.readReaderCacheSize(
+            Collections.singletonMap(SnowflakeAvroConverter.READER_CACHE_SIZE, "-1"))
+        == SnowflakeAvroConverter.READER_CACHE_SIZE_DEFAULT;
+  }
+
   @Test(expected = SnowflakeKafkaConnectorException.class)
   public void testAvroWithSchemaRegistryAndWrongReaderSchema() throws IOException {
     MockSchemaRegistryClient client = new MockSchemaRegistryClient();